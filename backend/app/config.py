@@ -17,6 +17,8 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = ""
+    # SQLite 等待其他连接释放写锁的最长时间 (秒)
+    SQLITE_BUSY_TIMEOUT_SECONDS: float = 30.0
     
     # Storage
     STORAGE_DIR: str = ""
@@ -28,6 +30,48 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: List[str] = ["*"]
 
+    # Parsing
+    # 模板正则单次匹配的时间预算 (秒)，超时的规则会被跳过并记录为文件级告警
+    REGEX_TIMEOUT_SECONDS: float = 1.0
+    # 超过该大小的 OWL/RDF 文件使用单遍流式解析，避免整体载入内存图
+    OWL_STREAMING_THRESHOLD_BYTES: int = 16 * 1024 * 1024
+    # 解析结果批量写入时每个 executemany 批次的行数
+    PARSE_WRITE_CHUNK_SIZE: int = 5000
+    # 关系解析前暂存待处理链接的内存上限 (字节)，超出后溢写到临时文件
+    PARSE_LINK_SPOOL_BYTES: int = 8 * 1024 * 1024
+    # 是否默认为每次解析记录逐文件耗时剖析报告 (重新解析时也可按请求开启)
+    PARSE_PROFILING_ENABLED: bool = False
+    # 批量重解析的工作线程数 (SQLite 只允许一个写者，解析在进程级写锁下依次执行，多线程仅对服务端数据库有效)
+    REPARSE_MAX_WORKERS: int = 2
+
+    # Graph
+    # 进程内缓存的版本对差异结果的总内存预算 (按估算字节数 LRU 淘汰，按双方当前解析代次失效)；0 表示不缓存
+    ENTITY_DIFF_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # 进程内缓存的实体列表过滤计数条数 (按包的当前解析代次失效)
+    ENTITY_COUNT_CACHE_SIZE: int = 1024
+    # 属性表中记录的取值最大长度，更长的取值只记录键存在 (不参与按值过滤)
+    ATTRIBUTE_VALUE_MAX_CHARS: int = 256
+    # 图谱 NDJSON 流式输出时每批 (一条键集分页查询) 读取并写出的行数
+    GRAPH_STREAM_BATCH_SIZE: int = 1000
+    # 整包导出文件生成时每批读取的行数 (Parquet 每批为一个行组)
+    GRAPH_EXPORT_BATCH_SIZE: int = 50_000
+    # 邻域子图查询单次返回的节点数硬上限
+    GRAPH_NEIGHBORHOOD_MAX_NODES: int = 2000
+    # 路径与可达性查询的最大跳数
+    GRAPH_TRAVERSAL_MAX_DEPTH: int = 32
+    # 最短路径搜索的访问节点数硬上限
+    GRAPH_PATH_MAX_VISITED: int = 200_000
+    # 可达性 (传递闭包) 查询单次返回的节点数硬上限
+    GRAPH_REACHABILITY_MAX_NODES: int = 10_000
+    # 解析完成时计算的图谱统计中，枢纽实体、最大连通分量与孤立实体样本的条数
+    GRAPH_STATS_TOP_N: int = 20
+    # 启用版本内存邻接缓存 (CSR) 的总内存预算，超出时按 LRU 淘汰；0 表示不缓存
+    GRAPH_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Search
+    # 写入全文索引的 Markdown 正文最大字符数
+    SEARCH_BODY_MAX_CHARS: int = 20_000
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Avoid recursion during reload
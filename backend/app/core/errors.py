@@ -6,6 +6,7 @@ class BusinessCode:
     ONTOLOGY_ALREADY_EXISTS = "ONTOLOGY_ALREADY_EXISTS"
     ONTOLOGY_NAME_ALREADY_EXISTS = "ONTOLOGY_NAME_ALREADY_EXISTS"
     ONTOLOGY_NOT_FOUND = "ONTOLOGY_NOT_FOUND"
+    GRAPH_CURSOR_EXPIRED = "GRAPH_CURSOR_EXPIRED"
     
     # 模板相关
     TEMPLATE_NOT_FOUND = "TEMPLATE_NOT_FOUND"
@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Union
+
+
+class LRUCache:
+    """
+    线程安全的进程内 LRU 缓存
+
+    每个值按 weigh 计算权重 (缺省每项计 1，即按条数)，总权重超过 capacity 时淘汰最久未用的项；
+    单个值的权重超出容量时不保留。capacity 可以是返回容量的函数 (每次淘汰时读取，便于跟随配置)，
+    子类也可覆盖 capacity 属性。
+    """
+
+    def __init__(self, capacity: Union[int, Callable[[], int], None] = None,
+                 weigh: Optional[Callable[[Any], int]] = None):
+        self._capacity = capacity
+        self._weigh = weigh
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._weights: dict = {}
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        capacity = self._capacity() if callable(self._capacity) else self._capacity
+        return max(0, capacity or 0)
+
+    @property
+    def total_weight(self) -> int:
+        with self._lock:
+            return self._total
+
+    def get(self, key: Hashable) -> Any:
+        """命中时返回值并标记为最近使用，否则返回 None"""
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        weight = self._weigh(value) if self._weigh is not None else 1
+        with self._lock:
+            if key in self._items:
+                self._total -= self._weights.pop(key)
+            self._items[key] = value
+            self._items.move_to_end(key)
+            self._weights[key] = weight
+            self._total += weight
+            capacity = self.capacity
+            while self._total > capacity and self._items:
+                evicted, _ = self._items.popitem(last=False)
+                self._total -= self._weights.pop(evicted)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+        # 计算在锁外进行，并发的相同请求最多各算一次
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            if self._items.pop(key, None) is not None:
+                self._total -= self._weights.pop(key)
+
+    def discard_where(self, predicate: Callable[[Any], bool]):
+        """移除值满足 predicate 的所有项"""
+        with self._lock:
+            for key in [key for key, value in self._items.items() if predicate(value)]:
+                del self._items[key]
+                self._total -= self._weights.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._weights.clear()
+            self._total = 0
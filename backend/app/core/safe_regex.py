@@ -0,0 +1,155 @@
+"""
+受限正则执行层 (ReDoS 防护)
+
+解析模板中的正则由用户提供，标准库 ``re`` 无法中断一次失控的回溯，
+单个恶意/低质量的正则即可让解析任务永久挂起。本模块为每次匹配提供硬性时间预算:
+
+1. 若安装了第三方 ``regex`` 库，直接使用其内置的 ``timeout`` 参数 (同进程，开销最低)；
+2. 否则在常驻子进程中执行匹配，超时后终止并在下次调用时重建该子进程。
+
+子进程按线程隔离 (thread-local)，并发解析任务之间互不阻塞。
+"""
+import re
+import logging
+import threading
+import multiprocessing
+from typing import Optional, Tuple
+
+try:
+    import regex as _regex_lib
+except ImportError:  # pragma: no cover - 可选依赖
+    _regex_lib = None
+
+logger = logging.getLogger(__name__)
+
+# 子进程启动 (spawn 需重新导入模块) 的最长等待时间，不计入匹配预算
+_WORKER_STARTUP_TIMEOUT = 30.0
+
+
+class RegexTimeoutError(Exception):
+    """单次正则匹配超出时间预算"""
+
+    def __init__(self, pattern: str, timeout: float):
+        super().__init__(f"Regex exceeded {timeout}s budget: {pattern!r}")
+        self.pattern = pattern
+        self.timeout = timeout
+
+
+def _worker_main(conn):
+    """子进程入口：缓存当前文本，按需执行 search 并回传 (group0, *groups)"""
+    conn.send(("ready", None))
+    text = ""
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        op = message[0]
+        if op == "text":
+            text = message[1]
+        elif op == "search":
+            _, pattern, flags = message
+            try:
+                match = re.compile(pattern, flags).search(text)
+                payload = (match.group(0),) + match.groups() if match else None
+                conn.send(("ok", payload))
+            except re.error as e:
+                conn.send(("error", str(e)))
+
+
+class _RegexWorker:
+    """常驻匹配子进程的父端句柄"""
+
+    def __init__(self):
+        self._process = None
+        self._conn = None
+        self._text = None
+
+    def _ensure_started(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+
+        if not parent_conn.poll(_WORKER_STARTUP_TIMEOUT):
+            process.kill()
+            raise RuntimeError("Regex worker process failed to start")
+        parent_conn.recv()
+
+        self._process = process
+        self._conn = parent_conn
+        self._text = None
+
+    def kill(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+        self._text = None
+
+    def search(self, pattern: str, text: str, flags: int, timeout: float) -> Optional[Tuple]:
+        self._ensure_started()
+        # 同一文本连续执行多条规则时只传输一次
+        if self._text is not text:
+            self._conn.send(("text", text))
+            self._text = text
+        self._conn.send(("search", pattern, flags))
+
+        if not self._conn.poll(timeout):
+            logger.warning(f"Regex timed out after {timeout}s, restarting worker: {pattern!r}")
+            self.kill()
+            raise RegexTimeoutError(pattern, timeout)
+
+        status, payload = self._conn.recv()
+        if status == "error":
+            raise re.error(payload)
+        return payload
+
+
+_local = threading.local()
+
+
+def _get_worker() -> _RegexWorker:
+    worker = getattr(_local, "worker", None)
+    if worker is None:
+        worker = _RegexWorker()
+        _local.worker = worker
+    return worker
+
+
+def _default_timeout() -> float:
+    from ..config import settings
+    return settings.REGEX_TIMEOUT_SECONDS
+
+
+def safe_search(pattern: str, text: str, flags: int = 0, timeout: Optional[float] = None) -> Optional[Tuple]:
+    """
+    带时间预算的 ``re.search``
+
+    Returns:
+        未匹配时返回 None；否则返回 ``(group(0), group(1), ...)`` 元组。
+
+    Raises:
+        RegexTimeoutError: 匹配超出时间预算
+        re.error: 正则语法错误
+    """
+    if timeout is None:
+        timeout = _default_timeout()
+
+    if _regex_lib is not None:
+        try:
+            match = _regex_lib.search(pattern, text, flags=flags, timeout=timeout)
+        except TimeoutError:
+            raise RegexTimeoutError(pattern, timeout)
+        except _regex_lib.error as e:
+            raise re.error(str(e))
+        return (match.group(0),) + match.groups() if match else None
+
+    return _get_worker().search(pattern, text, flags, timeout)
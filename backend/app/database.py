@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -20,15 +20,24 @@ def get_engine():
     global _engine
     if _engine is None:
         kwargs = {}
+        in_memory = ":memory:" in settings.DATABASE_URL
         if "sqlite" in settings.DATABASE_URL:
-            kwargs["connect_args"] = {"check_same_thread": False}
+            kwargs["connect_args"] = {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_SECONDS}
             # For in-memory databases, we MUST use a StaticPool to share connection
-            if ":memory:" in settings.DATABASE_URL:
+            if in_memory:
                 kwargs["poolclass"] = StaticPool
         
         _engine = create_engine(settings.DATABASE_URL, **kwargs)
+        if "sqlite" in settings.DATABASE_URL and not in_memory:
+            event.listen(_engine, "connect", _enable_sqlite_wal)
     return _engine
 
+def _enable_sqlite_wal(dbapi_connection, connection_record):
+    # WAL 模式下读者不阻塞写者、写者也不阻塞读者，解析写入期间图谱读取与导出照常进行
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
 # Export engine as a proxy that behaves like the engine
 class EngineProxy:
     def __getattr__(self, name):
@@ -28,3 +28,14 @@ def get_ontology_service(
     onto_repo = OntologyRepository(db)
     webhook_repo = WebhookRepository(db)
     return OntologyService(onto_repo, webhook_repo, webhook_service)
+
+def get_parsing_service(db: Session = Depends(get_db)):
+    """解析服务依赖项"""
+    from .services.parsing_service import ParsingService
+    return ParsingService(db)
+
+def get_search_service(db: Session = Depends(get_db)):
+    """实体检索服务依赖项"""
+    from .repositories.search_repo import SearchRepository
+    from .services.search_service import SearchService
+    return SearchService(SearchRepository(db))
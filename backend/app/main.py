@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
 from typing import List
 import os
+import logging
 from datetime import datetime, UTC
 
 from .config import settings
@@ -16,9 +17,18 @@ from fastapi.responses import JSONResponse
 
 from . import models, schemas, database, utils
 
+logger = logging.getLogger(__name__)
+
 # 数据库初始化函数
 def init_db():
     models.Base.metadata.create_all(bind=database.engine)
+    with database.engine.begin() as connection:
+        # 已有数据库的表不会被 create_all 修改，补齐新增列与索引
+        added = models.upgrade_schema(connection)
+        if added:
+            logger.info(f"Upgraded database schema, added columns: {', '.join(added)}")
+        # 已有数据库中实体表早已存在，create_all 不会触发建表事件，这里补建全文检索表
+        models.ensure_entity_search(connection)
 
 # 在非测试环境下自动初始化
 if settings.ENV != "test":
@@ -30,6 +40,13 @@ from .services.webhook_service import WebhookService
 from .tasks import parse_ontology_task
 from .core.middleware import LoggingMiddleware
 from .routers import templates
+from .services.cross_series import register_cross_series_handlers
+from .services.graph_cache import register_graph_cache_handlers
+
+# 跨系列关系随目标系列的启用版本变化增量重算
+register_cross_series_handlers()
+# 启用版本切换或重解析后提前释放过期的邻接缓存
+register_graph_cache_handlers()
 
 
 @asynccontextmanager
@@ -47,12 +64,13 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-from .routers import templates, ontologies, webhooks
+from .routers import templates, ontologies, webhooks, search
 
 # 注册路由
 app.include_router(templates.router)
 app.include_router(ontologies.router)
 app.include_router(webhooks.router)
+app.include_router(search.router)
 
 # 注册中间件
 app.add_middleware(LoggingMiddleware)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Boolean, Index, Float, event, inspect, text
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import uuid
 
@@ -9,6 +9,13 @@ def generate_uuid():
     """生成 UUID 字符串"""
     return str(uuid.uuid4())
 
+# 内容派生标识的 UUIDv5 命名空间；修改会使所有已发布的稳定标识失效
+STABLE_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/fengxianjia/onto_hub/entity")
+
+def stable_uuid(*parts: str) -> str:
+    """由内容派生的确定性 UUIDv5 字符串，各部分以 \\x1f 分隔以避免拼接歧义"""
+    return str(uuid.uuid5(STABLE_ID_NAMESPACE, "\x1f".join(parts)))
+
 class OntologySeries(Base):
     """
     本体系列模型 (Series)
@@ -52,6 +59,8 @@ class OntologyPackage(Base):
     upload_time = Column(DateTime, default=datetime.utcnow, comment="上传时间")
     status = Column(String, default="UPLOADING", comment="状态: UPLOADING, PROCESSING, READY, ERROR")
     error_msg = Column(Text, nullable=True, comment="错误信息")
+    current_generation = Column(Integer, default=0, nullable=False, comment="当前对外可见的解析代次")
+    allocated_generation = Column(Integer, default=0, nullable=False, comment="已分配的最新解析代次")
 
     # Compatibility Properties
     @property
@@ -72,6 +81,10 @@ class OntologyPackage(Base):
     # 关联实体和关系
     entities = relationship("OntologyEntity", back_populates="package", cascade="all, delete-orphan")
     relations = relationship("OntologyRelation", back_populates="package", cascade="all, delete-orphan")
+    parse_reports = relationship("ParseReport", back_populates="package", cascade="all, delete-orphan")
+    cross_links = relationship("CrossSeriesLink", back_populates="package", cascade="all, delete-orphan")
+    graph_stats = relationship("GraphStats", back_populates="package", cascade="all, delete-orphan")
+    attributes = relationship("EntityAttribute", back_populates="package", cascade="all, delete-orphan")
 
     # 关联模板 (Snapshot, used for this specific version)
     template_id = Column(String, ForeignKey("parsing_templates.id"), nullable=True, comment="使用的解析模板ID")
@@ -89,6 +102,7 @@ class OntologyFile(Base):
     file_path = Column(String, nullable=False, comment="文件相对路径 (e.g. concepts/user.md)")
     file_size = Column(Integer, default=0, comment="文件大小(Bytes)")
     content_preview = Column(Text, nullable=True, comment="内容预览")
+    parse_warnings = Column(Text, nullable=True, comment="最近一次解析的告警列表 (JSON)")
 
     # 关联本体包
     package = relationship("OntologyPackage", back_populates="files")
@@ -162,6 +176,22 @@ class OntologyEntity(Base):
     category = Column(String, index=True, nullable=True, comment="分类 (e.g. Concept, System)")
     metadata_json = Column(Text, nullable=True, comment="元数据 (JSON)")
     file_path = Column(String, nullable=True, comment="来源文件路径")
+    generation = Column(Integer, default=0, nullable=False, comment="所属解析代次")
+    stable_id = Column(String, nullable=True, comment="稳定标识 (系列编码+类别+名称的 UUIDv5，跨版本与重解析不变)")
+    metadata_hash = Column(String, nullable=True, comment="metadata_json 的 SHA-1，用于版本间比对")
+    # 全文检索用的文本列，默认延迟加载，图谱/列表查询不会读取
+    metadata_text = deferred(Column(Text, nullable=True, comment="元数据取值拼接的检索文本"))
+    body = deferred(Column(Text, nullable=True, comment="Markdown 正文 (截断到 SEARCH_BODY_MAX_CHARS)"))
+    # 全文索引的整数键，插入时由触发器分配；不依赖隐式 rowid (VACUUM 可能重排 rowid)
+    search_rowid = Column(Integer, nullable=True, comment="全文检索索引中的行键")
+
+    __table_args__ = (
+        Index("ix_ontology_entities_package_stable", "package_id", "stable_id"),
+        # 实体列表按 (名称, ID) 键集分页，可选按类别过滤：两个索引都以排序键结尾，翻页时直接定位
+        Index("ix_ontology_entities_package_generation_category_name", "package_id", "generation", "category", "name", "id"),
+        Index("ix_ontology_entities_package_generation_name", "package_id", "generation", "name", "id"),
+        Index("ix_ontology_entities_search_rowid", "search_rowid", unique=True),
+    )
     
     # 关联
     package = relationship("OntologyPackage", back_populates="entities")
@@ -176,12 +206,244 @@ class OntologyRelation(Base):
 
     id = Column(String, primary_key=True, default=generate_uuid, index=True)
     package_id = Column(String, ForeignKey("ontology_packages.id"), nullable=False, index=True)
-    source_id = Column(String, ForeignKey("ontology_entities.id"), nullable=False)
-    target_id = Column(String, ForeignKey("ontology_entities.id"), nullable=False)
+    # 邻域遍历按端点查边，两端各建索引
+    source_id = Column(String, ForeignKey("ontology_entities.id"), nullable=False, index=True)
+    target_id = Column(String, ForeignKey("ontology_entities.id"), nullable=False, index=True)
     relation_type = Column(String, index=True, nullable=False, comment="关系类型 (e.g. depends_on)")
+    generation = Column(Integer, default=0, nullable=False, comment="所属解析代次")
+    stable_id = Column(String, nullable=True, comment="稳定标识 (两端实体稳定标识+关系类型的 UUIDv5)")
+
+    __table_args__ = (Index("ix_ontology_relations_package_generation", "package_id", "generation"),)
     
     # 关联
     package = relationship("OntologyPackage", back_populates="relations")
     source = relationship("OntologyEntity", foreign_keys=[source_id], back_populates="out_relations")
     target = relationship("OntologyEntity", foreign_keys=[target_id], back_populates="in_relations")
 
+class EntityAttribute(Base):
+    """
+    实体属性 (规范化的元数据键值)
+    解析时由 metadata_json 的顶层键展开写入，列表取值每个元素一行；按属性过滤实体时走索引，无需逐行解析 JSON
+    """
+    __tablename__ = "entity_attributes"
+
+    # 行数为实体数的数倍，使用整数自增主键，省去逐行生成 UUID 与更宽的主键索引
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    package_id = Column(String, ForeignKey("ontology_packages.id"), nullable=False)
+    generation = Column(Integer, nullable=False, comment="所属解析代次")
+    entity_id = Column(String, ForeignKey("ontology_entities.id"), nullable=False)
+    key = Column(String, nullable=False, comment="元数据顶层键")
+    value = Column(String, nullable=True, comment="取值的字符串形式；超过 ATTRIBUTE_VALUE_MAX_CHARS 或空列表时为空 (仅记录键存在)")
+
+    __table_args__ = (
+        # 覆盖按 (键, 取值) 定位实体与按包/代次回收两类访问
+        Index("ix_entity_attributes_lookup", "package_id", "generation", "key", "value", "entity_id"),
+    )
+
+    package = relationship("OntologyPackage", back_populates="attributes")
+
+class ParseReport(Base):
+    """
+    解析剖析报告
+    记录一次解析中每个文件的读取/解析/正则规则耗时，每个包保留最近一次
+    """
+    __tablename__ = "parse_reports"
+
+    id = Column(String, primary_key=True, default=generate_uuid, index=True)
+    package_id = Column(String, ForeignKey("ontology_packages.id"), nullable=False, index=True)
+    generation = Column(Integer, nullable=False, comment="对应的解析代次")
+    created_at = Column(DateTime, default=datetime.utcnow, comment="生成时间")
+    total_ms = Column(Float, default=0, comment="解析总耗时 (毫秒)")
+    file_count = Column(Integer, default=0, comment="解析的文件数")
+    entity_count = Column(Integer, default=0, comment="产出的实体数")
+    relation_count = Column(Integer, default=0, comment="产出的关系数")
+    report_json = Column(Text, nullable=False, comment="逐文件明细 (JSON)")
+
+    package = relationship("OntologyPackage", back_populates="parse_reports")
+
+class GraphStats(Base):
+    """
+    图谱结构统计
+    解析完成时基于新代次计算，每个包保留最近一次，仪表盘直接读取而无需扫描实体/关系表
+    """
+    __tablename__ = "graph_stats"
+
+    id = Column(String, primary_key=True, default=generate_uuid, index=True)
+    package_id = Column(String, ForeignKey("ontology_packages.id"), nullable=False, index=True)
+    generation = Column(Integer, nullable=False, comment="对应的解析代次")
+    created_at = Column(DateTime, default=datetime.utcnow, comment="计算时间")
+    node_count = Column(Integer, default=0, comment="实体数")
+    edge_count = Column(Integer, default=0, comment="关系数")
+    component_count = Column(Integer, default=0, comment="弱连通分量数")
+    orphan_count = Column(Integer, default=0, comment="无任何关系的实体数")
+    stats_json = Column(Text, nullable=False, comment="分类计数、度数直方图、枢纽实体等明细 (JSON)")
+
+    package = relationship("OntologyPackage", back_populates="graph_stats")
+
+class CrossSeriesLink(Base):
+    """
+    跨系列关系 (Edge to another series)
+    形如 [[core:Customer]] 的链接指向其他系列当前启用版本中的实体；
+    目标系列切换启用版本或重新解析后只重算指向它的这些边
+    """
+    __tablename__ = "cross_series_links"
+
+    id = Column(String, primary_key=True, default=generate_uuid, index=True)
+    package_id = Column(String, ForeignKey("ontology_packages.id"), nullable=False, index=True)
+    generation = Column(Integer, default=0, nullable=False, comment="所属解析代次")
+    source_id = Column(String, ForeignKey("ontology_entities.id"), nullable=False)
+    relation_type = Column(String, nullable=False, comment="关系类型")
+    target_series_code = Column(String, nullable=False, index=True, comment="目标系列编码")
+    target_name = Column(String, nullable=False, comment="链接中的目标名称")
+    target_package_id = Column(String, nullable=True, comment="解析时目标系列的启用版本ID")
+    target_entity_id = Column(String, nullable=True, comment="解析到的目标实体ID (未解析时为空)")
+
+    __table_args__ = (Index("ix_cross_series_links_package_generation", "package_id", "generation"),)
+
+    package = relationship("OntologyPackage", back_populates="cross_links")
+    source = relationship("OntologyEntity", foreign_keys=[source_id])
+
+
+# ---------------------------------------------------------------------------
+# 已有数据库的结构升级
+# create_all 只创建缺失的表，不会为已存在的表补列或补索引；启动时由 upgrade_schema 补齐。
+# ---------------------------------------------------------------------------
+
+# 早期版本创建、已被更宽的复合索引取代的索引
+_OBSOLETE_INDEXES = (
+    "ix_ontology_entities_package_generation",
+    "ix_ontology_entities_package_category_name",
+)
+
+
+def _column_default_sql(column) -> str:
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if default is None:
+        return ""
+    if isinstance(default, bool):
+        return f" DEFAULT {int(default)}"
+    if isinstance(default, (int, float)):
+        return f" DEFAULT {default}"
+    return " DEFAULT '{}'".format(str(default).replace("'", "''"))
+
+
+def upgrade_schema(connection) -> list:
+    """
+    为早于当前模型创建的数据库补齐新增列与索引 (幂等)，返回补建的列 ("表.列")。
+    新增列以模型默认值填充已有行：旧实体与关系落在代次 0，与包的 current_generation 默认值一致，升级后仍然可见。
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    preparer = connection.dialect.identifier_preparer
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in columns:
+                continue
+            default_sql = _column_default_sql(column)
+            # SQLite 只允许为带默认值的新增列声明 NOT NULL
+            not_null = " NOT NULL" if not column.nullable and default_sql else ""
+            connection.exec_driver_sql(
+                f"ALTER TABLE {preparer.quote(table.name)} ADD COLUMN {preparer.quote(column.name)} "
+                f"{column.type.compile(dialect=connection.dialect)}{default_sql}{not_null}"
+            )
+            added.append(f"{table.name}.{column.name}")
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    for name in _OBSOLETE_INDEXES:
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {preparer.quote(name)}")
+    return added
+
+
+# ---------------------------------------------------------------------------
+# 实体全文检索 (SQLite FTS5)
+# 外部内容表：索引内容直接取自 ontology_entities，按显式的整数列 search_rowid 对应，由触发器随实体增删同步，
+# 解析写入新代次、回收旧代次、删除包或系列时索引自动更新。
+# trigram 分词按三字符切分，对中文等无空格分词的文本同样有效，查询按子串匹配；少于三个字符的词由检索层改用 LIKE。
+# ---------------------------------------------------------------------------
+ENTITY_SEARCH_TABLE = "entity_search"
+
+_ENTITY_SEARCH_COLUMNS = "name, category, metadata_text, body"
+
+# trigram 分词器自 SQLite 3.34 起提供
+_TRIGRAM_MIN_SQLITE_VERSION = (3, 34, 0)
+
+_ENTITY_SEARCH_TRIGGERS = ("ai", "ak", "ad", "au")
+
+_ENTITY_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {ENTITY_SEARCH_TABLE} USING fts5("
+    f"{_ENTITY_SEARCH_COLUMNS}, content='ontology_entities', content_rowid='search_rowid', tokenize='trigram')",
+    # 未指定 search_rowid 的插入 (ORM 与批量写入均如此) 取当前最大值 + 1，由唯一索引直接求得；
+    # 该 UPDATE 触发 _au，把新行写入索引
+    f"CREATE TRIGGER IF NOT EXISTS {ENTITY_SEARCH_TABLE}_ak AFTER INSERT ON ontology_entities "
+    "WHEN new.search_rowid IS NULL BEGIN "
+    "UPDATE ontology_entities SET search_rowid = (SELECT coalesce(max(search_rowid), 0) + 1 FROM ontology_entities) "
+    "WHERE rowid = new.rowid; END",
+    f"CREATE TRIGGER IF NOT EXISTS {ENTITY_SEARCH_TABLE}_ai AFTER INSERT ON ontology_entities "
+    "WHEN new.search_rowid IS NOT NULL BEGIN "
+    f"INSERT INTO {ENTITY_SEARCH_TABLE}(rowid, {_ENTITY_SEARCH_COLUMNS}) "
+    "VALUES (new.search_rowid, new.name, new.category, new.metadata_text, new.body); END",
+    f"CREATE TRIGGER IF NOT EXISTS {ENTITY_SEARCH_TABLE}_ad AFTER DELETE ON ontology_entities "
+    "WHEN old.search_rowid IS NOT NULL BEGIN "
+    f"INSERT INTO {ENTITY_SEARCH_TABLE}({ENTITY_SEARCH_TABLE}, rowid, {_ENTITY_SEARCH_COLUMNS}) "
+    "VALUES ('delete', old.search_rowid, old.name, old.category, old.metadata_text, old.body); END",
+    f"CREATE TRIGGER IF NOT EXISTS {ENTITY_SEARCH_TABLE}_au AFTER UPDATE OF {_ENTITY_SEARCH_COLUMNS}, search_rowid "
+    "ON ontology_entities BEGIN "
+    f"INSERT INTO {ENTITY_SEARCH_TABLE}({ENTITY_SEARCH_TABLE}, rowid, {_ENTITY_SEARCH_COLUMNS}) "
+    "SELECT 'delete', old.search_rowid, old.name, old.category, old.metadata_text, old.body "
+    "WHERE old.search_rowid IS NOT NULL; "
+    f"INSERT INTO {ENTITY_SEARCH_TABLE}(rowid, {_ENTITY_SEARCH_COLUMNS}) "
+    "SELECT new.search_rowid, new.name, new.category, new.metadata_text, new.body "
+    "WHERE new.search_rowid IS NOT NULL; END",
+)
+
+
+def fts5_available(connection) -> bool:
+    """SQLite 编译了 FTS5 且版本支持 trigram 分词器"""
+    if connection.dialect.name != "sqlite":
+        return False
+    if (connection.dialect.server_version_info or (0,)) < _TRIGRAM_MIN_SQLITE_VERSION:
+        return False
+    return bool(connection.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar())
+
+
+def ensure_entity_search(connection) -> bool:
+    """
+    创建 (若不存在) 全文检索虚拟表与同步触发器，返回检索表是否可用。
+    首次创建或由旧版定义 (按隐式 rowid 关联、unicode61 分词) 升级时，
+    先为没有 search_rowid 的实体分配键，再重建索引把现存实体纳入检索。
+    """
+    if not fts5_available(connection):
+        return False
+    definition = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (ENTITY_SEARCH_TABLE,)
+    ).scalar()
+    rebuild = definition is None or "content_rowid='search_rowid'" not in definition
+    if rebuild:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {ENTITY_SEARCH_TABLE}")
+        for suffix in _ENTITY_SEARCH_TRIGGERS:
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {ENTITY_SEARCH_TABLE}_{suffix}")
+        connection.exec_driver_sql(
+            "UPDATE ontology_entities SET search_rowid = rowid + "
+            "(SELECT coalesce(max(search_rowid), 0) FROM ontology_entities) WHERE search_rowid IS NULL"
+        )
+    for statement in _ENTITY_SEARCH_DDL:
+        connection.exec_driver_sql(statement)
+    if rebuild:
+        connection.exec_driver_sql(f"INSERT INTO {ENTITY_SEARCH_TABLE}({ENTITY_SEARCH_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+@event.listens_for(OntologyEntity.__table__, "after_create")
+def _create_entity_search(target, connection, **kw):
+    ensure_entity_search(connection)
+
+
+@event.listens_for(OntologyEntity.__table__, "before_drop")
+def _drop_entity_search(target, connection, **kw):
+    # 触发器随实体表一同删除；虚拟表不在元数据中，需显式删除以免残留过期索引
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {ENTITY_SEARCH_TABLE}"))
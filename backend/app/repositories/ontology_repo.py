@@ -1,6 +1,6 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, desc
-from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session, aliased, joinedload
+from sqlalchemy import and_, desc, func, literal, null, or_, select, tuple_, union_all
+from typing import Iterator, List, Optional, Tuple
 from .. import models, schemas
 
 class OntologyRepository:
@@ -63,6 +63,26 @@ class OntologyRepository:
         self.db.refresh(db_package)
         return db_package
 
+    def find_packages_for_reparse(self, template_id: str = None, series_code: str = None,
+                                  package_ids: List[str] = None, active_only: bool = False) -> List[models.OntologyPackage]:
+        """
+        按模板、系列或版本集合筛选需要重解析的包 (条件之间取交集)。
+        按模板筛选时包含未单独指定模板、沿用系列默认模板的版本。
+        """
+        query = self.db.query(models.OntologyPackage).join(models.OntologySeries)
+        if template_id:
+            query = query.filter(or_(
+                models.OntologyPackage.template_id == template_id,
+                (models.OntologyPackage.template_id.is_(None)) & (models.OntologySeries.default_template_id == template_id)
+            ))
+        if series_code:
+            query = query.filter(models.OntologyPackage.series_code == series_code)
+        if package_ids:
+            query = query.filter(models.OntologyPackage.id.in_(package_ids))
+        if active_only:
+            query = query.filter(models.OntologyPackage.is_active == True)
+        return query.order_by(models.OntologyPackage.is_active.desc(), models.OntologyPackage.version.desc()).all()
+
     def get_package(self, package_id: str) -> Optional[models.OntologyPackage]:
         return self.db.query(models.OntologyPackage).filter(models.OntologyPackage.id == package_id).first()
 
@@ -155,11 +175,466 @@ class OntologyRepository:
         self.db.bulk_save_objects(objects)
         self.db.commit()
 
+    def _current_generation(self, package_id: str):
+        """当前可见代次的标量子查询，与读取语句在同一条 SQL 中求值"""
+        return (
+            self.db.query(models.OntologyPackage.current_generation)
+            .filter(models.OntologyPackage.id == package_id)
+            .scalar_subquery()
+        )
+
+    def _entity_query(self, package_id: str):
+        return self.db.query(models.OntologyEntity).filter(
+            models.OntologyEntity.package_id == package_id,
+            models.OntologyEntity.generation == self._current_generation(package_id)
+        )
+
+    def _relation_query(self, package_id: str):
+        return self.db.query(models.OntologyRelation).filter(
+            models.OntologyRelation.package_id == package_id,
+            models.OntologyRelation.generation == self._current_generation(package_id)
+        )
+
+    # 属性过滤的匹配数低于该值时改由属性索引驱动查询 (匹配实体按主键回表后排序)，
+    # 否则沿 (名称, ID) 索引顺序扫描并逐行探测，两种方式读取的行数都不超过该量级
+    ATTRIBUTE_DRIVE_THRESHOLD = 10_000
+
+    def _attribute_matches(self, package_id: str, generation: int, key: str, expected: Optional[str]):
+        attribute = models.EntityAttribute
+        matched = select(attribute.entity_id).where(
+            attribute.package_id == package_id, attribute.generation == generation, attribute.key == key
+        )
+        if expected is not None:
+            matched = matched.where(attribute.value == expected)
+        return matched
+
+    def _filtered_entity_query(self, package_id: str, generation: int, category: Optional[str] = None,
+                               name_prefix: Optional[str] = None,
+                               metadata: List[Tuple[str, Optional[str]]] = (), drive_by_attributes: bool = False):
+        entity = models.OntologyEntity
+        query = self.db.query(entity)
+        if not (metadata and drive_by_attributes):
+            query = query.filter(entity.package_id == package_id, entity.generation == generation)
+        # 否则属性行已限定包与代次 (实体主键由包、代次派生)；省去这两个条件后
+        # 实体表上没有可用的复合索引前缀，SQLite 只能按 id IN (...) 逐个主键定位
+        if category is not None:
+            query = query.filter(entity.category == category)
+        if name_prefix:
+            # 以区间比较代替 LIKE：按二进制排序与索引 (包, 代次, [类别,] 名称, ID) 一致，可直接定位
+            query = query.filter(entity.name >= name_prefix)
+            if ord(name_prefix[-1]) < 0x10FFFF:
+                query = query.filter(entity.name < name_prefix[:-1] + chr(ord(name_prefix[-1]) + 1))
+        for key, expected in metadata:
+            matched = self._attribute_matches(package_id, generation, key, expected)
+            if drive_by_attributes:
+                # 在属性索引 (包, 代次, 键, 取值) 上一次取出满足条件的实体集合
+                query = query.filter(entity.id.in_(matched))
+            else:
+                # 逐行探测：相关子查询用满属性索引的全部列，不会先物化整个匹配集合
+                query = query.filter(matched.where(models.EntityAttribute.entity_id == entity.id).exists())
+        return query
+
+    def _is_selective(self, package_id: str, generation: int, metadata: List[Tuple[str, Optional[str]]]) -> bool:
+        """任一属性条件的匹配行数低于阈值即视为选择性高；计数带 LIMIT，代价有上界"""
+        for key, expected in metadata:
+            bounded = self._attribute_matches(package_id, generation, key, expected).limit(self.ATTRIBUTE_DRIVE_THRESHOLD)
+            if self.db.execute(select(func.count()).select_from(bounded.subquery())).scalar() < self.ATTRIBUTE_DRIVE_THRESHOLD:
+                return True
+        return False
+
+    def list_entities(self, package_id: str, generation: int, category: Optional[str] = None,
+                      name_prefix: Optional[str] = None, metadata: List[Tuple[str, Optional[str]]] = (),
+                      after: Optional[Tuple[str, str]] = None, limit: int = 100) -> List[models.OntologyEntity]:
+        """按 (名称, ID) 稳定排序的键集分页：after 为上一页最后一行的 (名称, ID)"""
+        entity = models.OntologyEntity
+        drive = bool(metadata) and self._is_selective(package_id, generation, metadata)
+        query = self._filtered_entity_query(package_id, generation, category, name_prefix, metadata, drive)
+        if after is not None:
+            query = query.filter(tuple_(entity.name, entity.id) > tuple_(*after))
+        return query.order_by(entity.name, entity.id).limit(limit).all()
+
+    def get_attribute_keys(self, package_id: str, generation: int) -> List[Tuple[str, int]]:
+        """当前代次出现过的属性键及拥有该键的实体数，按键排序"""
+        attribute = models.EntityAttribute
+        return (
+            self.db.query(attribute.key, func.count(attribute.entity_id.distinct()))
+            .filter(attribute.package_id == package_id, attribute.generation == generation)
+            .group_by(attribute.key)
+            .order_by(attribute.key)
+            .all()
+        )
+
+    def get_attribute_values(self, package_id: str, generation: int, key: str, limit: int) -> List[Tuple[str, int]]:
+        """指定键下最常见的取值及实体数 (不含只记录键存在的空取值)"""
+        attribute = models.EntityAttribute
+        count = func.count(attribute.entity_id)
+        return (
+            self.db.query(attribute.value, count)
+            .filter(attribute.package_id == package_id, attribute.generation == generation,
+                    attribute.key == key, attribute.value.isnot(None))
+            .group_by(attribute.value)
+            .order_by(count.desc(), attribute.value)
+            .limit(limit)
+            .all()
+        )
+
+    def count_entities(self, package_id: str, generation: int, category: Optional[str] = None,
+                       name_prefix: Optional[str] = None, metadata: List[Tuple[str, Optional[str]]] = ()) -> int:
+        if metadata and category is None and not name_prefix and len(metadata) == 1:
+            # 只有一个属性条件时直接在属性覆盖索引上计数，无需回表
+            key, expected = metadata[0]
+            matched = self._attribute_matches(package_id, generation, key, expected).distinct().subquery()
+            return self.db.execute(select(func.count()).select_from(matched)).scalar() or 0
+        # 计数需要读取全部匹配行，有属性条件时总是由属性索引驱动
+        query = self._filtered_entity_query(package_id, generation, category, name_prefix, metadata, drive_by_attributes=True)
+        return query.with_entities(func.count(models.OntologyEntity.id)).scalar() or 0
+
+    def get_graph(self, package_id: str) -> Tuple[List[models.OntologyEntity], List[models.OntologyRelation]]:
+        return self._entity_query(package_id).all(), self._relation_query(package_id).all()
+
+    def get_current_generation(self, package_id: str) -> Optional[int]:
+        """包当前可见的代次；包不存在时返回 None"""
+        row = (
+            self.db.query(models.OntologyPackage.current_generation)
+            .filter(models.OntologyPackage.id == package_id)
+            .first()
+        )
+        return None if row is None else (row[0] or 0)
+
+    def _graph_query(self, kind: str, package_id: str, generation: int):
+        # 只查询响应需要的列，行以元组返回，不进入 ORM identity map
+        if kind == "nodes":
+            model = models.OntologyEntity
+            columns = (model.id, model.package_id, model.name, model.category,
+                       model.metadata_json, model.file_path, model.stable_id)
+        else:
+            model = models.OntologyRelation
+            columns = (model.id, model.source_id, model.target_id, model.relation_type, model.stable_id)
+        return (
+            self.db.query(*columns)
+            .filter(model.package_id == package_id, model.generation == generation)
+            .order_by(model.id)
+        ), model
+
+    def get_graph_page(self, kind: str, package_id: str, generation: int, after: Optional[str], limit: int) -> list:
+        """按主键键集分页读取指定代次的节点 (kind="nodes") 或边 (kind="links")"""
+        query, model = self._graph_query(kind, package_id, generation)
+        if after is not None:
+            query = query.filter(model.id > after)
+        return query.limit(limit).all()
+
+    def iter_graph_rows(self, kind: str, package_id: str, generation: int, batch_size: int) -> Iterator[list]:
+        """
+        按主键键集分页逐批产出节点 (kind="nodes") 或边 (kind="links")。
+        每批是一条独立的短查询且已完整读取，批次之间不持有游标，慢消费者不会长时间占用数据库读锁。
+        """
+        after = None
+        while True:
+            rows = self.get_graph_page(kind, package_id, generation, after, batch_size)
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                return
+            after = rows[-1].id
+
+    def iter_relation_endpoints(self, package_id: str, generation: int, batch_size: int) -> Iterator[list]:
+        """
+        按关系主键键集分页产出 (源稳定标识, 关系类型, 目标稳定标识) 批次。
+        两端按主键关联实体表取稳定标识，导出的三元组跨版本与重解析保持不变。
+        """
+        relation = models.OntologyRelation
+        source, target = aliased(models.OntologyEntity), aliased(models.OntologyEntity)
+        query = (
+            self.db.query(relation.id, func.coalesce(source.stable_id, source.id), relation.relation_type,
+                          func.coalesce(target.stable_id, target.id))
+            .join(source, source.id == relation.source_id)
+            .join(target, target.id == relation.target_id)
+            .filter(relation.package_id == package_id, relation.generation == generation)
+            .order_by(relation.id)
+        )
+        after = None
+        while True:
+            rows = (query.filter(relation.id > after) if after is not None else query).limit(batch_size).all()
+            if rows:
+                yield [tuple(row[1:]) for row in rows]
+            if len(rows) < batch_size:
+                return
+            after = rows[-1][0]
+
+    def find_entity_ids(self, package_id: str, ids: List[str] = (), names: List[str] = ()) -> List[str]:
+        """在当前代次中按 ID 或精确名称查找实体，返回存在的实体 ID"""
+        # ID 与名称分开查询：合并成 OR 条件时 SQLite 只能按 (包, 代次) 扫描整代实体
+        found: List[str] = []
+        for condition in (
+            models.OntologyEntity.id.in_(ids) if ids else None,
+            models.OntologyEntity.name.in_(names) if names else None,
+        ):
+            if condition is None:
+                continue
+            query = self._entity_query(package_id).with_entities(models.OntologyEntity.id).filter(condition)
+            found.extend(row[0] for row in query.all() if row[0] not in found)
+        return found
+
+    # 逐层遍历时每条 IN 查询携带的前沿节点数
+    _FRONTIER_BATCH = 500
+
+    def get_neighborhood(self, package_id: str, seed_ids: List[str], depth: int, max_nodes: int,
+                         relation_types: Optional[List[str]] = None, categories: Optional[List[str]] = None,
+                         direction: str = "both") -> Tuple[List[tuple], list, bool]:
+        """
+        k 跳邻域：从种子实体出发逐层 BFS，沿边扩展 depth 跳 (direction: out / in / both)，最多保留 max_nodes 个节点，
+        并返回这些节点之间的边。每层按批读取前沿节点的相邻边，节点数超出上限即停止读取，
+        遍历代价受 max_nodes 约束而不随枢纽节点的完整邻域增长；截断时最后一层保留先读到的节点。
+        relation_types 限定可经过的边，categories 限定可到达的节点 (种子本身不受限)。
+        返回 ([(entity, depth)], relations, truncated)。
+        """
+        entity = models.OntologyEntity
+        frontier = [
+            row[0] for row in
+            self._entity_query(package_id).with_entities(entity.id).filter(entity.id.in_(seed_ids)).order_by(entity.id)
+        ]
+        depths: dict = {}
+        truncated = False
+        hops = 0
+        while frontier:
+            room = max_nodes - len(depths)
+            if len(frontier) > room:
+                depths.update((node, hops) for node in frontier[:room])
+                truncated = True
+                break
+            depths.update((node, hops) for node in frontier)
+            if hops == depth:
+                break
+            # 多取一个，用于判断下一层是否会超出上限
+            frontier = self._next_layer(frontier, depths, max_nodes - len(depths) + 1,
+                                        relation_types, categories, direction)
+            hops += 1
+        nodes, relations = self.get_subgraph(depths, relation_types)
+        return nodes, relations, truncated
+
+    def _next_layer(self, frontier: List[str], visited: dict, limit: int, relation_types: Optional[List[str]],
+                    categories: Optional[List[str]], direction: str) -> List[str]:
+        """前沿节点的未访问邻居，按读取顺序最多返回 limit 个；达到 limit 后关闭游标，不再读取剩余的边"""
+        entity, relation = models.OntologyEntity, models.OntologyRelation
+        # 实体行主键已包含包与代次，端点匹配的边必然属于同一包同一代次；
+        # 不再附加 package_id/generation 条件，以免规划器放弃端点索引改扫整代的边
+        edge_filter = [relation.relation_type.in_(relation_types)] if relation_types else []
+        endpoints = []
+        if direction in ("out", "both"):
+            endpoints.append((relation.source_id, relation.target_id))
+        if direction in ("in", "both"):
+            endpoints.append((relation.target_id, relation.source_id))
+
+        reached: dict = {}
+        for start in range(0, len(frontier), self._FRONTIER_BATCH):
+            batch = frontier[start:start + self._FRONTIER_BATCH]
+            for near, far in endpoints:
+                query = select(far).where(near.in_(batch), *edge_filter)
+                if categories:
+                    query = query.join(entity, entity.id == far).where(entity.category.in_(categories))
+                result = self.db.execute(query.execution_options(yield_per=1000))
+                try:
+                    for (neighbor,) in result:
+                        if neighbor not in visited and neighbor not in reached:
+                            reached[neighbor] = None
+                            if len(reached) >= limit:
+                                return list(reached)
+                finally:
+                    result.close()
+        return list(reached)
+
+    def get_subgraph_nodes(self, depths: dict) -> List[tuple]:
+        """按 {实体ID: 跳数} 只取回实体行，按 (跳数, 名称) 排序；可达集与路径只需要实体，不读取边"""
+        if not depths:
+            return []
+        entity = models.OntologyEntity
+        entities = self.db.query(entity).filter(entity.id.in_(list(depths))).all()
+        return sorted(((e, depths[e.id]) for e in entities), key=lambda item: (item[1], item[0].name))
+
+    def get_subgraph(self, depths: dict, relation_types: Optional[List[str]] = None) -> Tuple[List[tuple], list]:
+        """按 {实体ID: 跳数} 取回实体行及其两两之间的边 (邻接缓存遍历后同样由此补全)"""
+        if not depths:
+            return [], []
+        relation = models.OntologyRelation
+        ids = list(depths)
+        edge_filter = [relation.relation_type.in_(relation_types)] if relation_types else []
+        relations = (
+            self.db.query(relation)
+            .filter(relation.source_id.in_(ids), relation.target_id.in_(ids), *edge_filter)
+            .all()
+        )
+        return self.get_subgraph_nodes(depths), relations
+
+    def get_path_relations(self, path_ids: List[str], direction: str = "out",
+                           relation_types: Optional[List[str]] = None) -> list:
+        """路径上每对相邻实体之间的一条边 (direction 与遍历一致；多条时按关系类型、ID 取第一条)"""
+        relation = models.OntologyRelation
+        pairs = list(zip(path_ids, path_ids[1:]))
+        if not pairs:
+            return []
+        wanted = {}
+        for a, b in pairs:
+            if direction in ("out", "both"):
+                wanted.setdefault((a, b), (a, b))
+            if direction in ("in", "both"):
+                wanted.setdefault((b, a), (a, b))
+        edge_filter = [relation.relation_type.in_(relation_types)] if relation_types else []
+        # 按端点索引取路径节点之间的边，再在内存中匹配相邻对 (行值 IN 在 SQLite 上无法使用索引)
+        rows = (
+            self.db.query(relation)
+            .filter(relation.source_id.in_(path_ids), relation.target_id.in_(path_ids), *edge_filter)
+            .order_by(relation.relation_type, relation.id)
+            .all()
+        )
+        chosen = {}
+        for row in rows:
+            pair = wanted.get((row.source_id, row.target_id))
+            if pair is not None:
+                chosen.setdefault(pair, row)
+        return [chosen[pair] for pair in pairs if pair in chosen]
+
     def get_relations(self, package_id: str, skip: int = 0, limit: int = 100) -> Tuple[List[models.OntologyRelation], int]:
-        query = self.db.query(models.OntologyRelation).filter(models.OntologyRelation.package_id == package_id)
+        query = self._relation_query(package_id)
         # Eager load source and target entities
         query = query.options(joinedload(models.OntologyRelation.source), joinedload(models.OntologyRelation.target))
         
         total = query.count()
         items = query.offset(skip).limit(limit).all()
         return items, total
+
+    def get_cross_relations(self, package_id: str, skip: int = 0, limit: int = 100) -> Tuple[list, int]:
+        """当前代次的跨系列关系，附带源实体名称与 (仍存在的) 目标实体名称"""
+        link = models.CrossSeriesLink
+        source = aliased(models.OntologyEntity)
+        target = aliased(models.OntologyEntity)
+        query = (
+            self.db.query(link, source.name, target.name)
+            .join(source, source.id == link.source_id)
+            .outerjoin(target, target.id == link.target_entity_id)
+            .filter(link.package_id == package_id, link.generation == self._current_generation(package_id))
+        )
+        total = query.count()
+        items = query.order_by(source.name, link.target_series_code, link.target_name).offset(skip).limit(limit).all()
+        return items, total
+
+    def get_entity_metadata(self, entity_ids: List[str]) -> dict:
+        rows = (
+            self.db.query(models.OntologyEntity.id, models.OntologyEntity.metadata_json)
+            .filter(models.OntologyEntity.id.in_(entity_ids))
+            .all()
+        ) if entity_ids else []
+        return dict(rows)
+
+    def _has_unkeyed_entities(self, package_id: str) -> bool:
+        """当前代次是否有缺少稳定标识的实体 (升级前解析、尚未重新解析的版本)"""
+        entity = models.OntologyEntity
+        return self.db.query(
+            self._entity_query(package_id).filter(entity.stable_id.is_(None)).exists()
+        ).scalar()
+
+    def _current_entities(self, package_id: str, by_stable_id: bool):
+        """
+        当前代次实体及其关联键 match_key：同系列版本间用稳定标识 (重复实体已按来源文件区分)；
+        跨系列比较或任一侧缺少稳定标识时，改用 (类别, 名称) 内按来源文件排序的序号，重复实体一一对应而不是两两相连
+        """
+        entity = models.OntologyEntity
+        if by_stable_id:
+            match_key = entity.stable_id
+        else:
+            match_key = func.row_number().over(
+                partition_by=(entity.category, entity.name), order_by=(entity.file_path, entity.id)
+            )
+        return (
+            select(entity.id, entity.category, entity.name, entity.metadata_hash, entity.metadata_json,
+                   match_key.label("match_key"))
+            .where(entity.package_id == package_id, entity.generation == self._current_generation(package_id))
+            .subquery()
+        )
+
+    def diff_entities(self, base_id: str, target_id: str) -> List[tuple]:
+        """
+        两个版本当前代次的实体级差异，按关联键一对一关联、比较 metadata_hash，全部在一条 SQL 中完成。
+        升级前解析的行没有稳定标识与 metadata_hash，涉及这类版本时按 (类别, 名称, 序号) 关联并直接比较 metadata_json。
+        返回 (status, category, name, base_entity_id, target_entity_id)，status 与文件对比一致：added / deleted / modified。
+        """
+        series = dict(
+            self.db.query(models.OntologyPackage.id, models.OntologyPackage.series_code)
+            .filter(models.OntologyPackage.id.in_((base_id, target_id)))
+            .all()
+        )
+        by_stable_id = (
+            series.get(base_id) == series.get(target_id)
+            and not self._has_unkeyed_entities(base_id) and not self._has_unkeyed_entities(target_id)
+        )
+        base, target = self._current_entities(base_id, by_stable_id), self._current_entities(target_id, by_stable_id)
+        same_key = base.c.match_key == target.c.match_key
+        if not by_stable_id:
+            same_key = and_(same_key, base.c.name == target.c.name,
+                            base.c.category.is_not_distinct_from(target.c.category))
+        added = (
+            select(literal("added").label("status"), target.c.category, target.c.name,
+                   null().label("base_id"), target.c.id.label("target_id"))
+            .select_from(target.outerjoin(base, same_key))
+            .where(base.c.id.is_(None))
+        )
+        deleted = (
+            select(literal("deleted").label("status"), base.c.category, base.c.name,
+                   base.c.id.label("base_id"), null().label("target_id"))
+            .select_from(base.outerjoin(target, same_key))
+            .where(target.c.id.is_(None))
+        )
+        modified = (
+            select(literal("modified").label("status"), base.c.category, base.c.name,
+                   base.c.id.label("base_id"), target.c.id.label("target_id"))
+            .select_from(base.join(target, same_key))
+            .where(or_(
+                and_(base.c.metadata_hash.is_not(None), target.c.metadata_hash.is_not(None),
+                     base.c.metadata_hash != target.c.metadata_hash),
+                and_(or_(base.c.metadata_hash.is_(None), target.c.metadata_hash.is_(None)),
+                     base.c.metadata_json.is_distinct_from(target.c.metadata_json)),
+            ))
+        )
+        diff = union_all(added, deleted, modified).subquery()
+        return self.db.execute(select(diff).order_by(diff.c.category, diff.c.name, diff.c.status)).all()
+
+    def _current_relation_keys(self, package_id: str):
+        relation = models.OntologyRelation
+        source = aliased(models.OntologyEntity)
+        target = aliased(models.OntologyEntity)
+        return (
+            select(source.category, source.name, relation.relation_type, target.category, target.name)
+            .join(source, source.id == relation.source_id)
+            .join(target, target.id == relation.target_id)
+            .where(relation.package_id == package_id, relation.generation == self._current_generation(package_id))
+        )
+
+    def diff_relations(self, base_id: str, target_id: str) -> List[tuple]:
+        """
+        关系级差异：关系以 (源类别, 源名称, 关系类型, 目标类别, 目标名称) 标识，两侧键集合求差。
+        返回 (status, source_category, source_name, relation_type, target_category, target_name)。
+        """
+        base, target = self._current_relation_keys(base_id), self._current_relation_keys(target_id)
+        added = target.except_(base).subquery()
+        deleted = base.except_(target).subquery()
+        diff = union_all(
+            select(literal("added").label("status"), *added.c),
+            select(literal("deleted").label("status"), *deleted.c),
+        ).subquery()
+        columns = list(diff.c)
+        return self.db.execute(select(diff).order_by(*columns[1:], columns[0])).all()
+
+    def get_graph_stats(self, package_id: str) -> Optional[models.GraphStats]:
+        return (
+            self.db.query(models.GraphStats)
+            .filter(models.GraphStats.package_id == package_id)
+            .order_by(models.GraphStats.created_at.desc())
+            .first()
+        )
+
+    def get_parse_report(self, package_id: str) -> Optional[models.ParseReport]:
+        return (
+            self.db.query(models.ParseReport)
+            .filter(models.ParseReport.package_id == package_id)
+            .order_by(models.ParseReport.created_at.desc())
+            .first()
+        )
@@ -0,0 +1,128 @@
+from abc import ABC, abstractmethod
+from sqlalchemy.orm import Session
+from sqlalchemy import column, func, literal_column, or_, select, table, text
+from typing import List, Optional, Tuple
+from .. import models
+
+# bm25 列权重：名称 > 类别 > 元数据取值 > 正文
+BM25_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+
+# trigram 索引只能匹配不少于三个字符的词
+TRIGRAM_MIN_CHARS = 3
+
+
+def like_conditions(terms: List[str]) -> list:
+    """逐词在各检索列上做子串匹配的 LIKE 条件，多个词之间为 AND"""
+    entity = models.OntologyEntity
+    columns = (entity.name, entity.category, entity.metadata_text, entity.body)
+    return [or_(*(column.contains(term, autoescape=True) for column in columns)) for term in terms]
+
+
+class SearchBackend(ABC):
+    """
+    实体检索后端 (可插拔)
+
+    search 返回 ([(entity, series_code, version, score, snippet)], total)，
+    结果只包含各包当前代次的实体。各词均按子串匹配 (不区分 ASCII 大小写)。
+    """
+    name = "base"
+
+    @abstractmethod
+    def search(self, db: Session, terms: List[str], filters: list,
+               skip: int, limit: int) -> Tuple[List[tuple], int]:
+        pass
+
+
+class Fts5SearchBackend(SearchBackend):
+    """
+    SQLite FTS5 trigram 索引：子串匹配 (含中文等无空格分词的文本)、bm25 排序，并返回命中片段。
+    少于三个字符的词无法走 trigram 索引，作为 LIKE 条件叠加在索引命中的结果上；全部为短词时整体回退到 LIKE。
+    """
+    name = "fts5"
+
+    @staticmethod
+    def match_expression(terms: List[str]) -> str:
+        # 每个词作为带引号的短语 (转义双引号)，避免用户输入被解释为 FTS5 运算符；多个词之间为 AND
+        return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+    def search(self, db, terms, filters, skip, limit):
+        indexed = [term for term in terms if len(term) >= TRIGRAM_MIN_CHARS]
+        if not indexed:
+            return LikeSearchBackend().search(db, terms, filters, skip, limit)
+        short = [term for term in terms if len(term) < TRIGRAM_MIN_CHARS]
+        entity, package = models.OntologyEntity, models.OntologyPackage
+        fts = table(models.ENTITY_SEARCH_TABLE, column("rowid"))
+        # MATCH / bm25 / snippet 以表名作为隐藏列引用
+        fts_ref = literal_column(models.ENTITY_SEARCH_TABLE)
+        rank = func.bm25(fts_ref, *BM25_WEIGHTS)
+        base = (
+            select(fts.c.rowid)
+            .join(entity, entity.search_rowid == fts.c.rowid)
+            .join(package, package.id == entity.package_id)
+            .where(
+                fts_ref.op("MATCH")(self.match_expression(indexed)),
+                entity.generation == package.current_generation,
+                *like_conditions(short),
+                *filters
+            )
+        )
+        total = db.execute(select(func.count()).select_from(base.subquery())).scalar()
+        rows = db.execute(
+            base.with_only_columns(
+                entity, package.series_code, package.version, (-rank).label("score"),
+                func.snippet(fts_ref, -1, "<mark>", "</mark>", "…", 12).label("snippet")
+            )
+            .order_by(rank, entity.name)
+            .offset(skip)
+            .limit(limit)
+        ).all()
+        return [tuple(row) for row in rows], total
+
+
+class LikeSearchBackend(SearchBackend):
+    """无 FTS5 (或查询只含短词) 时的回退实现：逐词 LIKE 子串匹配，按名称排序，不提供相关度与片段"""
+    name = "like"
+
+    def search(self, db, terms, filters, skip, limit):
+        entity, package = models.OntologyEntity, models.OntologyPackage
+        query = (
+            db.query(entity, package.series_code, package.version)
+            .join(package, package.id == entity.package_id)
+            .filter(entity.generation == package.current_generation, *like_conditions(terms), *filters)
+        )
+        total = query.count()
+        rows = query.order_by(entity.name).offset(skip).limit(limit).all()
+        return [(e, series_code, version, None, None) for e, series_code, version in rows], total
+
+
+class SearchRepository:
+    def __init__(self, db: Session, backend: Optional[SearchBackend] = None):
+        self.db = db
+        self._backend = backend
+
+    @property
+    def backend(self) -> SearchBackend:
+        """检索虚拟表存在时使用 FTS5，否则回退到 LIKE"""
+        if self._backend is None:
+            exists = self.db.get_bind().dialect.name == "sqlite" and self.db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": models.ENTITY_SEARCH_TABLE}
+            ).first() is not None
+            self._backend = Fts5SearchBackend() if exists else LikeSearchBackend()
+        return self._backend
+
+    def search_entities(self, terms: List[str], series_code: Optional[str] = None,
+                        package_id: Optional[str] = None, category: Optional[str] = None,
+                        active_only: bool = True, skip: int = 0, limit: int = 20) -> Tuple[List[tuple], int]:
+        entity, package = models.OntologyEntity, models.OntologyPackage
+        filters = []
+        if series_code:
+            filters.append(package.series_code == series_code)
+        if package_id:
+            filters.append(package.id == package_id)
+        elif active_only:
+            filters.append(package.is_active == True)
+        if category:
+            filters.append(entity.category == category)
+        return self.backend.search(self.db, terms, filters, skip, limit)
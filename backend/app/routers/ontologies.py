@@ -1,18 +1,20 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Query, BackgroundTasks, Form, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Query, Path, Request, Response, BackgroundTasks, Form, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime, UTC
 
 from .. import schemas, models, utils
 from ..services.ontology_service import OntologyService
 from ..services.webhook_service import WebhookService
+from ..services.parsing_service import ParsingService
 from ..tasks import parse_ontology_task
 from ..core.errors import handle_result
 from ..database import SessionLocal
 
 router = APIRouter(prefix="/api/ontologies", tags=["Ontologies"])
 
-from ..dependencies import get_db, get_ontology_service, get_webhook_service
+from ..dependencies import get_db, get_ontology_service, get_webhook_service, get_parsing_service
 
 def _broadcast_activation(package, service, webhook_service, background_tasks):
     payload = {
@@ -139,12 +141,64 @@ async def reparse_ontology(
     service: OntologyService = Depends(get_ontology_service)
 ):
     template_id = req.template_id if req else None
+    profile = req.profile if req else None
     result = await service.reparse_ontology_package(package_id, template_id)
     final_template_id = handle_result(result)
     
-    background_tasks.add_task(parse_ontology_task, package_id, final_template_id, db=service.onto_repo.db)
+    background_tasks.add_task(parse_ontology_task, package_id, final_template_id, db=service.onto_repo.db, profile=profile)
     return {"message": "Parsing task triggered", "template_id": final_template_id}
 
+@router.post(
+    "/packages/bulk-reparse",
+    response_model=schemas.ReparseBatchResponse,
+    status_code=202,
+    summary="批量重新解析 (按模板 / 系列 / 版本集合)"
+)
+def bulk_reparse(
+    req: schemas.BulkReparseRequest,
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.bulk_reparse(req)
+    return handle_result(result)
+
+@router.get(
+    "/packages/bulk-reparse/{batch_id}",
+    response_model=schemas.ReparseBatchResponse,
+    summary="查询批量重新解析进度"
+)
+def get_bulk_reparse_progress(
+    batch_id: str,
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.get_reparse_batch(batch_id)
+    return handle_result(result)
+
+@router.post(
+    "/packages/{package_id}/dry-run",
+    response_model=schemas.TemplateDryRunResponse,
+    summary="模板试运行 (抽样解析，不写库)"
+)
+def dry_run_template(
+    package_id: str,
+    req: schemas.TemplateDryRunRequest,
+    service: ParsingService = Depends(get_parsing_service)
+):
+    result = service.dry_run(package_id, req)
+    return handle_result(result)
+
+@router.get(
+    "/packages/{package_id}/parse-report",
+    response_model=schemas.ParseReportResponse,
+    summary="获取最近一次解析的剖析报告"
+)
+def get_parse_report(
+    package_id: str,
+    top: int = Query(10, ge=1, le=1000, description="返回耗时最高的前 N 个文件"),
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.get_parse_report(package_id, top)
+    return handle_result(result)
+
 @router.get(
     "", 
     response_model=schemas.PaginatedOntologyResponse,
@@ -264,6 +318,38 @@ async def compare_ontologies(
     result = await service.compare_packages(base_id, target_id)
     return handle_result(result)
 
+@router.get(
+    "/compare/entities",
+    response_model=schemas.EntityDiffResponse,
+    summary="实体级语义差异 (新增/删除/元数据变化)"
+)
+def compare_ontology_entities(
+    base_id: str = Query(..., description="基准版本ID"),
+    target_id: str = Query(..., description="目标版本ID"),
+    status: Optional[str] = Query(None, pattern="^(added|deleted|modified)$", description="只返回指定状态的差异"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.diff_entities(base_id, target_id, status, skip, limit)
+    return handle_result(result)
+
+@router.get(
+    "/compare/relations",
+    response_model=schemas.RelationDiffResponse,
+    summary="关系级差异 (新增/删除)"
+)
+def compare_ontology_relations(
+    base_id: str = Query(..., description="基准版本ID"),
+    target_id: str = Query(..., description="目标版本ID"),
+    status: Optional[str] = Query(None, pattern="^(added|deleted)$", description="只返回指定状态的差异"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.diff_relations(base_id, target_id, status, skip, limit)
+    return handle_result(result)
+
 @router.get(
     "/{id}", 
     response_model=schemas.OntologyPackageDetailResponse,
@@ -295,28 +381,148 @@ def read_ontology_file(
 )
 def get_ontology_graph(
     id: str,
-    db: Session = Depends(get_db)
+    format: str = Query("json", pattern="^(json|ndjson)$", description="ndjson 时逐行流式输出节点与边"),
+    cursor: Optional[str] = Query(None, description="分页游标 (取自上一页的 next_cursor)"),
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="分页模式下每页的节点与边总数"),
+    service: OntologyService = Depends(get_ontology_service)
 ):
-    entities = db.query(models.OntologyEntity).filter(models.OntologyEntity.package_id == id).all()
-    relations = db.query(models.OntologyRelation).filter(models.OntologyRelation.package_id == id).all()
-    
-    return {
-        "nodes": entities,
-        "links": relations
-    }
+    if format == "ndjson":
+        return StreamingResponse(handle_result(service.stream_graph(id)), media_type="application/x-ndjson")
+    if cursor is not None or limit is not None:
+        return handle_result(service.get_graph_page(id, cursor, limit or 1000))
+    return service.get_graph(id)
+
+@router.get(
+    "/{id}/export/{name}",
+    summary="下载整包图谱导出文件 (NDJSON/N-Triples gzip 或 Parquet)",
+    response_class=FileResponse
+)
+def export_ontology_graph(
+    id: str,
+    request: Request,
+    name: str = Path(..., pattern="^(graph\\.ndjson\\.gz|graph\\.nt\\.gz|entities\\.parquet|relations\\.parquet)$",
+                     description="导出文件名，决定格式"),
+    service: OntologyService = Depends(get_ontology_service)
+):
+    export = handle_result(service.export_graph(id, name))
+    # 导出文件按代次不可变，ETag 相同即可直接返回 304；Range / If-Range 由 FileResponse 处理
+    headers = {"ETag": export["etag"], "Cache-Control": "no-cache"}
+    if_none_match = {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}
+    if export["etag"] in if_none_match or "*" in if_none_match:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(export["path"], media_type=export["media_type"], filename=export["filename"], headers=headers)
+
+@router.get(
+    "/{id}/stats",
+    response_model=schemas.GraphStatsResponse,
+    summary="获取图谱结构统计 (解析完成时预先计算)"
+)
+def get_ontology_stats(
+    id: str,
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.get_graph_stats(id)
+    return handle_result(result)
+
+@router.get(
+    "/{id}/neighborhood",
+    response_model=schemas.OntologySubgraphResponse,
+    summary="获取实体的 k 跳邻域子图"
+)
+def get_ontology_neighborhood(
+    id: str,
+    ids: List[str] = Query([], description="种子实体 ID，可重复"),
+    names: List[str] = Query([], description="种子实体名称 (精确匹配)，可重复"),
+    depth: int = Query(1, ge=1, le=6, description="扩展跳数"),
+    max_nodes: int = Query(200, ge=1, description="返回节点数上限 (另受服务端硬上限约束)"),
+    relation_types: List[str] = Query([], description="只沿这些关系类型扩展"),
+    categories: List[str] = Query([], description="只扩展到这些类别的实体"),
+    direction: str = Query("both", pattern="^(out|in|both)$", description="沿出边、入边或双向扩展"),
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.get_neighborhood(id, ids, names, depth, max_nodes, relation_types or None, categories or None, direction)
+    return handle_result(result)
+
+@router.get(
+    "/{id}/path",
+    response_model=schemas.OntologyPathResponse,
+    summary="查询两个实体之间的最短路径"
+)
+def get_ontology_path(
+    id: str,
+    source_ids: List[str] = Query([], description="起点实体 ID，可重复"),
+    source_names: List[str] = Query([], description="起点实体名称 (精确匹配)，可重复"),
+    target_ids: List[str] = Query([], description="终点实体 ID，可重复"),
+    target_names: List[str] = Query([], description="终点实体名称 (精确匹配)，可重复"),
+    max_depth: int = Query(6, ge=1, description="最大路径长度 (另受服务端硬上限约束)"),
+    max_visited: Optional[int] = Query(None, ge=1, description="访问节点数上限 (另受服务端硬上限约束)"),
+    relation_types: List[str] = Query([], description="只沿这些关系类型搜索"),
+    direction: str = Query("out", pattern="^(out|in|both)$", description="沿出边、入边或不区分方向"),
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.find_path(id, source_ids, source_names, target_ids, target_names,
+                               max_depth, max_visited, relation_types or None, direction)
+    return handle_result(result)
+
+@router.get(
+    "/{id}/reachable",
+    response_model=schemas.OntologyReachabilityResponse,
+    summary="查询实体的传递可达集合 (祖先/依赖方)"
+)
+def get_ontology_reachable(
+    id: str,
+    ids: List[str] = Query([], description="起点实体 ID，可重复"),
+    names: List[str] = Query([], description="起点实体名称 (精确匹配)，可重复"),
+    direction: str = Query("out", pattern="^(out|in|both)$", description="out 沿出边 (如父类链)，in 沿入边 (依赖方)"),
+    relation_types: List[str] = Query([], description="只沿这些关系类型扩展"),
+    max_depth: Optional[int] = Query(None, ge=1, description="最大跳数 (默认取服务端硬上限)"),
+    max_nodes: int = Query(1000, ge=1, description="返回节点数上限 (另受服务端硬上限约束)"),
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.get_reachable(id, ids, names, direction, relation_types or None, max_depth, max_nodes)
+    return handle_result(result)
 
 @router.get(
     "/{id}/entities", 
-    response_model=List[schemas.OntologyEntityResponse],
-    summary="分页获取本体实体列表"
+    response_model=schemas.PaginatedOntologyEntityResponse,
+    summary="过滤并游标分页获取本体实体列表"
 )
 def get_ontology_entities(
     id: str,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    category: Optional[str] = Query(None, description="按类别精确过滤"),
+    name_prefix: Optional[str] = Query(None, description="按名称前缀过滤 (区分大小写)"),
+    metadata: List[str] = Query([], description="元数据过滤，key=value 或仅 key (键存在)，可重复"),
+    cursor: Optional[str] = Query(None, description="分页游标 (取自上一页的 next_cursor)"),
+    limit: int = Query(100, ge=1, le=1000),
+    include_total: bool = Query(True, description="是否返回满足条件的总数"),
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.list_entities(id, category, name_prefix, metadata, cursor, limit, include_total)
+    return handle_result(result)
+
+@router.get(
+    "/{id}/attributes",
+    response_model=List[schemas.AttributeKeyCount],
+    summary="获取当前版本的实体属性键"
+)
+def get_ontology_attribute_keys(
+    id: str,
+    service: OntologyService = Depends(get_ontology_service)
+):
+    return handle_result(service.list_attribute_keys(id))
+
+@router.get(
+    "/{id}/attributes/values",
+    response_model=List[schemas.AttributeValueCount],
+    summary="获取指定属性键下的常见取值"
+)
+def get_ontology_attribute_values(
+    id: str,
+    key: str = Query(..., min_length=1, description="属性键"),
+    limit: int = Query(50, ge=1, le=1000),
+    service: OntologyService = Depends(get_ontology_service)
 ):
-    return db.query(models.OntologyEntity).filter(models.OntologyEntity.package_id == id).offset(skip).limit(limit).all()
+    return handle_result(service.list_attribute_values(id, key, limit))
 
 @router.get(
     "/{id}/relations", 
@@ -330,3 +536,17 @@ def get_ontology_relations(
     service: OntologyService = Depends(get_ontology_service)
 ):
     return service.list_relations(id, skip, limit)
+
+@router.get(
+    "/{id}/cross-relations",
+    response_model=schemas.PaginatedCrossSeriesRelationResponse,
+    summary="分页获取指向其他系列的跨系列关系"
+)
+def get_ontology_cross_relations(
+    id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    service: OntologyService = Depends(get_ontology_service)
+):
+    result = service.list_cross_relations(id, skip, limit)
+    return handle_result(result)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from .. import schemas
+from ..core.errors import handle_result
+from ..dependencies import get_search_service
+from ..services.search_service import SearchService
+
+router = APIRouter(
+    prefix="/api/search",
+    tags=["Search"],
+)
+
+@router.get(
+    "",
+    response_model=schemas.PaginatedSearchResponse,
+    summary="全文检索实体",
+    description="检索实体名称、类别、元数据取值与 Markdown 正文，按相关度排序。默认只检索各系列的启用版本。"
+)
+def search_entities(
+    q: str = Query(..., min_length=1, max_length=500, description="检索词，空白分隔的多个词需同时命中，每个词按子串匹配"),
+    series_code: Optional[str] = Query(None, description="限定系列"),
+    package_id: Optional[str] = Query(None, description="限定版本 (指定后不再限于启用版本)"),
+    category: Optional[str] = Query(None, description="限定实体类别"),
+    active_only: bool = Query(True, description="只检索启用版本"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    service: SearchService = Depends(get_search_service)
+):
+    result = service.search_entities(q, series_code, package_id, category, active_only, skip, limit)
+    return handle_result(result)
@@ -1,11 +1,12 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Dict
 from datetime import datetime
 
 class OntologyFileBase(BaseModel):
     file_path: str = Field(..., description="文件在包内的相对路径", examples=["src/core.owl"])
     file_size: int = Field(..., description="文件大小 (Bytes)", examples=[10240])
     content_preview: Optional[str] = Field(None, description="内容预览 (部分截断)")
+    parse_warnings: Optional[str] = Field(None, description="最近一次解析的告警列表 (JSON 数组)")
 
 class OntologyFileResponse(OntologyFileBase):
     id: str = Field(..., description="文件记录 UUID")
@@ -49,6 +50,7 @@ class OntologySeriesUpdate(BaseModel):
 
 class OntologyReparseRequest(BaseModel):
     template_id: Optional[str] = None
+    profile: Optional[bool] = Field(None, description="是否记录解析剖析报告 (默认沿用服务端配置)")
 
 class OntologyPackageDetailResponse(OntologyPackageResponse):
     files: List[OntologyFileResponse] = []
@@ -113,6 +115,38 @@ class OntologyComparisonResponse(BaseModel):
     target_version: int
     files: List[FileDiff]
 
+class EntityDiffItem(BaseModel):
+    status: str = Field(..., description="added / deleted / modified")
+    category: Optional[str] = None
+    name: str
+    base_entity_id: Optional[str] = None
+    target_entity_id: Optional[str] = None
+    base_metadata: Optional[Dict[str, Any]] = None
+    target_metadata: Optional[Dict[str, Any]] = None
+    changed_keys: List[str] = Field([], description="取值不同的顶层元数据字段")
+
+class RelationDiffItem(BaseModel):
+    status: str = Field(..., description="added / deleted")
+    source_category: Optional[str] = None
+    source_name: str
+    relation_type: str
+    target_category: Optional[str] = None
+    target_name: str
+
+class EntityDiffResponse(BaseModel):
+    base_version: int
+    target_version: int
+    counts: Dict[str, int] = Field(..., description="各状态的差异数量")
+    total: int = Field(..., description="符合筛选条件的差异数量")
+    items: List[EntityDiffItem]
+
+class RelationDiffResponse(BaseModel):
+    base_version: int
+    target_version: int
+    counts: Dict[str, int] = Field(..., description="各状态的差异数量")
+    total: int = Field(..., description="符合筛选条件的差异数量")
+    items: List[RelationDiffItem]
+
 class ParsingTemplateBase(BaseModel):
     name: str = Field(..., description="模板名称", examples=["标准 Markdown 语义模板"])
     description: Optional[str] = Field(None, description="模板详细描述")
@@ -137,26 +171,220 @@ class OntologyEntityResponse(BaseModel):
     category: Optional[str] = None
     metadata_json: Optional[str] = None
     file_path: Optional[str] = None
+    stable_id: Optional[str] = Field(None, description="跨版本与重解析不变的稳定标识")
     
     model_config = ConfigDict(from_attributes=True)
 
+class SearchHit(OntologyEntityResponse):
+    series_code: str
+    version: int
+    score: Optional[float] = Field(None, description="相关度 (bm25 取负，越大越相关)；LIKE 回退时为空")
+    snippet: Optional[str] = Field(None, description="命中片段，匹配词以 <mark> 标注")
+
+class PaginatedSearchResponse(BaseModel):
+    items: List[SearchHit]
+    total: int
+    backend: str = Field(..., description="实际使用的检索后端：fts5 / like")
+
 class OntologyRelationResponse(BaseModel):
     id: str
     source_id: str
     target_id: str
     relation_type: str
+    stable_id: Optional[str] = Field(None, description="跨版本与重解析不变的稳定标识")
     
     model_config = ConfigDict(from_attributes=True)
 
 class OntologyGraphResponse(BaseModel):
     nodes: List[OntologyEntityResponse]
     links: List[OntologyRelationResponse]
+    next_cursor: Optional[str] = Field(None, description="分页模式下的下一页游标，为空表示已取完")
+
+class SubgraphNode(OntologyEntityResponse):
+    depth: int = Field(..., description="距最近种子实体的跳数")
+
+class OntologySubgraphResponse(BaseModel):
+    seeds: List[str] = Field(..., description="解析到的种子实体 ID")
+    nodes: List[SubgraphNode]
+    links: List[OntologyRelationResponse]
+    truncated: bool = Field(False, description="是否因节点上限截断 (按跳数由近及远保留)")
+
+class OntologyPathResponse(BaseModel):
+    found: bool
+    length: Optional[int] = Field(None, description="路径边数，未找到时为空")
+    nodes: List[OntologyEntityResponse] = Field(..., description="按路径顺序排列的实体")
+    links: List[OntologyRelationResponse] = Field(..., description="路径上相邻实体之间的边")
+    visited: int = Field(..., description="搜索过程中访问的节点数")
+    truncated: bool = Field(False, description="是否因访问节点上限提前终止 (此时未找到不代表不可达)")
+
+class OntologyReachabilityResponse(BaseModel):
+    seeds: List[str] = Field(..., description="解析到的起点实体 ID")
+    nodes: List[SubgraphNode] = Field(..., description="可达实体 (不含起点)，按跳数由近及远")
+    truncated: bool = Field(False, description="是否因节点上限截断")
 
 class OntologyRelationDetailResponse(OntologyRelationResponse):
     source: OntologyEntityResponse
     target: OntologyEntityResponse
 
+class PaginatedOntologyEntityResponse(BaseModel):
+    items: List[OntologyEntityResponse]
+    total: Optional[int] = Field(None, description="满足过滤条件的实体总数；include_total=false 时为空")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，为空表示已取完")
+
+class AttributeKeyCount(BaseModel):
+    key: str
+    entity_count: int
+
+class AttributeValueCount(BaseModel):
+    value: str
+    entity_count: int
+
 class PaginatedOntologyRelationResponse(BaseModel):
     items: List[OntologyRelationDetailResponse]
     total: int
 
+class CrossSeriesRelationResponse(BaseModel):
+    id: str
+    source_id: str
+    source_name: str
+    relation_type: str
+    target_series_code: str
+    target_name: str = Field(..., description="链接中书写的目标名称")
+    target_package_id: Optional[str] = Field(None, description="解析时目标系列的启用版本")
+    target_entity_id: Optional[str] = None
+    target_entity_name: Optional[str] = None
+    resolved: bool
+
+class PaginatedCrossSeriesRelationResponse(BaseModel):
+    items: List[CrossSeriesRelationResponse]
+    total: int
+
+class ParseFileProfile(BaseModel):
+    file_path: str
+    parser: str
+    total_ms: float
+    read_ms: float
+    parse_ms: float
+    rule_ms: Dict[str, float] = {}
+    entity_count: int
+    errors: List[str] = []
+
+class ParseReportResponse(BaseModel):
+    package_id: str
+    generation: int
+    created_at: datetime
+    total_ms: float
+    file_count: int
+    entity_count: int
+    relation_count: int
+    rule_totals_ms: Dict[str, float] = {}
+    slowest_files: List[ParseFileProfile]
+
+class CategoryCount(BaseModel):
+    category: Optional[str] = None
+    count: int
+
+class RelationTypeCount(BaseModel):
+    relation_type: str
+    count: int
+
+class DegreeBucket(BaseModel):
+    min: int = Field(..., description="桶内最小度数 (含)")
+    max: int = Field(..., description="桶内最大度数 (含)")
+    count: int
+
+class DegreeHistogram(BaseModel):
+    incoming: List[DegreeBucket] = Field(..., description="入度分布")
+    outgoing: List[DegreeBucket] = Field(..., description="出度分布")
+    total: List[DegreeBucket] = Field(..., description="总度数分布")
+
+class GraphStatsEntity(BaseModel):
+    id: str
+    name: str
+    category: Optional[str] = None
+
+class GraphHub(GraphStatsEntity):
+    in_degree: int
+    out_degree: int
+    degree: int
+
+class GraphStatsResponse(BaseModel):
+    package_id: str
+    generation: int
+    created_at: datetime
+    node_count: int
+    edge_count: int
+    categories: List[CategoryCount]
+    relation_types: List[RelationTypeCount]
+    degree_histogram: DegreeHistogram
+    hubs: List[GraphHub] = Field(..., description="总度数最高的实体")
+    component_count: int = Field(..., description="弱连通分量数 (孤立实体各自成一个分量)")
+    largest_components: List[int] = Field(..., description="最大的若干连通分量的实体数")
+    orphan_count: int
+    orphans: List[GraphStatsEntity] = Field(..., description="孤立实体样本 (按名称排序)")
+
+# 一次试运行最多解析的文件数 (抽样与显式指定共用)
+DRY_RUN_MAX_FILES = 200
+
+class TemplateDryRunRequest(BaseModel):
+    rules: Optional[str] = Field(None, description="候选解析规则 (JSON 字符串)，缺省时使用 template_id 或包当前模板")
+    template_id: Optional[str] = Field(None, description="使用已保存的模板规则")
+    file_paths: Optional[List[str]] = Field(None, max_length=DRY_RUN_MAX_FILES, description="指定参与试运行的文件；缺省时随机抽样")
+    sample_size: int = Field(20, ge=1, le=DRY_RUN_MAX_FILES, description="抽样文件数")
+    seed: Optional[int] = Field(None, description="抽样随机种子，便于复现")
+    max_entities_per_file: int = Field(50, ge=1, le=1000, description="每个文件最多返回的实体数")
+
+class DryRunLink(BaseModel):
+    target: str
+    type: str
+
+class DryRunEntity(BaseModel):
+    name: str
+    category: Optional[str] = None
+    metadata: Dict[str, Any] = {}
+    links: List[DryRunLink] = []
+
+class DryRunFileResult(BaseModel):
+    file_path: str
+    parser: Optional[str] = None
+    total_ms: float = 0
+    read_ms: float = 0
+    parse_ms: float = 0
+    rule_ms: Dict[str, float] = {}
+    entity_count: int = 0
+    entities: List[DryRunEntity] = []
+    warnings: List[str] = []
+    error: Optional[str] = None
+
+class TemplateDryRunResponse(BaseModel):
+    total_files: int
+    sampled_files: int
+    elapsed_ms: float
+    files: List[DryRunFileResult]
+
+class BulkReparseRequest(BaseModel):
+    template_id: Optional[str] = Field(None, description="重解析使用该模板 (含沿用系列默认模板) 的所有版本")
+    series_code: Optional[str] = Field(None, description="限定本体系列")
+    package_ids: Optional[List[str]] = Field(None, description="限定版本集合")
+    active_only: bool = Field(False, description="仅重解析启用中的版本")
+
+class ReparseJobStatus(BaseModel):
+    package_id: str
+    template_id: str
+    priority: int
+    status: str
+    error: Optional[str] = None
+
+class ReparseBatchResponse(BaseModel):
+    batch_id: str
+    created_at: datetime
+    total: int
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+    finished: int
+    done: bool
+    deduplicated: int = Field(0, description="复用已排队任务的数量")
+    skipped: List[str] = Field([], description="无可用模板而跳过的版本")
+    jobs: List[ReparseJobStatus]
@@ -0,0 +1,153 @@
+import json
+import logging
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from ..models import CrossSeriesLink, OntologyEntity, OntologyPackage, OntologySeries
+from .name_index import NameIndex, metadata_aliases
+
+logger = logging.getLogger(__name__)
+
+# 跨系列链接的分隔符：[[core:Customer]] -> 系列 core 中的 Customer
+SERIES_SEPARATOR = ":"
+
+
+def split_reference(target: str, series_codes: Set[str]) -> Optional[Tuple[str, str]]:
+    """
+    拆分跨系列引用，前缀必须是已存在的系列编码，否则返回 None
+    (避免把 "http://..."、"ISO:9001" 之类的普通名称误判为跨系列引用)。
+    """
+    code, sep, name = target.partition(SERIES_SEPARATOR)
+    code, name = code.strip(), name.strip()
+    if not sep or not name or code not in series_codes:
+        return None
+    return code, name
+
+
+class CrossSeriesResolver:
+    """
+    跨系列名称解析器
+
+    进程内缓存每个系列启用版本的名称索引 (键为启用版本ID与其当前代次)，
+    多个包解析时共享，只在目标系列切换启用版本或重新解析后才重建。
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, Tuple[str, int, NameIndex]] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, code: Optional[str] = None):
+        with self._lock:
+            if code is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(code, None)
+
+    def series_codes(self, db: Session) -> Set[str]:
+        return {code for (code,) in db.query(OntologySeries.code).all()}
+
+    def resolve(self, db: Session, code: str, name: str) -> Tuple[Optional[str], Optional[str]]:
+        """解析到 (启用版本ID, 实体ID)；系列无启用版本时两者皆为 None"""
+        active = self._index_for(db, code)
+        if active is None:
+            return None, None
+        package_id, index = active
+        return package_id, index.resolve(name)
+
+    def _index_for(self, db: Session, code: str) -> Optional[Tuple[str, NameIndex]]:
+        active = (
+            db.query(OntologyPackage.id, OntologyPackage.current_generation)
+            .filter(OntologyPackage.series_code == code, OntologyPackage.is_active == True)
+            .first()
+        )
+        if active is None:
+            return None
+        package_id, generation = active[0], active[1] or 0
+
+        cached = self._indexes.get(code)
+        if cached is not None and cached[0] == package_id and cached[1] == generation:
+            return package_id, cached[2]
+
+        index = NameIndex()
+        rows = (
+            db.query(OntologyEntity.id, OntologyEntity.name, OntologyEntity.file_path, OntologyEntity.metadata_json)
+            .filter(OntologyEntity.package_id == package_id, OntologyEntity.generation == generation)
+            .order_by(OntologyEntity.file_path)
+        )
+        for entity_id, name, file_path, metadata_json in rows:
+            try:
+                metadata = json.loads(metadata_json) if metadata_json else {}
+            except json.JSONDecodeError:
+                metadata = {}
+            index.add(name, entity_id, file_path or "", metadata_aliases(metadata) if isinstance(metadata, dict) else ())
+        with self._lock:
+            self._indexes[code] = (package_id, generation, index)
+        logger.info(f"Built cross-series name index for {code} (package {package_id}, {len(index)} entities)")
+        return package_id, index
+
+    def recompute_for_target(self, db: Session, code: str) -> int:
+        """
+        增量重算：只重新解析指向 code 系列、且属于源包当前代次的跨系列关系，
+        返回目标发生变化的关系数。
+        """
+        self.invalidate(code)
+        rows = (
+            db.query(CrossSeriesLink.id, CrossSeriesLink.target_name,
+                     CrossSeriesLink.target_package_id, CrossSeriesLink.target_entity_id)
+            .join(OntologyPackage, OntologyPackage.id == CrossSeriesLink.package_id)
+            .filter(
+                CrossSeriesLink.target_series_code == code,
+                CrossSeriesLink.generation == OntologyPackage.current_generation
+            )
+            .all()
+        )
+        changes = []
+        for link_id, target_name, old_package_id, old_entity_id in rows:
+            package_id, entity_id = self.resolve(db, code, target_name)
+            if (package_id, entity_id) != (old_package_id, old_entity_id):
+                changes.append({"_id": link_id, "target_package_id": package_id, "target_entity_id": entity_id})
+        if changes:
+            table = CrossSeriesLink.__table__
+            db.execute(update(table).where(table.c.id == bindparam("_id")), changes)
+        db.commit()
+        logger.info(f"Recomputed {len(rows)} cross-series links targeting {code}, {len(changes)} changed")
+        return len(changes)
+
+
+cross_series_resolver = CrossSeriesResolver()
+
+_handlers_registered = False
+
+
+def _recompute(code: str):
+    from ..database import SessionLocal
+    db = SessionLocal()
+    try:
+        cross_series_resolver.recompute_for_target(db, code)
+    finally:
+        db.close()
+
+
+def _on_activated(payload: dict):
+    """目标系列切换启用版本后，重算指向它的跨系列关系"""
+    _recompute(payload["code"])
+
+
+def _on_parsed(payload: dict):
+    """启用版本重新解析后同样需要重算；非启用版本的解析不影响其他系列"""
+    if payload.get("is_active"):
+        _recompute(payload["code"])
+
+
+def register_cross_series_handlers():
+    """在事件分发器上登记增量重算回调 (重复调用无副作用)"""
+    global _handlers_registered
+    if _handlers_registered:
+        return
+    from ..core.events import dispatcher
+    dispatcher.subscribe("ontology.activated", _on_activated)
+    dispatcher.subscribe("ontology.parsed", _on_parsed)
+    _handlers_registered = True
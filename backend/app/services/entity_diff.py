@@ -0,0 +1,38 @@
+import sys
+from typing import List, Optional
+
+from ..core.lru import LRUCache
+
+
+def estimate_rows_bytes(rows: List[tuple]) -> int:
+    """差异行列表的估算内存：列表、行元组与其中的字符串，按独占估算以保守控制内存"""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row if value is not None)
+    return size
+
+
+class EntityDiffCache(LRUCache):
+    """
+    版本对差异结果的进程内 LRU 缓存
+
+    键包含双方的当前解析代次：任一版本重新解析后代次变化，旧结果自然失效，无需显式清理。
+    缓存的是完整的差异行 (只含标识与键列)，分页与元数据补全在命中后进行。
+    按估算字节数淘汰，总量不超过 ENTITY_DIFF_CACHE_MAX_BYTES；单个结果超出预算时不缓存。
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        super().__init__(max_bytes, weigh=estimate_rows_bytes)
+
+    @property
+    def capacity(self) -> int:
+        if self._capacity is None:
+            from ..config import settings
+            return max(0, settings.ENTITY_DIFF_CACHE_MAX_BYTES)
+        return self._capacity
+
+    max_bytes = capacity
+    total_bytes = LRUCache.total_weight
+
+
+entity_diff_cache = EntityDiffCache()
@@ -0,0 +1,80 @@
+import base64
+import json
+from typing import Any, Iterator, List, Optional, Tuple
+
+from ..core.lru import LRUCache
+
+
+class EntityCountCache(LRUCache):
+    """
+    实体列表过滤计数的进程内 LRU 缓存
+
+    键包含包的当前解析代次：同一代次的实体写入后不再变化，计数可长期复用；
+    重新解析后代次变化，旧计数自然失效，无需显式清理。
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        super().__init__(max_size)
+
+    @property
+    def capacity(self) -> int:
+        if self._capacity is None:
+            from ..config import settings
+            return max(0, settings.ENTITY_COUNT_CACHE_SIZE)
+        return self._capacity
+
+    max_size = capacity
+
+
+def encode_entity_cursor(generation: int, name: str, entity_id: str) -> str:
+    """游标记录所属代次与上一页最后一行的排序键 (名称, ID)"""
+    return base64.urlsafe_b64encode(json.dumps([generation, name, entity_id]).encode()).decode("ascii")
+
+
+def decode_entity_cursor(cursor: str) -> Tuple[int, str, str]:
+    """解码实体列表游标，格式不合法时抛出 ValueError"""
+    try:
+        generation, name, entity_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception as e:
+        raise ValueError("Invalid entity cursor") from e
+    if not isinstance(generation, int) or not isinstance(name, str) or not isinstance(entity_id, str):
+        raise ValueError("Invalid entity cursor")
+    return generation, name, entity_id
+
+
+def attribute_value_text(value: Any) -> str:
+    """属性取值的字符串形式：字符串原样保留，其余按 JSON 书写 (true / null / 1.5 ...)"""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def metadata_attributes(metadata: dict, max_chars: int) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    把元数据展开为 (键, 取值) 属性行：只取顶层键，列表取值每个元素一行。
+    超过 max_chars 的取值与空列表只产出取值为 None 的一行，用于“键存在”过滤。
+    """
+    for key, value in metadata.items():
+        values = value if isinstance(value, list) else [value]
+        if not values:
+            yield str(key), None
+        for item in dict.fromkeys(attribute_value_text(v) for v in values):
+            yield str(key), item if len(item) <= max_chars else None
+
+
+def parse_metadata_filters(values: List[str]) -> List[Tuple[str, Optional[str]]]:
+    """
+    解析元数据过滤条件：`key=value` 要求取值相等 (与属性取值的字符串形式比较，列表取值任一元素相等即可)，
+    仅 `key` 表示键存在即可。键为空时抛出 ValueError。
+    """
+    filters = []
+    for value in values:
+        key, sep, expected = value.partition("=")
+        key = key.strip()
+        if not key:
+            raise ValueError(f"Invalid metadata filter '{value}'; expected key or key=value")
+        filters.append((key, expected if sep else None))
+    return filters
+
+
+entity_count_cache = EntityCountCache()
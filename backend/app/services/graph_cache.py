@@ -0,0 +1,336 @@
+import sys
+import logging
+from itertools import chain
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.lru import LRUCache
+from ..models import OntologyEntity, OntologyPackage, OntologyRelation
+
+logger = logging.getLogger(__name__)
+
+
+def _csr(node_count: int, heads: array, tails: array, types: array) -> Tuple[array, array, array]:
+    """按 heads 分桶的压缩稀疏行：offsets[i]..offsets[i+1] 为节点 i 的邻居区间"""
+    offsets = array("i", bytes(4 * (node_count + 1)))
+    for head in heads:
+        offsets[head + 1] += 1
+    for i in range(node_count):
+        offsets[i + 1] += offsets[i]
+    cursor = array("i", offsets[:-1])
+    neighbors = array("i", bytes(4 * len(heads)))
+    neighbor_types = array("H", bytes(2 * len(heads)))
+    for head, tail, relation_type in zip(heads, tails, types):
+        pos = cursor[head]
+        neighbors[pos] = tail
+        neighbor_types[pos] = relation_type
+        cursor[head] = pos + 1
+    return offsets, neighbors, neighbor_types
+
+
+class PackageGraph:
+    """
+    单个本体包 (某一代次) 的紧凑邻接结构
+
+    节点以 0..n-1 的整数编号，出边与入边各存一份 CSR (``array`` 连续存储)，
+    名称经 ``sys.intern`` 驻留，类别与关系类型以小整数编码。
+    """
+
+    def __init__(self, package_id: str, series_code: str, generation: int,
+                 entity_rows: Iterable[Sequence], relation_rows: Iterable[Sequence]):
+        self.package_id = package_id
+        self.series_code = series_code
+        self.generation = generation
+
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.category_names: List[Optional[str]] = []
+        self.relation_types: List[str] = []
+        category_codes: Dict[Optional[str], int] = {}
+        type_codes: Dict[str, int] = {}
+        self.categories = array("H")
+
+        for entity_id, name, category in entity_rows:
+            self.index[entity_id] = len(self.ids)
+            self.ids.append(entity_id)
+            self.names.append(sys.intern(name))
+            code = category_codes.get(category)
+            if code is None:
+                code = category_codes[category] = len(self.category_names)
+                self.category_names.append(category)
+            self.categories.append(code)
+
+        heads, tails, types = array("i"), array("i"), array("H")
+        for source_id, target_id, relation_type in relation_rows:
+            source, target = self.index.get(source_id), self.index.get(target_id)
+            if source is None or target is None:
+                continue
+            code = type_codes.get(relation_type)
+            if code is None:
+                code = type_codes[relation_type] = len(self.relation_types)
+                self.relation_types.append(relation_type)
+            heads.append(source)
+            tails.append(target)
+            types.append(code)
+
+        node_count = len(self.ids)
+        self.edge_count = len(heads)
+        self.out_offsets, self.out_targets, self.out_types = _csr(node_count, heads, tails, types)
+        self.in_offsets, self.in_sources, self.in_types = _csr(node_count, tails, heads, types)
+        self._category_codes = category_codes
+        self._type_codes = type_codes
+        self.nbytes = self._estimate_size()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _estimate_size(self) -> int:
+        arrays = (self.categories, self.out_offsets, self.out_targets, self.out_types,
+                  self.in_offsets, self.in_sources, self.in_types)
+        size = sum(a.itemsize * len(a) for a in arrays)
+        size += sys.getsizeof(self.ids) + sys.getsizeof(self.names) + sys.getsizeof(self.index)
+        size += sum(sys.getsizeof(entity_id) for entity_id in self.ids)
+        # 驻留的名称可能与其他结构共享，仍按独占估算以保守控制内存
+        size += sum(sys.getsizeof(name) for name in self.names)
+        return size
+
+    def type_codes(self, relation_types: Optional[Iterable[str]]) -> Optional[Set[int]]:
+        """关系类型名 -> 编码集合；None 表示不过滤"""
+        if not relation_types:
+            return None
+        return {self._type_codes[t] for t in relation_types if t in self._type_codes}
+
+    def category_codes(self, categories: Optional[Iterable[str]]) -> Optional[Set[int]]:
+        if not categories:
+            return None
+        return {self._category_codes[c] for c in categories if c in self._category_codes}
+
+    def neighbors(self, node: int, direction: str = "both", type_codes: Optional[Set[int]] = None) -> Iterable[int]:
+        if direction in ("out", "both"):
+            for pos in range(self.out_offsets[node], self.out_offsets[node + 1]):
+                if type_codes is None or self.out_types[pos] in type_codes:
+                    yield self.out_targets[pos]
+        if direction in ("in", "both"):
+            for pos in range(self.in_offsets[node], self.in_offsets[node + 1]):
+                if type_codes is None or self.in_types[pos] in type_codes:
+                    yield self.in_sources[pos]
+
+    def degree(self, node: int) -> Tuple[int, int]:
+        """(入度, 出度)"""
+        return (self.in_offsets[node + 1] - self.in_offsets[node],
+                self.out_offsets[node + 1] - self.out_offsets[node])
+
+    def neighborhood(self, seeds: Iterable[int], depth: int, max_nodes: int,
+                     relation_types: Optional[Iterable[str]] = None, categories: Optional[Iterable[str]] = None,
+                     direction: str = "both") -> Tuple[Dict[int, int], bool]:
+        """
+        逐层 BFS，语义与数据库逐层遍历一致：节点按跳数由近及远保留 max_nodes 个 (截断层在内存中按实体 ID 排序取舍)，
+        categories 只限制可到达的节点 (种子不受限)。返回 ({节点: 跳数}, 是否截断)。
+        """
+        type_codes = self.type_codes(relation_types)
+        allowed = self.category_codes(categories)
+        depths: Dict[int, int] = {}
+        frontier = sorted(set(seeds), key=self.ids.__getitem__)
+        hops = 0
+        while frontier:
+            if len(depths) + len(frontier) > max_nodes:
+                for node in frontier[:max_nodes - len(depths)]:
+                    depths[node] = hops
+                return depths, True
+            for node in frontier:
+                depths[node] = hops
+            if hops == depth:
+                break
+            reached = set()
+            for node in frontier:
+                for neighbor in self.neighbors(node, direction, type_codes):
+                    if neighbor not in depths and (allowed is None or self.categories[neighbor] in allowed):
+                        reached.add(neighbor)
+            frontier = sorted(reached, key=self.ids.__getitem__)
+            hops += 1
+        return depths, False
+
+    def shortest_path(self, sources: Iterable[int], targets: Iterable[int], max_depth: int, max_visited: int,
+                      relation_types: Optional[Iterable[str]] = None,
+                      direction: str = "out") -> Tuple[Optional[List[int]], int, bool]:
+        """
+        双向 BFS 最短路径：每轮扩展较小的一侧前沿，整层扩展完后取相遇点中总长度最短者。
+        direction 为 out 时沿出边从源走向目标 (反向一侧沿入边)，in 反之，both 不区分方向。
+        返回 (路径节点序列或 None, 访问节点数, 是否因 max_visited 截断)。
+        """
+        type_codes = self.type_codes(relation_types)
+        backward = {"out": "in", "in": "out"}.get(direction, "both")
+        # 节点 -> (前驱, 距本侧起点的跳数)
+        forward_seen: Dict[int, Tuple[Optional[int], int]] = {node: (None, 0) for node in sources}
+        backward_seen: Dict[int, Tuple[Optional[int], int]] = {node: (None, 0) for node in targets}
+        common = forward_seen.keys() & backward_seen.keys()
+        if common:
+            return [min(common, key=self.ids.__getitem__)], len(forward_seen) + len(backward_seen), False
+
+        forward_frontier, backward_frontier = list(forward_seen), list(backward_seen)
+        forward_hops = backward_hops = 0
+        visited = len(forward_seen) + len(backward_seen)
+        while forward_frontier and backward_frontier and forward_hops + backward_hops < max_depth:
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, seen, other, step, hops = forward_frontier, forward_seen, backward_seen, direction, forward_hops
+            else:
+                frontier, seen, other, step, hops = backward_frontier, backward_seen, forward_seen, backward, backward_hops
+
+            next_frontier: List[int] = []
+            best: Optional[Tuple[int, str, int]] = None
+            capped = False
+            for node in frontier:
+                for neighbor in self.neighbors(node, step, type_codes):
+                    if neighbor in seen:
+                        continue
+                    seen[neighbor] = (node, hops + 1)
+                    visited += 1
+                    if neighbor in other:
+                        candidate = (hops + 1 + other[neighbor][1], self.ids[neighbor], neighbor)
+                        best = candidate if best is None or candidate < best else best
+                    elif visited >= max_visited:
+                        if best is None:
+                            return None, visited, True
+                        # 本层已找到相遇点：停止扩展，返回已找到的路径
+                        capped = True
+                        break
+                    next_frontier.append(neighbor)
+                if capped:
+                    break
+
+            if expand_forward:
+                forward_frontier, forward_hops = next_frontier, forward_hops + 1
+            else:
+                backward_frontier, backward_hops = next_frontier, backward_hops + 1
+            if best is not None:
+                meet = best[2]
+                head, node = [], meet
+                while node is not None:
+                    head.append(node)
+                    node = forward_seen[node][0]
+                tail, node = [], backward_seen[meet][0]
+                while node is not None:
+                    tail.append(node)
+                    node = backward_seen[node][0]
+                return head[::-1] + tail, visited, False
+        return None, visited, False
+
+
+class GraphCache:
+    """
+    进程级启用版本邻接缓存
+
+    - 首次访问时从数据库加载，只缓存启用中的版本；
+    - 每次读取都核对包的当前代次与启用状态，重解析或切换启用版本后旧结构不会再被使用，
+      事件回调只是提前释放内存；
+    - 按估算字节数做 LRU 淘汰，总量不超过 GRAPH_CACHE_MAX_BYTES。
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self._max_bytes = max_bytes
+        self._graphs = LRUCache(capacity=lambda: self.max_bytes, weigh=lambda graph: graph.nbytes)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is None:
+            from ..config import settings
+            return max(0, settings.GRAPH_CACHE_MAX_BYTES)
+        return self._max_bytes
+
+    @property
+    def total_bytes(self) -> int:
+        return self._graphs.total_weight
+
+    def get(self, db: Session, package_id: str) -> Optional[PackageGraph]:
+        """返回启用版本当前代次的邻接结构；包不存在、未启用或缓存被禁用时返回 None (调用方回退到 SQL)"""
+        return self._lookup(db, package_id, load_uncached=False)
+
+    def get_or_load(self, db: Session, package_id: str) -> Optional[PackageGraph]:
+        """同 get，但未启用版本 (或缓存被禁用时) 按当前代次临时加载且不入缓存；包不存在时返回 None"""
+        return self._lookup(db, package_id, load_uncached=True)
+
+    def _lookup(self, db: Session, package_id: str, load_uncached: bool) -> Optional[PackageGraph]:
+        if not load_uncached and self.max_bytes <= 0:
+            return None
+        state = (
+            db.query(OntologyPackage.series_code, OntologyPackage.current_generation, OntologyPackage.is_active)
+            .filter(OntologyPackage.id == package_id)
+            .first()
+        )
+        if state is None:
+            return None
+        series_code, generation = state[0], state[1] or 0
+        if not state[2] or self.max_bytes <= 0:
+            return self.load(db, package_id, series_code, generation) if load_uncached else None
+
+        graph = self._graphs.get(package_id)
+        if graph is not None and graph.generation == generation:
+            self.hits += 1
+            return graph
+        self.misses += 1
+
+        # 旧代次的结构在此被新结构替换
+        graph = self.load(db, package_id, series_code, generation)
+        self._graphs.put(package_id, graph)
+        return graph
+
+    def invalidate(self, package_id: Optional[str] = None):
+        if package_id is None:
+            self._graphs.clear()
+        else:
+            self._graphs.pop(package_id)
+
+    def invalidate_series(self, series_code: str):
+        self._graphs.discard_where(lambda graph: graph.series_code == series_code)
+
+    @staticmethod
+    def load(db: Session, package_id: str, series_code: str, generation: int) -> PackageGraph:
+        """从数据库加载指定代次的邻接结构 (不经过缓存)"""
+        # Core 查询按块读取列元组，省去 ORM 逐行构造结果对象的开销
+        connection = db.connection()
+        entities = connection.execute(
+            select(OntologyEntity.id, OntologyEntity.name, OntologyEntity.category)
+            .where(OntologyEntity.package_id == package_id, OntologyEntity.generation == generation)
+            .execution_options(yield_per=10_000)
+        ).partitions()
+        relations = connection.execute(
+            select(OntologyRelation.source_id, OntologyRelation.target_id, OntologyRelation.relation_type)
+            .where(OntologyRelation.package_id == package_id, OntologyRelation.generation == generation)
+            .execution_options(yield_per=10_000)
+        ).partitions()
+        graph = PackageGraph(package_id, series_code, generation, chain.from_iterable(entities), chain.from_iterable(relations))
+        logger.info(f"Loaded adjacency cache for package {package_id}: {len(graph)} nodes, "
+                    f"{graph.edge_count} edges, ~{graph.nbytes / 1024 / 1024:.1f}MB")
+        return graph
+
+
+graph_cache = GraphCache()
+
+_handlers_registered = False
+
+
+def _on_activated(payload: dict):
+    """切换启用版本后，同系列其他版本不再是启用版本，提前释放其邻接结构"""
+    graph_cache.invalidate_series(payload["code"])
+
+
+def _on_parsed(payload: dict):
+    graph_cache.invalidate(payload["package_id"])
+
+
+def register_graph_cache_handlers():
+    """在事件分发器上登记缓存失效回调 (重复调用无副作用)"""
+    global _handlers_registered
+    if _handlers_registered:
+        return
+    from ..core.events import dispatcher
+    dispatcher.subscribe("ontology.activated", _on_activated)
+    dispatcher.subscribe("ontology.parsed", _on_parsed)
+    _handlers_registered = True
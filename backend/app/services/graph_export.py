@@ -0,0 +1,224 @@
+"""
+整包图谱导出
+
+把包某个代次的实体与关系写成适合下游批量摄取的文件，生成一次后缓存在存储目录下
+(``exports/{package_id}/g{代次}.v{格式版本}.{文件名}``)。同一代次的数据不再变化，
+导出文件即不可变：按文件名即可生成强 ETag，重新解析后代次变化、旧文件在下次导出时回收。
+
+- ``graph.ndjson.gz``: 与 ``/graph?format=ndjson`` 相同的行格式 (meta / node / link)，gzip 压缩
+- ``graph.nt.gz``: N-Triples，实体以稳定标识 ``urn:uuid:{stable_id}`` 为主语，gzip 压缩
+- ``entities.parquet`` / ``relations.parquet``: 列式 Parquet (zstd)，需要可选依赖 pyarrow
+"""
+import os
+import gzip
+import json
+import uuid
+import logging
+import threading
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import quote
+
+from ..core.errors import BusinessCode
+from ..repositories.ontology_repo import OntologyRepository
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - 可选依赖
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+# 导出内容的格式版本；写出逻辑变化时递增，使旧缓存文件与 ETag 一并失效
+EXPORT_VERSION = 1
+
+# 可导出的文件名及其媒体类型
+EXPORT_NAMES: Dict[str, str] = {
+    "graph.ndjson.gz": "application/gzip",
+    "graph.nt.gz": "application/gzip",
+    "entities.parquet": "application/vnd.apache.parquet",
+    "relations.parquet": "application/vnd.apache.parquet",
+}
+
+RDFS_LABEL = "<http://www.w3.org/2000/01/rdf-schema#label>"
+CATEGORY_PREDICATE = "<urn:ontohub:category>"
+RELATION_PREFIX = "urn:ontohub:relation:"
+
+ENTITY_COLUMNS = ("id", "stable_id", "name", "category", "file_path", "metadata_json")
+RELATION_COLUMNS = ("id", "stable_id", "source_id", "target_id", "relation_type")
+
+
+class GraphExportUnavailable(Exception):
+    """导出格式依赖的可选库未安装"""
+
+
+def graph_ndjson_chunks(repo: OntologyRepository, package_id: str, batch_size: int,
+                        generation: Optional[int] = None) -> Iterator[str]:
+    """
+    把包指定代次 (默认当前代次) 的图谱编码为 NDJSON，每批行拼成一个块产出。
+    每批按主键键集分页单独查询，产出之间不持有游标；每批读取后核对包的当前代次，
+    期间包被重新解析 (旧代次随后被回收) 时输出一行 type=error 并结束，避免节点与边来自不同代次或缺失。
+    """
+    batch_size = max(1, batch_size)
+    if generation is None:
+        generation = repo.get_current_generation(package_id)
+    yield json.dumps({"type": "meta", "package_id": package_id, "generation": generation}) + "\n"
+    for kind in ("nodes", "links"):
+        row_type = "node" if kind == "nodes" else "link"
+        after = None
+        while True:
+            rows = repo.get_graph_page(kind, package_id, generation, after, batch_size)
+            current = repo.get_current_generation(package_id)
+            if current != generation:
+                yield json.dumps({
+                    "type": "error",
+                    "code": BusinessCode.GRAPH_CURSOR_EXPIRED,
+                    "message": f"Graph was reparsed (generation {generation} -> {current}); restart the stream"
+                }) + "\n"
+                return
+            if rows:
+                yield "".join(json.dumps({"type": row_type, **row._asdict()}, ensure_ascii=False) + "\n" for row in rows)
+            if len(rows) < batch_size:
+                break
+            after = rows[-1].id
+
+
+def nt_literal(value: str) -> str:
+    """N-Triples 字符串字面量 (UTF-8 直接书写，只转义反斜杠、引号与换行)"""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+    return f'"{escaped}"'
+
+
+def graph_ntriples_chunks(repo: OntologyRepository, package_id: str, generation: int, batch_size: int) -> Iterator[str]:
+    """实体的名称与类别写为字面量三元组，关系写为 ``urn:ontohub:relation:{类型}`` 谓词连接两端实体"""
+    for rows in repo.iter_graph_rows("nodes", package_id, generation, batch_size):
+        lines = []
+        for row in rows:
+            subject = f"<urn:uuid:{row.stable_id or row.id}>"
+            lines.append(f"{subject} {RDFS_LABEL} {nt_literal(row.name)} .\n")
+            if row.category:
+                lines.append(f"{subject} {CATEGORY_PREDICATE} {nt_literal(row.category)} .\n")
+        yield "".join(lines)
+    for rows in repo.iter_relation_endpoints(package_id, generation, batch_size):
+        yield "".join(
+            f"<urn:uuid:{source}> <{RELATION_PREFIX}{quote(relation_type, safe='')}> <urn:uuid:{target}> .\n"
+            for source, relation_type, target in rows
+        )
+
+
+class GraphExporter:
+    """
+    按 (包, 代次, 文件名) 缓存在磁盘上的导出文件
+
+    首次请求时生成：先写临时文件再原子改名，并发的同一导出由进程内锁合并为一次生成。
+    生成完成后若包已被重新解析 (旧代次行可能已被回收)，丢弃结果并返回 None，由调用方按新代次重试。
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self._root = root
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    @property
+    def root(self) -> str:
+        if self._root is None:
+            from ..config import settings
+            return os.path.join(settings.STORAGE_DIR, "exports")
+        return self._root
+
+    def directory(self, package_id: str) -> str:
+        return os.path.join(self.root, package_id)
+
+    def path(self, package_id: str, generation: int, name: str) -> str:
+        return os.path.join(self.directory(package_id), f"g{generation}.v{EXPORT_VERSION}.{name}")
+
+    @staticmethod
+    def etag(package_id: str, generation: int, name: str) -> str:
+        return f'"{package_id}-g{generation}-v{EXPORT_VERSION}-{name}"'
+
+    def get_or_create(self, repo: OntologyRepository, package_id: str, generation: int, name: str,
+                      batch_size: int) -> Optional[str]:
+        path = self.path(package_id, generation, name)
+        if os.path.exists(path):
+            return path
+        writer = self._writer(name)
+        with self._lock((package_id, name)):
+            if os.path.exists(path):
+                return path
+            os.makedirs(self.directory(package_id), exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            try:
+                writer(repo, package_id, generation, batch_size, tmp_path)
+                if repo.get_current_generation(package_id) != generation:
+                    logger.info(f"Package {package_id} was reparsed while exporting {name}; discarding generation {generation}")
+                    return None
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        logger.info(f"Exported {name} for package {package_id} generation {generation} ({os.path.getsize(path)} bytes)")
+        self.purge(package_id, keep_generation=generation)
+        return path
+
+    def purge(self, package_id: str, keep_generation: Optional[int] = None):
+        """删除包的导出文件；指定 keep_generation 时只删除其他代次与旧格式版本的文件"""
+        directory = self.directory(package_id)
+        if not os.path.isdir(directory):
+            return
+        keep_prefix = None if keep_generation is None else f"g{keep_generation}.v{EXPORT_VERSION}."
+        for filename in os.listdir(directory):
+            if keep_prefix and (filename.startswith(keep_prefix) or filename.endswith(".tmp")):
+                continue
+            try:
+                os.remove(os.path.join(directory, filename))
+            except OSError:
+                # 并发请求可能已删除，或文件仍被占用 (Windows)，下次导出时再回收
+                pass
+        if keep_generation is None:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+
+    def _lock(self, key: tuple) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _writer(self, name: str) -> Callable:
+        if name.endswith(".parquet"):
+            if pq is None:
+                raise GraphExportUnavailable("Parquet export requires the optional 'pyarrow' package")
+            return self._write_entities_parquet if name == "entities.parquet" else self._write_relations_parquet
+        return {"graph.ndjson.gz": self._write_ndjson, "graph.nt.gz": self._write_ntriples}[name]
+
+    @staticmethod
+    def _write_gzip(path: str, chunks: Iterator[str]):
+        # mtime=0 且不写文件名，同一代次重复生成的字节完全相同
+        with open(path, "wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=6, mtime=0) as out:
+            for chunk in chunks:
+                out.write(chunk.encode("utf-8"))
+
+    def _write_ndjson(self, repo, package_id, generation, batch_size, path):
+        self._write_gzip(path, graph_ndjson_chunks(repo, package_id, batch_size, generation))
+
+    def _write_ntriples(self, repo, package_id, generation, batch_size, path):
+        self._write_gzip(path, graph_ntriples_chunks(repo, package_id, generation, batch_size))
+
+    @staticmethod
+    def _write_parquet(path: str, columns: tuple, batches: Iterator[list]):
+        schema = pa.schema([(column, pa.string()) for column in columns])
+        with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+            # 每批写成一个行组，内存占用与包规模无关
+            for rows in batches:
+                writer.write_table(pa.Table.from_pydict(
+                    {column: [getattr(row, column) for row in rows] for column in columns}, schema=schema
+                ))
+
+    def _write_entities_parquet(self, repo, package_id, generation, batch_size, path):
+        self._write_parquet(path, ENTITY_COLUMNS, repo.iter_graph_rows("nodes", package_id, generation, batch_size))
+
+    def _write_relations_parquet(self, repo, package_id, generation, batch_size, path):
+        self._write_parquet(path, RELATION_COLUMNS, repo.iter_graph_rows("links", package_id, generation, batch_size))
+
+
+graph_exporter = GraphExporter()
@@ -0,0 +1,80 @@
+import heapq
+from array import array
+from collections import Counter
+from typing import List
+
+from .graph_cache import PackageGraph
+
+
+def _bucket(degree: int) -> int:
+    """度数分桶：0、1、2-3、4-7 ... (按 2 的幂)"""
+    return degree.bit_length()
+
+
+def _histogram(degrees: array) -> List[dict]:
+    counts = Counter(_bucket(d) for d in degrees)
+    return [
+        {"min": 0 if b == 0 else 1 << (b - 1), "max": 0 if b == 0 else (1 << b) - 1, "count": counts[b]}
+        for b in sorted(counts)
+    ]
+
+
+def _components(graph: PackageGraph) -> array:
+    """弱连通分量：并查集 (路径减半)，返回每个节点的根"""
+    parent = array("i", range(len(graph)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for node in range(len(graph)):
+        for pos in range(graph.out_offsets[node], graph.out_offsets[node + 1]):
+            a, b = find(node), find(graph.out_targets[pos])
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+    for node in range(len(graph)):
+        parent[node] = find(node)
+    return parent
+
+
+def compute_graph_stats(graph: PackageGraph, top_n: int = 20) -> dict:
+    """
+    基于邻接结构一次性计算包级图谱统计：按类别/关系类型的计数、入/出/总度数直方图、
+    度数最高的 top_n 个枢纽实体、弱连通分量与孤立实体 (无任何关系)。
+    """
+    node_count = len(graph)
+    in_degrees = array("i", (graph.in_offsets[i + 1] - graph.in_offsets[i] for i in range(node_count)))
+    out_degrees = array("i", (graph.out_offsets[i + 1] - graph.out_offsets[i] for i in range(node_count)))
+    degrees = array("i", (a + b for a, b in zip(in_degrees, out_degrees)))
+
+    category_counts = Counter(graph.category_names[code] for code in graph.categories)
+    type_counts = Counter(graph.relation_types[code] for code in graph.out_types)
+
+    def entity(node: int) -> dict:
+        return {"id": graph.ids[node], "name": graph.names[node], "category": graph.category_names[graph.categories[node]]}
+
+    hubs = heapq.nsmallest(top_n, range(node_count), key=lambda n: (-degrees[n], graph.names[n]))
+    orphans = [node for node in range(node_count) if degrees[node] == 0]
+    component_sizes = sorted(Counter(_components(graph)).values(), reverse=True) if node_count else []
+
+    return {
+        "node_count": node_count,
+        "edge_count": graph.edge_count,
+        "categories": [{"category": c, "count": n} for c, n in category_counts.most_common()],
+        "relation_types": [{"relation_type": t, "count": n} for t, n in type_counts.most_common()],
+        "degree_histogram": {
+            "incoming": _histogram(in_degrees),
+            "outgoing": _histogram(out_degrees),
+            "total": _histogram(degrees),
+        },
+        "hubs": [
+            {**entity(n), "in_degree": in_degrees[n], "out_degree": out_degrees[n], "degree": degrees[n]}
+            for n in hubs if degrees[n] > 0
+        ],
+        "component_count": len(component_sizes),
+        "largest_components": component_sizes[:top_n],
+        "orphan_count": len(orphans),
+        "orphans": [entity(n) for n in sorted(orphans, key=graph.names.__getitem__)[:top_n]],
+    }
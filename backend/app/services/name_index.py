@@ -0,0 +1,79 @@
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+# 元数据中视为别名的字段 (frontmatter 的 aliases/alias，OWL 的 label)
+ALIAS_FIELDS = ("aliases", "alias", "label")
+
+
+def normalize_name(name: str) -> str:
+    """归一化实体名称：NFKC 全半角统一、大小写折叠、空白折叠"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", name).casefold()).strip()
+
+
+def metadata_aliases(metadata: Dict[str, Any]) -> List[str]:
+    """从元数据提取别名：列表或逗号分隔的字符串，OWL 实体额外包含 URI 及其本地名"""
+    aliases: List[str] = []
+    for field in ALIAS_FIELDS:
+        value = metadata.get(field)
+        if isinstance(value, str):
+            aliases.extend(part.strip() for part in value.split(",") if part.strip())
+        elif isinstance(value, (list, tuple)):
+            aliases.extend(str(item).strip() for item in value if item is not None and str(item).strip())
+    uri = metadata.get("uri")
+    if isinstance(uri, str) and uri:
+        aliases.append(uri)
+        local = uri.rsplit("#", 1)[-1] if "#" in uri else uri.rstrip("/").rsplit("/", 1)[-1]
+        if local:
+            aliases.append(local)
+    return aliases
+
+
+class NameIndex:
+    """
+    单次解析内的名称解析索引
+
+    三层查找，均为 O(1)：精确名称 -> 归一化名称 -> 归一化别名。
+    同名实体以先出现者为准，后出现者记录为重复；别名冲突同样先到先得，且不会遮蔽任何实体名称。
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, str] = {}
+        self._normalized: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+        self._sources: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def add(self, name: str, entity_id: str, source: str = "", aliases: Iterable[str] = ()) -> Optional[str]:
+        """
+        登记实体。名称已被占用时不覆盖，返回先登记实体的来源 (用于告警)；否则返回 None。
+        """
+        if name in self._exact:
+            return self._sources.get(self._exact[name], "")
+        self._exact[name] = entity_id
+        self._sources[entity_id] = source
+        self._normalized.setdefault(normalize_name(name), entity_id)
+        for alias in aliases:
+            self._aliases.setdefault(normalize_name(alias), entity_id)
+        return None
+
+    def resolve(self, target: str) -> Optional[str]:
+        entity_id = self._exact.get(target)
+        if entity_id is not None:
+            return entity_id
+        for candidate in self._candidates(target):
+            key = normalize_name(candidate)
+            entity_id = self._normalized.get(key) or self._aliases.get(key)
+            if entity_id is not None:
+                return entity_id
+        return None
+
+    @staticmethod
+    def _candidates(target: str) -> Tuple[str, ...]:
+        # [[Target|label]] / [[Target#Heading]] 形式只取目标部分
+        base = target.split("|", 1)[0].split("#", 1)[0]
+        return (target, base) if base and base != target else (target,)
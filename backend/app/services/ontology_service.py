@@ -3,10 +3,11 @@ import shutil
 import zipfile
 import logging
 import json
+import base64
 import aiofiles
 from datetime import datetime
 from fastapi import UploadFile
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from ..repositories.ontology_repo import OntologyRepository
 from ..repositories.webhook_repo import WebhookRepository
@@ -14,17 +15,27 @@ from ..core.events import dispatcher
 from .. import models, schemas, utils
 from ..core.results import ServiceResult, ServiceStatus
 from ..core.errors import BusinessCode
+from .reparse_scheduler import reparse_scheduler
+from .entity_diff import entity_diff_cache
+from .entity_listing import decode_entity_cursor, encode_entity_cursor, entity_count_cache, parse_metadata_filters
+from .graph_cache import graph_cache
+from .graph_export import EXPORT_NAMES, GraphExportUnavailable, graph_exporter, graph_ndjson_chunks
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
 # OntologyService will use settings.STORAGE_DIR via dynamic property
 
+
 class OntologyService:
     def __init__(self, onto_repo: OntologyRepository, webhook_repo: WebhookRepository, webhook_service: 'WebhookService' = None):
         self.onto_repo = onto_repo
         self.webhook_repo = webhook_repo
         self.webhook_service = webhook_service
+        self.reparse_scheduler = reparse_scheduler
+        self.diff_cache = entity_diff_cache
+        self.count_cache = entity_count_cache
+        self.graph_cache = graph_cache
 
     @property
     def storage_dir(self) -> str:
@@ -52,12 +63,7 @@ class OntologyService:
             return ServiceResult.failure_result(ServiceStatus.NOT_FOUND, f"Package '{package_id}' not found")
         
         # If no template_id provided, use the one already on the package or series default
-        final_template_id = template_id
-        if not final_template_id:
-            final_template_id = package.template_id
-            if not final_template_id:
-                series = self.onto_repo.get_series(package.series_code)
-                final_template_id = series.default_template_id if series else None
+        final_template_id = template_id or self._resolve_template_id(package)
         
         if not final_template_id:
             return ServiceResult.failure_result(ServiceStatus.BAD_REQUEST, "No parsing template associated with this ontology")
@@ -66,6 +72,38 @@ class OntologyService:
         # The caller (main.py) will add it to background tasks
         return ServiceResult.success_result(final_template_id)
 
+    def _resolve_template_id(self, package: models.OntologyPackage) -> Optional[str]:
+        """包自身的模板优先，其次为系列默认模板"""
+        if package.template_id:
+            return package.template_id
+        series = self.onto_repo.get_series(package.series_code)
+        return series.default_template_id if series else None
+
+    def bulk_reparse(self, req: schemas.BulkReparseRequest) -> ServiceResult[schemas.ReparseBatchResponse]:
+        """按模板 / 系列 / 版本集合批量调度重解析，启用中的版本优先执行"""
+        if not (req.template_id or req.series_code or req.package_ids):
+            return ServiceResult.failure_result(
+                ServiceStatus.BAD_REQUEST, "At least one of template_id, series_code or package_ids is required"
+            )
+        packages = self.onto_repo.find_packages_for_reparse(req.template_id, req.series_code, req.package_ids, req.active_only)
+
+        targets, skipped = [], []
+        for package in packages:
+            template_id = self._resolve_template_id(package)
+            if template_id:
+                targets.append((package.id, template_id, bool(package.is_active)))
+            else:
+                skipped.append(package.id)
+
+        batch = self.reparse_scheduler.submit(targets)
+        return ServiceResult.success_result(schemas.ReparseBatchResponse(**batch.progress(), skipped=skipped))
+
+    def get_reparse_batch(self, batch_id: str) -> ServiceResult[schemas.ReparseBatchResponse]:
+        batch = self.reparse_scheduler.get_batch(batch_id)
+        if not batch:
+            return ServiceResult.failure_result(ServiceStatus.NOT_FOUND, f"Reparse batch '{batch_id}' not found")
+        return ServiceResult.success_result(schemas.ReparseBatchResponse(**batch.progress()))
+
     def _get_storage_path(self, package_id: str) -> str:
         return os.path.join(self.storage_dir, package_id)
 
@@ -462,6 +500,7 @@ class OntologyService:
         zip_path = self.get_source_zip_path(package_id)
         if os.path.exists(zip_path):
             os.remove(zip_path)
+        graph_exporter.purge(package_id)
             
         return ServiceResult.success_result()
 
@@ -485,6 +524,7 @@ class OntologyService:
             zip_path = self.get_source_zip_path(pkg.id)
             if os.path.exists(zip_path):
                 os.remove(zip_path)
+            graph_exporter.purge(pkg.id)
         
         # 2. 数据库清理：利用 Repository 执行级联删除
         self.onto_repo.delete_series(code)
@@ -497,10 +537,476 @@ class OntologyService:
         # Actually manager.py had a simple logic for this
         return os.path.join(self.storage_dir, f"{package_id}.zip") # Wait, manager.py just returned a path
 
+    def get_graph(self, package_id: str) -> dict:
+        nodes, links = self.onto_repo.get_graph(package_id)
+        return {"nodes": nodes, "links": links}
+
+    def get_graph_page(self, package_id: str, cursor: Optional[str], limit: int) -> ServiceResult[dict]:
+        """
+        游标分页读取图谱：先按主键顺序取完节点再取边，每页合计不超过 limit 条。
+        游标记录所属代次，期间包被重新解析时返回 GRAPH_CURSOR_EXPIRED，客户端需从头开始。
+        """
+        generation = self.onto_repo.get_current_generation(package_id)
+        if generation is None:
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                f"Package '{package_id}' not found",
+                business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+        kind, after = "nodes", None
+        if cursor:
+            try:
+                cursor_generation, kind, after = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            except Exception:
+                kind = None
+            if kind not in ("nodes", "links"):
+                return ServiceResult.failure_result(ServiceStatus.BAD_REQUEST, "Invalid graph cursor")
+            if cursor_generation != generation:
+                return ServiceResult.failure_result(
+                    ServiceStatus.BAD_REQUEST,
+                    f"Graph was reparsed (generation {cursor_generation} -> {generation}); restart pagination",
+                    business_code=BusinessCode.GRAPH_CURSOR_EXPIRED
+                )
+
+        page = {"nodes": [], "links": []}
+        remaining, next_cursor = limit, None
+        while True:
+            # 多取一行判断是否还有后续数据
+            rows = self.onto_repo.get_graph_page(kind, package_id, generation, after, remaining + 1)
+            if len(rows) > remaining:
+                page[kind] = rows[:remaining]
+                last = page[kind][-1].id if remaining else after
+                next_cursor = base64.urlsafe_b64encode(json.dumps([generation, kind, last]).encode()).decode("ascii")
+                break
+            page[kind] = rows
+            remaining -= len(rows)
+            if kind == "links":
+                break
+            kind, after = "links", None
+        return ServiceResult.success_result({**page, "next_cursor": next_cursor})
+
+    def stream_graph(self, package_id: str) -> ServiceResult[Iterator[str]]:
+        """
+        NDJSON 流式图谱：首行为 meta，随后每行一个节点 (type=node) 或边 (type=link)。
+        生成器使用独立会话按主键键集分页逐批读取，内存占用与图谱规模无关；每批之间结束读事务，
+        慢客户端不会长时间占用数据库。期间包被重新解析时以一行 type=error (GRAPH_CURSOR_EXPIRED) 结束。
+        """
+        if self.onto_repo.get_current_generation(package_id) is None:
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                f"Package '{package_id}' not found",
+                business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+        return ServiceResult.success_result(self._iter_graph_ndjson(package_id, settings.GRAPH_STREAM_BATCH_SIZE))
+
+    def export_graph(self, package_id: str, name: str) -> ServiceResult[dict]:
+        """
+        当前代次的整包导出文件 (首次请求时生成并缓存在磁盘上)，返回文件路径、媒体类型与 ETag。
+        生成期间包被重新解析时按新代次重试一次。
+        """
+        if name not in EXPORT_NAMES:
+            return ServiceResult.failure_result(ServiceStatus.BAD_REQUEST, f"Unsupported export '{name}'")
+        for _ in range(2):
+            generation = self.onto_repo.get_current_generation(package_id)
+            if generation is None:
+                return ServiceResult.failure_result(
+                    ServiceStatus.NOT_FOUND,
+                    f"Package '{package_id}' not found",
+                    business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+                )
+            try:
+                path = graph_exporter.get_or_create(
+                    self.onto_repo, package_id, generation, name, settings.GRAPH_EXPORT_BATCH_SIZE
+                )
+            except GraphExportUnavailable as e:
+                return ServiceResult.failure_result(ServiceStatus.BAD_REQUEST, str(e))
+            if path:
+                return ServiceResult.success_result({
+                    "path": path,
+                    "media_type": EXPORT_NAMES[name],
+                    "etag": graph_exporter.etag(package_id, generation, name),
+                    "filename": f"{package_id}.g{generation}.{name}",
+                })
+        return ServiceResult.failure_result(
+            ServiceStatus.FAILURE, f"Package '{package_id}' kept changing while exporting; retry later"
+        )
+
+    @staticmethod
+    def _iter_graph_ndjson(package_id: str, batch_size: int) -> Iterator[str]:
+        from ..database import SessionLocal
+        db = SessionLocal()
+        try:
+            for chunk in graph_ndjson_chunks(OntologyRepository(db), package_id, batch_size):
+                # 向客户端写出前结束读事务并归还连接
+                db.rollback()
+                yield chunk
+        finally:
+            db.close()
+
+    def get_neighborhood(self, package_id: str, ids: List[str], names: List[str], depth: int = 1,
+                         max_nodes: int = 200, relation_types: Optional[List[str]] = None,
+                         categories: Optional[List[str]] = None,
+                         direction: str = "both") -> ServiceResult[schemas.OntologySubgraphResponse]:
+        """以若干实体 (ID 或名称) 为种子的 k 跳子图，节点数受 GRAPH_NEIGHBORHOOD_MAX_NODES 硬上限约束"""
+        seeds, failure = self._find_seeds(package_id, ids, names)
+        if failure:
+            return failure
+
+        max_nodes = min(max_nodes, settings.GRAPH_NEIGHBORHOOD_MAX_NODES)
+        graph = self.graph_cache.get(self.onto_repo.db, package_id)
+        if graph is not None:
+            # 启用版本走内存邻接结构遍历，只在补全实体与边时访问数据库
+            depths, truncated = graph.neighborhood(
+                [graph.index[seed] for seed in seeds if seed in graph.index], depth, max_nodes, relation_types, categories, direction
+            )
+            nodes, links = self.onto_repo.get_subgraph(
+                {graph.ids[node]: hops for node, hops in depths.items()}, relation_types
+            )
+        else:
+            nodes, links, truncated = self.onto_repo.get_neighborhood(
+                package_id, seeds, depth, max_nodes, relation_types, categories, direction
+            )
+        return ServiceResult.success_result(schemas.OntologySubgraphResponse(
+            seeds=seeds,
+            nodes=[
+                schemas.SubgraphNode(**schemas.OntologyEntityResponse.model_validate(entity).model_dump(), depth=hops)
+                for entity, hops in nodes
+            ],
+            links=links,
+            truncated=truncated
+        ))
+
+    def _find_seeds(self, package_id: str, ids: List[str], names: List[str], role: str = "entity"):
+        """解析图查询的起点实体，返回 (实体ID列表, 失败结果)"""
+        if not self.onto_repo.get_package(package_id):
+            return [], ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                f"Package '{package_id}' not found",
+                business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+        if not ids and not names:
+            return [], ServiceResult.failure_result(ServiceStatus.BAD_REQUEST, f"At least one {role} id or name is required")
+        seeds = self.onto_repo.find_entity_ids(package_id, ids, names)
+        if not seeds:
+            return [], ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                f"None of the requested {role} entities exist in this package",
+                business_code=BusinessCode.RESOURCE_NOT_FOUND
+            )
+        return seeds, None
+
+    def find_path(self, package_id: str, source_ids: List[str], source_names: List[str],
+                  target_ids: List[str], target_names: List[str], max_depth: int = 6,
+                  max_visited: Optional[int] = None, relation_types: Optional[List[str]] = None,
+                  direction: str = "out") -> ServiceResult[schemas.OntologyPathResponse]:
+        """
+        两组实体之间的最短路径 (双向 BFS)。同名实体视为多个起点/终点；
+        路径长度受 GRAPH_TRAVERSAL_MAX_DEPTH、访问节点数受 GRAPH_PATH_MAX_VISITED 硬上限约束。
+        """
+        sources, failure = self._find_seeds(package_id, source_ids, source_names, "source")
+        if failure:
+            return failure
+        targets, failure = self._find_seeds(package_id, target_ids, target_names, "target")
+        if failure:
+            return failure
+
+        graph = self.graph_cache.get_or_load(self.onto_repo.db, package_id)
+        max_depth = min(max_depth, settings.GRAPH_TRAVERSAL_MAX_DEPTH)
+        max_visited = min(max_visited or settings.GRAPH_PATH_MAX_VISITED, settings.GRAPH_PATH_MAX_VISITED)
+        path, visited, truncated = graph.shortest_path(
+            [graph.index[i] for i in sources if i in graph.index],
+            [graph.index[i] for i in targets if i in graph.index],
+            max_depth, max_visited, relation_types, direction
+        )
+        if path is None:
+            return ServiceResult.success_result(schemas.OntologyPathResponse(
+                found=False, nodes=[], links=[], visited=visited, truncated=truncated
+            ))
+        path_ids = [graph.ids[node] for node in path]
+        nodes = self.onto_repo.get_subgraph_nodes({entity_id: i for i, entity_id in enumerate(path_ids)})
+        return ServiceResult.success_result(schemas.OntologyPathResponse(
+            found=True,
+            length=len(path) - 1,
+            nodes=[entity for entity, _ in nodes],
+            links=self.onto_repo.get_path_relations(path_ids, direction, relation_types),
+            visited=visited,
+            truncated=False
+        ))
+
+    def get_reachable(self, package_id: str, ids: List[str], names: List[str], direction: str = "out",
+                      relation_types: Optional[List[str]] = None, max_depth: Optional[int] = None,
+                      max_nodes: int = 1000) -> ServiceResult[schemas.OntologyReachabilityResponse]:
+        """
+        传递闭包：从种子实体沿 direction 可达的全部实体 (如 relation_types=subClassOf、direction=out 为祖先，
+        direction=in 为所有传递依赖方)，跳数与节点数分别受 GRAPH_TRAVERSAL_MAX_DEPTH / GRAPH_REACHABILITY_MAX_NODES 约束。
+        """
+        seeds, failure = self._find_seeds(package_id, ids, names)
+        if failure:
+            return failure
+
+        graph = self.graph_cache.get_or_load(self.onto_repo.db, package_id)
+        max_depth = min(max_depth or settings.GRAPH_TRAVERSAL_MAX_DEPTH, settings.GRAPH_TRAVERSAL_MAX_DEPTH)
+        # 种子本身不计入闭包，多取一个名额
+        max_nodes = min(max_nodes, settings.GRAPH_REACHABILITY_MAX_NODES) + len(seeds)
+        depths, truncated = graph.neighborhood(
+            [graph.index[i] for i in seeds if i in graph.index], max_depth, max_nodes, relation_types, None, direction
+        )
+        nodes = self.onto_repo.get_subgraph_nodes({graph.ids[node]: hops for node, hops in depths.items() if hops > 0})
+        return ServiceResult.success_result(schemas.OntologyReachabilityResponse(
+            seeds=seeds,
+            nodes=[
+                schemas.SubgraphNode(**schemas.OntologyEntityResponse.model_validate(entity).model_dump(), depth=hops)
+                for entity, hops in nodes
+            ],
+            truncated=truncated
+        ))
+
+    def list_entities(self, package_id: str, category: Optional[str] = None, name_prefix: Optional[str] = None,
+                      metadata: List[str] = (), cursor: Optional[str] = None, limit: int = 100,
+                      include_total: bool = True) -> ServiceResult[schemas.PaginatedOntologyEntityResponse]:
+        """
+        过滤并按 (名称, ID) 稳定排序的实体列表，键集 (游标) 分页，翻到任意深度的代价都相同。
+        游标记录所属代次，期间包被重新解析时返回 GRAPH_CURSOR_EXPIRED。
+        总数：无过滤或仅按类别过滤时取解析时预先计算的图谱统计，其余组合计数一次后按代次缓存。
+        """
+        generation = self.onto_repo.get_current_generation(package_id)
+        if generation is None:
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                f"Package '{package_id}' not found",
+                business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+        try:
+            metadata_filters = parse_metadata_filters(metadata)
+            after = None
+            if cursor:
+                cursor_generation, name, entity_id = decode_entity_cursor(cursor)
+                if cursor_generation != generation:
+                    return ServiceResult.failure_result(
+                        ServiceStatus.BAD_REQUEST,
+                        f"Entities were reparsed (generation {cursor_generation} -> {generation}); restart pagination",
+                        business_code=BusinessCode.GRAPH_CURSOR_EXPIRED
+                    )
+                after = (name, entity_id)
+        except ValueError as e:
+            return ServiceResult.failure_result(ServiceStatus.BAD_REQUEST, str(e))
+
+        filters = dict(category=category, name_prefix=name_prefix or None, metadata=metadata_filters)
+        # 多取一行判断是否还有下一页
+        rows = self.onto_repo.list_entities(package_id, generation, after=after, limit=limit + 1, **filters)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_entity_cursor(generation, rows[-1].name, rows[-1].id)
+
+        total = None
+        if include_total:
+            total = self._stats_entity_count(package_id, generation, category, name_prefix or None, metadata_filters)
+            if total is None:
+                key = (package_id, generation, category, name_prefix or None, tuple(metadata_filters))
+                total = self.count_cache.get_or_compute(
+                    key, lambda: self.onto_repo.count_entities(package_id, generation, **filters)
+                )
+        return ServiceResult.success_result(schemas.PaginatedOntologyEntityResponse(
+            items=rows, total=total, next_cursor=next_cursor
+        ))
+
+    def list_attribute_keys(self, package_id: str) -> ServiceResult[List[schemas.AttributeKeyCount]]:
+        """当前代次的属性键及拥有该键的实体数，供前端构造属性过滤条件"""
+        generation = self.onto_repo.get_current_generation(package_id)
+        if generation is None:
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                f"Package '{package_id}' not found",
+                business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+        rows = self.onto_repo.get_attribute_keys(package_id, generation)
+        return ServiceResult.success_result([schemas.AttributeKeyCount(key=key, entity_count=n) for key, n in rows])
+
+    def list_attribute_values(self, package_id: str, key: str, limit: int = 50) -> ServiceResult[List[schemas.AttributeValueCount]]:
+        """指定属性键下最常见的取值，按实体数降序"""
+        generation = self.onto_repo.get_current_generation(package_id)
+        if generation is None:
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                f"Package '{package_id}' not found",
+                business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+        rows = self.onto_repo.get_attribute_values(package_id, generation, key, limit)
+        return ServiceResult.success_result([schemas.AttributeValueCount(value=value, entity_count=n) for value, n in rows])
+
+    def _stats_entity_count(self, package_id: str, generation: int, category: Optional[str],
+                            name_prefix: Optional[str], metadata_filters: list) -> Optional[int]:
+        """从同一代次的图谱统计中直接读取总数；统计缺失或过滤条件超出统计范围时返回 None"""
+        if name_prefix or metadata_filters:
+            return None
+        stats = self.onto_repo.get_graph_stats(package_id)
+        if not stats or stats.generation != generation:
+            return None
+        if category is None:
+            return stats.node_count
+        categories = json.loads(stats.stats_json).get("categories", [])
+        return next((item["count"] for item in categories if item["category"] == category), 0)
+
+    def get_parse_report(self, package_id: str, top: int = 10) -> ServiceResult[schemas.ParseReportResponse]:
+        """最近一次解析剖析报告，文件按耗时降序取前 top 个"""
+        if not self.onto_repo.get_package(package_id):
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                f"Package '{package_id}' not found",
+                business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+        report = self.onto_repo.get_parse_report(package_id)
+        if not report:
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                "No parse report recorded for this package; reparse with profiling enabled",
+                business_code=BusinessCode.RESOURCE_NOT_FOUND
+            )
+        details = json.loads(report.report_json)
+        return ServiceResult.success_result(schemas.ParseReportResponse(
+            package_id=report.package_id,
+            generation=report.generation,
+            created_at=report.created_at,
+            total_ms=report.total_ms,
+            file_count=report.file_count,
+            entity_count=report.entity_count,
+            relation_count=report.relation_count,
+            rule_totals_ms=details.get("rule_totals_ms", {}),
+            slowest_files=details.get("files", [])[:top]
+        ))
+
+    def get_graph_stats(self, package_id: str) -> ServiceResult[schemas.GraphStatsResponse]:
+        """解析完成时预先计算的图谱统计，不扫描实体/关系表"""
+        if not self.onto_repo.get_package(package_id):
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                f"Package '{package_id}' not found",
+                business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+        stats = self.onto_repo.get_graph_stats(package_id)
+        if not stats:
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                "No graph statistics recorded for this package; reparse to compute them",
+                business_code=BusinessCode.RESOURCE_NOT_FOUND
+            )
+        details = json.loads(stats.stats_json)
+        return ServiceResult.success_result(schemas.GraphStatsResponse(
+            package_id=stats.package_id,
+            generation=stats.generation,
+            created_at=stats.created_at,
+            **details
+        ))
+
     def list_relations(self, package_id: str, skip: int = 0, limit: int = 100) -> schemas.PaginatedOntologyRelationResponse:
         items, total = self.onto_repo.get_relations(package_id, skip, limit)
         return {"items": items, "total": total}
 
+    def list_cross_relations(self, package_id: str, skip: int = 0, limit: int = 100) -> ServiceResult[schemas.PaginatedCrossSeriesRelationResponse]:
+        """跨系列关系列表；目标实体已不存在 (例如目标版本被删除) 的关系视为未解析"""
+        if not self.onto_repo.get_package(package_id):
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                f"Package '{package_id}' not found",
+                business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+        rows, total = self.onto_repo.get_cross_relations(package_id, skip, limit)
+        items = [
+            schemas.CrossSeriesRelationResponse(
+                id=link.id,
+                source_id=link.source_id,
+                source_name=source_name,
+                relation_type=link.relation_type,
+                target_series_code=link.target_series_code,
+                target_name=link.target_name,
+                target_package_id=link.target_package_id,
+                target_entity_id=link.target_entity_id if target_name is not None else None,
+                target_entity_name=target_name,
+                resolved=target_name is not None
+            )
+            for link, source_name, target_name in rows
+        ]
+        return ServiceResult.success_result({"items": items, "total": total})
+
+    def diff_entities(self, base_id: str, target_id: str, status: Optional[str] = None,
+                      skip: int = 0, limit: int = 100) -> ServiceResult[schemas.EntityDiffResponse]:
+        """实体级语义差异：完整结果按版本对缓存，本页条目再补全双方元数据与变化字段"""
+        loaded = self._load_diff("entities", base_id, target_id, self.onto_repo.diff_entities)
+        if not loaded.success:
+            return loaded
+        base_pkg, target_pkg, rows = loaded.data
+        counts, page, total = self._page_diff(rows, status, skip, limit)
+
+        metadata = self.onto_repo.get_entity_metadata(
+            [entity_id for row in page for entity_id in (row.base_id, row.target_id) if entity_id]
+        )
+        items = []
+        for row in page:
+            base_meta = self._load_metadata(metadata.get(row.base_id)) if row.base_id else None
+            target_meta = self._load_metadata(metadata.get(row.target_id)) if row.target_id else None
+            changed = []
+            if row.status == "modified":
+                changed = sorted(k for k in set(base_meta) | set(target_meta) if base_meta.get(k) != target_meta.get(k))
+            items.append(schemas.EntityDiffItem(
+                status=row.status, category=row.category, name=row.name,
+                base_entity_id=row.base_id, target_entity_id=row.target_id,
+                base_metadata=base_meta, target_metadata=target_meta, changed_keys=changed
+            ))
+        return ServiceResult.success_result(schemas.EntityDiffResponse(
+            base_version=base_pkg.version, target_version=target_pkg.version,
+            counts=counts, total=total, items=items
+        ))
+
+    def diff_relations(self, base_id: str, target_id: str, status: Optional[str] = None,
+                       skip: int = 0, limit: int = 100) -> ServiceResult[schemas.RelationDiffResponse]:
+        """关系级差异，以两端实体的 (类别, 名称) 与关系类型标识一条关系"""
+        loaded = self._load_diff("relations", base_id, target_id, self.onto_repo.diff_relations)
+        if not loaded.success:
+            return loaded
+        base_pkg, target_pkg, rows = loaded.data
+        counts, page, total = self._page_diff(rows, status, skip, limit)
+        items = [
+            schemas.RelationDiffItem(
+                status=row[0], source_category=row[1], source_name=row[2],
+                relation_type=row[3], target_category=row[4], target_name=row[5]
+            )
+            for row in page
+        ]
+        return ServiceResult.success_result(schemas.RelationDiffResponse(
+            base_version=base_pkg.version, target_version=target_pkg.version,
+            counts=counts, total=total, items=items
+        ))
+
+    def _load_diff(self, kind: str, base_id: str, target_id: str, compute) -> ServiceResult:
+        base_pkg = self.onto_repo.get_package(base_id)
+        target_pkg = self.onto_repo.get_package(target_id)
+        if not base_pkg or not target_pkg:
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND,
+                "Package not found",
+                business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+        key = (kind, base_id, base_pkg.current_generation, target_id, target_pkg.current_generation)
+        rows = self.diff_cache.get_or_compute(key, lambda: compute(base_id, target_id))
+        return ServiceResult.success_result((base_pkg, target_pkg, rows))
+
+    @staticmethod
+    def _page_diff(rows: list, status: Optional[str], skip: int, limit: int):
+        counts = {"added": 0, "deleted": 0, "modified": 0}
+        for row in rows:
+            counts[row[0]] += 1
+        selected = [row for row in rows if row[0] == status] if status else rows
+        return counts, selected[skip:skip + limit], len(selected)
+
+    @staticmethod
+    def _load_metadata(metadata_json: Optional[str]) -> dict:
+        try:
+            metadata = json.loads(metadata_json) if metadata_json else {}
+        except json.JSONDecodeError:
+            metadata = {}
+        return metadata if isinstance(metadata, dict) else {}
+
     async def compare_packages(self, base_id: str, target_id: str) -> ServiceResult[schemas.OntologyComparisonResponse]:
         """比较两个本体版本的差异 (Beyond Compare 风格)"""
         base_pkg = self.onto_repo.get_package(base_id)
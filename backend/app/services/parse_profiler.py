@@ -0,0 +1,113 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+_current_profiler: ContextVar[Optional["ParseProfiler"]] = ContextVar("parse_profiler", default=None)
+
+
+def current_profiler() -> Optional["ParseProfiler"]:
+    """当前解析任务的剖析器；未开启剖析时返回 None，插件据此跳过计时"""
+    return _current_profiler.get()
+
+
+class FileProfile:
+    """单个文件的解析耗时明细 (秒)"""
+    __slots__ = ("file_path", "parser", "read_seconds", "elapsed_seconds", "rule_seconds", "entity_count", "errors")
+
+    def __init__(self, file_path: str, parser: str):
+        self.file_path = file_path
+        self.parser = parser
+        self.read_seconds = 0.0
+        self.elapsed_seconds = 0.0
+        self.rule_seconds: Dict[str, float] = {}
+        self.entity_count = 0
+        self.errors: List[str] = []
+
+    def to_dict(self) -> dict:
+        return {
+            "file_path": self.file_path,
+            "parser": self.parser,
+            "total_ms": round(self.elapsed_seconds * 1000, 3),
+            "read_ms": round(self.read_seconds * 1000, 3),
+            "parse_ms": round(max(0.0, self.elapsed_seconds - self.read_seconds) * 1000, 3),
+            "rule_ms": {key: round(sec * 1000, 3) for key, sec in self.rule_seconds.items()},
+            "entity_count": self.entity_count,
+            "errors": self.errors,
+        }
+
+
+class ParseProfiler:
+    """
+    包级解析剖析器
+
+    通过 contextvar 在一次 ``parse_package`` 内生效：管道记录每个文件在插件中消耗的时间，
+    插件在读取文件、执行正则规则时向当前文件追加明细。
+    """
+
+    def __init__(self):
+        self.files: List[FileProfile] = []
+        self._current: Optional[FileProfile] = None
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def activate(self):
+        token = _current_profiler.set(self)
+        try:
+            yield self
+        finally:
+            _current_profiler.reset(token)
+
+    def begin_file(self, file_path: str, parser: str) -> FileProfile:
+        self._current = FileProfile(file_path, parser)
+        self.files.append(self._current)
+        return self._current
+
+    def iterate(self, produce: Callable[[], Iterable[dict]]) -> Iterator[dict]:
+        """
+        调用插件并透传其产出的记录，只累计插件内部的耗时 (不含管道写库)。
+        列表型插件的耗时发生在 ``produce()`` 调用中，生成器型插件的耗时分摊在每次取值中。
+        """
+        profile = self._current
+        start = time.perf_counter()
+        try:
+            iterator = iter(produce())
+        finally:
+            profile.elapsed_seconds += time.perf_counter() - start
+        while True:
+            start = time.perf_counter()
+            try:
+                record = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                profile.elapsed_seconds += time.perf_counter() - start
+            profile.entity_count += 1
+            yield record
+
+    def record_read(self, seconds: float):
+        if self._current is not None:
+            self._current.read_seconds += seconds
+
+    def record_rule(self, key: str, seconds: float):
+        if self._current is not None:
+            rules = self._current.rule_seconds
+            rules[key] = rules.get(key, 0.0) + seconds
+
+    def record_error(self, message: str):
+        if self._current is not None:
+            self._current.errors.append(message)
+
+    def to_report(self) -> dict:
+        files = sorted((f.to_dict() for f in self.files), key=lambda f: f["total_ms"], reverse=True)
+        rule_totals: Dict[str, float] = {}
+        for f in files:
+            for key, ms in f["rule_ms"].items():
+                rule_totals[key] = round(rule_totals.get(key, 0.0) + ms, 3)
+        return {
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "file_count": len(files),
+            "entity_count": sum(f["entity_count"] for f in files),
+            "rule_totals_ms": rule_totals,
+            "files": files,
+        }
@@ -1,6 +1,8 @@
+import time
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterable
 from ...models import OntologyFile, OntologyEntity
+from ..parse_profiler import current_profiler
 
 class BaseParser(ABC):
     """
@@ -26,9 +28,27 @@ class BaseParser(ABC):
         Returns:
             List[Dict]: 实体记录列表。每个字典应包含:
                 - metadata (Dict): 提取出的属性字典
-                - links (List[str]): 提取出的关系目标名称或 URI 列表
+                - links (List[str | Dict]): 关系目标列表。元素为目标名称 (关系类型默认 related_to)，
+                  或 {"target": 目标名称, "type": 关系类型} 形式的类型化关系
                 - body (str): 提取出的主体内容 (可选)
                 - name (str): 显式指定的实体名称 (可选, 插件可覆盖核心命名逻辑)
                 - category (str): 显式指定的实体类别 (可选)
+                - warnings (List[str]): 解析过程中的非致命告警，如正则超时 (可选)
         """
         pass
+
+    def parse_file(self, file_record: OntologyFile, file_path: str, rules: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """
+        从磁盘文件解析实体记录。默认整体读入后委托给 ``parse``；
+        需要流式处理大文件的插件可覆盖此方法，直接按文件路径增量读取。
+
+        返回值可以是列表，也可以是逐条 ``yield`` 记录的生成器 (字段同 ``parse``)。
+        解析管道按需消费并分块写库，插件无需在内存中保留整个文件的结果。
+        """
+        profiler = current_profiler()
+        start = time.perf_counter() if profiler else 0.0
+        with open(file_path, 'r', encoding='utf-8-sig') as f:
+            content = f.read()
+        if profiler:
+            profiler.record_read(time.perf_counter() - start)
+        return self.parse(file_record, content, rules)
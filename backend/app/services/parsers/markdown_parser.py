@@ -1,10 +1,13 @@
 import re
-import yaml
+import time
 import os
 import logging
 from typing import List, Tuple, Dict, Any
 from .base import BaseParser
+from .markdown_scan import MarkdownScan, scan_markdown
 from ...models import OntologyFile
+from ...core.safe_regex import safe_search, RegexTimeoutError
+from ..parse_profiler import current_profiler
 
 logger = logging.getLogger(__name__)
 
@@ -14,21 +17,22 @@ class MarkdownParser(BaseParser):
         return ['.md', '.markdown']
 
     def parse(self, file_record: OntologyFile, content: str, rules: Dict[str, Any]) -> List[Dict[str, Any]]:
-        # 1. 解析 Frontmatter
-        metadata, body = self._parse_frontmatter(content)
+        # 1. 单遍扫描：Frontmatter、表格与 WikiLinks
+        scan = scan_markdown(content)
+        metadata, body = scan.metadata, scan.body
         
-        # 2. 提取正则属性
-        regex_attributes = self._extract_attributes(body, rules)
+        # 2. 提取正则属性 (超时的规则记录为告警)
+        warnings = []
+        regex_attributes = self._extract_attributes(body, rules, warnings)
         
         # 3. 提取表格属性 (迁移逻辑)
-        table_attributes = self._extract_table_attributes(body, rules)
+        table_attributes = self._extract_table_attributes(scan, rules)
         
         # 4. 合并
         final_metadata = {**metadata, **regex_attributes, **table_attributes}
         
-        # 5. 提取 WikiLinks
-        wiki_link_pattern = re.compile(r'\[\[(.*?)(?:\|.*?)?\]\]')
-        links = wiki_link_pattern.findall(body)
+        # 5. WikiLinks (扫描阶段已收集)
+        links = scan.links
         
         # 返回 body 供后续可能的全文索引或其他用途使用（虽然当前核心只存 metadata）
         # 这里为了保持一致性，我们将 body 放入 metadata 的一个特殊字段或直接处理
@@ -39,43 +43,43 @@ class MarkdownParser(BaseParser):
         return [{
             "metadata": final_metadata,
             "links": links,
-            "body": body
+            "body": body,
+            "warnings": warnings
         }]
 
     def _parse_frontmatter(self, content: str):
-        if content.startswith("---\n"):
-            parts = content.split("---", 2)
-            if len(parts) >= 3:
-                yaml_text = parts[1]
-                body = parts[2]
-                try:
-                    metadata = yaml.safe_load(yaml_text)
-                    if isinstance(metadata, dict):
-                        return metadata, body
-                except Exception:
-                    pass
-        return {}, content
+        scan = scan_markdown(content)
+        return scan.metadata, scan.body
 
-    def _extract_attributes(self, content: str, rules: dict) -> dict:
+    def _extract_attributes(self, content: str, rules: dict, warnings: List[str] = None) -> dict:
         attributes = {}
         attr_rules = rules.get("attribute", {})
         
-        # Regex Extraction
+        # Regex Extraction: 用户正则经受限执行层运行，单条规则超时不影响其余规则
         regex_patterns = attr_rules.get("regex_patterns", [])
+        profiler = current_profiler()
         for rule in regex_patterns:
             key = rule.get("key")
             pattern = rule.get("pattern")
             if not key or not pattern: continue
+            start = time.perf_counter() if profiler else 0.0
             try:
-                compiled = re.compile(pattern, re.MULTILINE)
-                match = compiled.search(content)
+                match = safe_search(pattern, content, re.MULTILINE)
                 if match:
-                    attributes[key] = match.group(1).strip() if match.groups() else match.group(0).strip()
+                    group0, *groups = match
+                    attributes[key] = groups[0].strip() if groups else group0.strip()
+            except RegexTimeoutError as e:
+                logger.warning(f"Regex rule '{key}' timed out after {e.timeout}s")
+                if warnings is not None:
+                    warnings.append(f"正则规则 '{key}' 执行超时 (>{e.timeout}s)，已跳过")
             except Exception:
                 continue
+            finally:
+                if profiler:
+                    profiler.record_rule(key, time.perf_counter() - start)
         return attributes
 
-    def _extract_table_attributes(self, content: str, rules: dict) -> dict:
+    def _extract_table_attributes(self, scan: MarkdownScan, rules: dict) -> dict:
         attributes = {}
         attr_rules = rules.get("attribute", {})
         strategies = attr_rules.get("strategies", [])
@@ -84,39 +88,24 @@ class MarkdownParser(BaseParser):
                 target_key = strategy.get("target_key", "properties")
                 header_mapping = strategy.get("header_mapping", {})
                 
-                rows = self._parse_markdown_table(content, header_mapping)
+                rows = self._table_rows(scan, header_mapping)
                 if rows:
                     attributes[target_key] = rows
         return attributes
 
-    def _parse_markdown_table(self, content: str, header_mapping: dict) -> List[dict]:
-        lines = content.split('\n')
-        table_start_index = -1
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line.startswith('|'): continue
-            if i + 1 < len(lines):
-                next_line = lines[i+1].strip()
-                if next_line.startswith('|') and '---' in next_line:
-                    headers = [h.strip() for h in line.strip('|').split('|')]
-                    if any(h in header_mapping for h in headers):
-                        table_start_index = i
-                        break
-        
-        if table_start_index == -1: return []
-            
-        header_line = lines[table_start_index].strip()
-        raw_headers = [h.strip() for h in header_line.strip('|').split('|')]
-        
+    def _table_rows(self, scan: MarkdownScan, header_mapping: dict) -> List[dict]:
+        table = scan.find_table(header_mapping)
+        if table is None: return []
+
         rows = []
-        for i in range(table_start_index + 2, len(lines)):
-            line = lines[i].strip()
-            if not line.startswith('|'): break
-            cells = [c.strip() for c in line.strip('|').split('|')]
+        for cells in table.rows:
             row_data = {}
-            for col_idx, header in enumerate(raw_headers):
+            for col_idx, header in enumerate(table.headers):
                 if header in header_mapping:
                     key = header_mapping[header]
                     row_data[key] = cells[col_idx] if col_idx < len(cells) else ""
             if row_data: rows.append(row_data)
         return rows
+
+    def _parse_markdown_table(self, content: str, header_mapping: dict) -> List[dict]:
+        return self._table_rows(scan_markdown(content), header_mapping)
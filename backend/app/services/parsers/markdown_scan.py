@@ -0,0 +1,91 @@
+import re
+import yaml
+from typing import Any, Dict, List, Optional
+
+# libyaml 可用时使用 C 实现的安全加载器，否则退回纯 Python 版本 (行为一致)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_WIKI_LINK = re.compile(r'\[\[(.*?)(?:\|.*?)?\]\]')
+
+
+class MarkdownTable:
+    """正文中的一张管道表格 (表头 + 数据行单元格)"""
+    __slots__ = ("headers", "rows")
+
+    def __init__(self, headers: List[str]):
+        self.headers = headers
+        self.rows: List[List[str]] = []
+
+
+class MarkdownScan:
+    """单遍扫描结果：frontmatter 元数据、正文、表格与 WikiLinks"""
+    __slots__ = ("metadata", "body", "tables", "links")
+
+    def __init__(self, metadata: Dict[str, Any], body: str):
+        self.metadata = metadata
+        self.body = body
+        self.tables: List[MarkdownTable] = []
+        self.links: List[str] = []
+
+    def find_table(self, header_mapping: dict) -> Optional[MarkdownTable]:
+        """返回第一张表头命中映射的表格"""
+        for table in self.tables:
+            if any(h in header_mapping for h in table.headers):
+                return table
+        return None
+
+
+def load_frontmatter(yaml_text: str) -> Optional[dict]:
+    try:
+        metadata = yaml.load(yaml_text, Loader=_YAML_LOADER)
+    except Exception:
+        return None
+    return metadata if isinstance(metadata, dict) else None
+
+
+def _split_cells(line: str) -> List[str]:
+    return [c.strip() for c in line.strip('|').split('|')]
+
+
+def scan_markdown(content: str) -> MarkdownScan:
+    """
+    对 Markdown 文本做一次线性扫描。
+
+    frontmatter 只在文件以 ``---`` 开头时定位闭合分隔符；正文逐行遍历一次，
+    同时收集管道表格 (表头行紧跟 ``|---`` 分隔行) 和 ``[[WikiLink]]``。
+    """
+    metadata: Dict[str, Any] = {}
+    body = content
+    if content.startswith("---\n"):
+        end = content.find("---", 3)
+        if end != -1:
+            parsed = load_frontmatter(content[3:end])
+            if parsed is not None:
+                metadata, body = parsed, content[end + 3:]
+
+    scan = MarkdownScan(metadata, body)
+    lines = body.split('\n')
+    table: Optional[MarkdownTable] = None
+    skip_separator = False
+
+    for i, raw in enumerate(lines):
+        if '[[' in raw:
+            scan.links.extend(_WIKI_LINK.findall(raw))
+
+        line = raw.strip()
+        if not line.startswith('|'):
+            table = None
+            continue
+        if skip_separator:
+            skip_separator = False
+            continue
+        if table is not None:
+            table.rows.append(_split_cells(line))
+            continue
+        if i + 1 < len(lines):
+            next_line = lines[i + 1].strip()
+            if next_line.startswith('|') and '---' in next_line:
+                table = MarkdownTable(_split_cells(line))
+                scan.tables.append(table)
+                skip_separator = True
+    return scan
@@ -1,8 +1,10 @@
 import logging
 import os
-from typing import List, Tuple, Dict, Any
-from rdflib import Graph, RDF, RDFS, OWL, URIRef
+from typing import List, Tuple, Dict, Any, Iterable
+from xml.sax import SAXException
+from rdflib import Graph, Literal, OWL, RDF, RDFS, URIRef
 from .base import BaseParser
+from .rdf_stream import OWLCollector, StreamingUnsupported, iter_rdfxml_triples, iter_turtle_triples
 from ...models import OntologyFile
 
 logger = logging.getLogger(__name__)
@@ -10,11 +12,51 @@ logger = logging.getLogger(__name__)
 class OWLParser(BaseParser):
     @property
     def supported_extensions(self) -> List[str]:
-        return ['.owl', '.rdf', '.ttl', '.n3']
+        return ['.owl', '.rdf', '.ttl', '.n3', '.nt']
+
+    def parse_file(self, file_record: OntologyFile, file_path: str, rules: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """
+        大文件优先走单遍流式解析 (内存与抽取结果规模成正比)，
+        遇到流式模式不支持的语法时回退到完整的内存图解析。
+        """
+        if self._should_stream(file_path, rules):
+            try:
+                return self._parse_streaming(file_record, file_path)
+            except (StreamingUnsupported, SAXException) as e:
+                logger.info(f"Streaming parse not applicable for {file_record.file_path} ({e}), falling back to in-memory graph")
+        return super().parse_file(file_record, file_path, rules)
+
+    def _should_stream(self, file_path: str, rules: Dict[str, Any]) -> bool:
+        """rules.owl.streaming: auto (默认，按文件大小) / always / never"""
+        from ...config import settings
+        mode = rules.get("owl", {}).get("streaming", "auto")
+        if mode == "never":
+            return False
+        if mode == "always":
+            return True
+        return os.path.getsize(file_path) >= settings.OWL_STREAMING_THRESHOLD_BYTES
+
+    def _parse_streaming(self, file_record: OntologyFile, file_path: str) -> Iterable[Dict[str, Any]]:
+        ext = os.path.splitext(file_record.file_path)[1].lower()
+        collector = OWLCollector()
+        if ext in ('.owl', '.rdf'):
+            with open(file_path, 'rb') as f:
+                for triple in iter_rdfxml_triples(f):
+                    collector.add(*triple)
+        elif ext in ('.ttl', '.n3', '.nt'):
+            # N3 是 Turtle 的超集，其特有语法 ({} 公式、=> 等) 由分词器识别后回退
+            with open(file_path, 'r', encoding='utf-8-sig') as f:
+                for triple in iter_turtle_triples(f):
+                    collector.add(*triple)
+        else:
+            raise StreamingUnsupported(f"No streaming reader for {ext}")
+        # 三元组已全部消费 (不支持的语法在此之前抛出以便回退)，实体记录按需逐个产出
+        return collector.iter_entities()
 
     def parse(self, file_record: OntologyFile, content: str, rules: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        解析 OWL/RDF 本体文件，提取所有类作为独立实体
+        解析 OWL/RDF 本体文件，将类、对象/数据属性与命名个体提取为独立实体，
+        subClassOf / equivalentClass / domain / range / rdf:type 等作为类型化的关系返回
         """
         g = Graph()
         ext = os.path.splitext(file_record.file_path)[1].lower()
@@ -22,7 +64,8 @@ class OWLParser(BaseParser):
             '.owl': 'xml',
             '.rdf': 'xml',
             '.ttl': 'turtle',
-            '.n3': 'n3'
+            '.n3': 'n3',
+            '.nt': 'nt'
         }
         
         try:
@@ -31,42 +74,27 @@ class OWLParser(BaseParser):
             logger.error(f"Failed to parse RDF content: {e}")
             return []
 
-        # 1. 预提取所有类的关系 (subClassOf)
-        # 用字典存储关系，方便后续组装
-        class_links = {}
-        for s, o in g.subject_objects(RDFS.subClassOf):
-            if isinstance(s, URIRef) and isinstance(o, URIRef):
-                if s not in class_links: class_links[s] = []
-                target_name = self._get_label_or_fragment(g, o)
-                class_links[s].append(target_name)
-
-        # 2. 遍历所有类并构造实体列表
-        entities = []
-        for s in g.subjects(RDF.type, OWL.Class):
-            if not isinstance(s, URIRef): continue
-            
-            name = self._get_label_or_fragment(g, s)
-            metadata = {
-                "uri": str(s),
-                "type": "Class",
-                "label": str(g.value(s, RDFS.label)) if g.value(s, RDFS.label) else "",
-                "comment": str(g.value(s, RDFS.comment)) if g.value(s, RDFS.comment) else ""
-            }
-            
-            entities.append({
-                "name": name,
-                "metadata": metadata,
-                "links": class_links.get(s, []),
-                "category": "OWL Class" # 可选，Service 逻辑会处理
-            })
+        return self._extract_from_graph(g)
 
-        return entities
+    # 实体抽取所需的全部谓词；每个谓词只按索引扫描一次
+    _INDEXED_PREDICATES = (
+        RDF.type, RDFS.label, RDFS.comment,
+        RDFS.subClassOf, RDFS.subPropertyOf, OWL.equivalentClass, RDFS.domain, RDFS.range
+    )
 
-    def _get_label_or_fragment(self, g, uri):
-        label = g.value(uri, RDFS.label)
-        if label:
-            return str(label)
-        # fallback to fragment
-        if "#" in uri:
-            return uri.split("#")[-1]
-        return uri.split("/")[-1]
+    def _extract_from_graph(self, g: Graph) -> List[Dict[str, Any]]:
+        """
+        将图中相关谓词的三元组一次性灌入 OWLCollector，由其构建标签/注释字典后统一解析名称，
+        避免对每个类、每条边重复调用 ``g.value``。
+        """
+        collector = OWLCollector()
+        for predicate in self._INDEXED_PREDICATES:
+            p = str(predicate)
+            for s, o in g.subject_objects(predicate):
+                if not isinstance(s, URIRef):
+                    continue
+                if isinstance(o, Literal):
+                    collector.add(str(s), p, str(o), True)
+                elif isinstance(o, URIRef):
+                    collector.add(str(s), p, str(o), False)
+        return collector.entities()
@@ -0,0 +1,516 @@
+"""
+RDF 流式解析工具
+
+大体积 OWL 文件若整体读入 rdflib ``Graph``，内存占用可达文件体积的数十倍。
+本模块以单遍扫描的方式把文件转换为三元组流，交给 ``OWLCollector`` 只保留
+实体抽取所需的最小状态 (实体声明、标签、注释、类型化的边)，内存与输出规模成正比而与文件体积无关。
+
+- RDF/XML: 基于 SAX 的事件驱动解析 (``RDFXMLStreamHandler``)
+- N-Triples / Turtle / N3: 按行分词的语句状态机 (``iter_turtle_triples``)，
+  支持 ``[]`` 匿名节点属性列表与 ``()`` 集合 (OWL 限制与 unionOf 等的常见写法)
+
+遇到流式模式不支持的语法 (如多行字符串、N3 的 ``{}`` 公式与 ``=>``) 时抛出
+``StreamingUnsupported``，由调用方回退到完整的内存图解析。
+"""
+import re
+import xml.sax
+from xml.sax.handler import ContentHandler, feature_namespaces
+from urllib.parse import urljoin
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+RDFS_NS = "http://www.w3.org/2000/01/rdf-schema#"
+OWL_NS = "http://www.w3.org/2002/07/owl#"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+RDF_TYPE = RDF_NS + "type"
+RDFS_LABEL = RDFS_NS + "label"
+RDFS_COMMENT = RDFS_NS + "comment"
+RDFS_SUBCLASS_OF = RDFS_NS + "subClassOf"
+RDFS_SUBPROPERTY_OF = RDFS_NS + "subPropertyOf"
+RDFS_DOMAIN = RDFS_NS + "domain"
+RDFS_RANGE = RDFS_NS + "range"
+OWL_CLASS = OWL_NS + "Class"
+OWL_EQUIVALENT_CLASS = OWL_NS + "equivalentClass"
+
+# 声明类型 -> 实体种类 (同一 URI 有多个声明时取优先级最高者)
+ENTITY_KINDS = {
+    OWL_CLASS: "Class",
+    OWL_NS + "ObjectProperty": "ObjectProperty",
+    OWL_NS + "DatatypeProperty": "DatatypeProperty",
+    OWL_NS + "NamedIndividual": "NamedIndividual",
+}
+_KIND_PRIORITY = {kind: i for i, kind in enumerate(ENTITY_KINDS.values())}
+
+# 谓词 -> 关系类型 (relation_type)
+EDGE_PREDICATES = {
+    RDFS_SUBCLASS_OF: "subClassOf",
+    RDFS_SUBPROPERTY_OF: "subPropertyOf",
+    OWL_EQUIVALENT_CLASS: "equivalentClass",
+    RDFS_DOMAIN: "domain",
+    RDFS_RANGE: "range",
+}
+
+# 这些命名空间下的 rdf:type 宾语是词汇表本身，不代表个体所属的类
+_VOCABULARY_NAMESPACES = (RDF_NS, RDFS_NS, OWL_NS)
+
+# 三元组表示: (subject_uri, predicate_uri, object, object_is_literal)
+# 主语为匿名节点的三元组不会被产出；宾语为匿名节点时 object 为 None
+Triple = Tuple[str, str, Optional[str], bool]
+
+
+class StreamingUnsupported(Exception):
+    """文件包含流式解析器无法处理的语法，需要回退到完整图解析"""
+
+
+def local_name(uri: str) -> str:
+    if "#" in uri:
+        return uri.split("#")[-1]
+    return uri.split("/")[-1]
+
+
+class OWLCollector:
+    """
+    单遍三元组累加器：记录类/属性/个体声明、标签、注释以及类型化的边，
+    所有信息在同一遍扫描中收集，最终一次性解析名称。
+    """
+
+    def __init__(self):
+        self.kinds: Dict[str, str] = {}  # 保持文档顺序
+        self.labels: Dict[str, str] = {}
+        self.comments: Dict[str, str] = {}
+        self.edges: Dict[str, List[Tuple[str, str]]] = {}
+        # 指向非词汇表类的 rdf:type，待扫描结束后判定是否为个体
+        self.instance_types: Dict[str, List[str]] = {}
+
+    def add(self, s: str, p: str, o: Optional[str], is_literal: bool):
+        if o is None:
+            return
+        if p == RDF_TYPE:
+            if is_literal:
+                return
+            kind = ENTITY_KINDS.get(o)
+            if kind:
+                current = self.kinds.get(s)
+                if current is None or _KIND_PRIORITY[kind] < _KIND_PRIORITY[current]:
+                    self.kinds[s] = kind
+            elif not o.startswith(_VOCABULARY_NAMESPACES):
+                self.instance_types.setdefault(s, []).append(o)
+        elif p == RDFS_LABEL:
+            if is_literal and o and s not in self.labels:
+                self.labels[s] = o
+        elif p == RDFS_COMMENT:
+            if is_literal and o and s not in self.comments:
+                self.comments[s] = o
+        elif p in EDGE_PREDICATES:
+            if not is_literal:
+                self.edges.setdefault(s, []).append((EDGE_PREDICATES[p], o))
+
+    def name_of(self, uri: str) -> str:
+        return self.labels.get(uri) or local_name(uri)
+
+    def entities(self) -> List[dict]:
+        return list(self.iter_entities())
+
+    def iter_entities(self) -> Iterator[dict]:
+        """逐个产出实体记录，供流式写入管道消费"""
+        # 类型为已声明类的主语即使没有 owl:NamedIndividual 声明也视为个体
+        for uri, types in self.instance_types.items():
+            if uri not in self.kinds and any(self.kinds.get(t) == "Class" for t in types):
+                self.kinds[uri] = "NamedIndividual"
+
+        for uri, kind in self.kinds.items():
+            links = [
+                {"target": self.name_of(target), "type": rel_type}
+                for rel_type, target in self.edges.get(uri, [])
+            ]
+            links.extend(
+                {"target": self.name_of(target), "type": "type"}
+                for target in self.instance_types.get(uri, [])
+            )
+            yield {
+                "name": self.name_of(uri),
+                "metadata": {
+                    "uri": uri,
+                    "type": kind,
+                    "label": self.labels.get(uri, ""),
+                    "comment": self.comments.get(uri, "")
+                },
+                "links": links,
+                "category": f"OWL {kind}"
+            }
+
+
+# ---------------------------------------------------------------------------
+# RDF/XML (SAX)
+# ---------------------------------------------------------------------------
+
+class _Frame:
+    __slots__ = ("kind", "subject", "predicate", "text", "base", "has_object", "collection")
+
+    def __init__(self, kind: str, base: str, subject: Optional[str] = None, predicate: Optional[str] = None):
+        self.kind = kind  # root / node / property / skip
+        self.base = base
+        self.subject = subject
+        self.predicate = predicate
+        self.text: List[str] = []
+        self.has_object = False
+        self.collection = False
+
+
+class RDFXMLStreamHandler(ContentHandler):
+    """
+    RDF/XML 条纹语法 (node/property 交替) 的 SAX 实现，覆盖 OWL 文件中常见的写法：
+    rdf:about / rdf:ID / rdf:resource / rdf:nodeID、类型化节点元素、属性特性 (property attributes)
+    以及 parseType="Resource" / "Collection" / "Literal"。
+    """
+
+    def __init__(self, emit: Callable[[str, str, Optional[str], bool], None], base: str = ""):
+        super().__init__()
+        self._emit = emit
+        self._base = base
+        self._stack: List[_Frame] = []
+
+    def _resolve(self, base: str, ref: str) -> str:
+        return urljoin(base, ref) if base else ref
+
+    def _node_subject(self, attrs, base: str) -> Optional[str]:
+        about = attrs.get((RDF_NS, "about"))
+        if about is not None:
+            return self._resolve(base, about)
+        rdf_id = attrs.get((RDF_NS, "ID"))
+        if rdf_id is not None:
+            return self._resolve(base, "#" + rdf_id)
+        return None  # 匿名节点
+
+    def startElementNS(self, name, qname, attrs):
+        ns, local = name
+        uri = (ns or "") + local
+        parent = self._stack[-1] if self._stack else None
+        base = parent.base if parent else self._base
+        xml_base = attrs.get((XML_NS, "base"))
+        if xml_base:
+            base = self._resolve(base, xml_base)
+
+        if parent is None and uri == RDF_NS + "RDF":
+            self._stack.append(_Frame("root", base))
+            return
+
+        if parent is not None and parent.kind == "skip":
+            self._stack.append(_Frame("skip", base))
+            return
+
+        if parent is None or parent.kind in ("root", "property"):
+            self._start_node(uri, attrs, base, parent)
+        else:
+            self._start_property(uri, attrs, base, parent)
+
+    def _start_node(self, uri, attrs, base, parent: Optional[_Frame]):
+        subject = self._node_subject(attrs, base)
+        frame = _Frame("node", base, subject=subject)
+        self._stack.append(frame)
+
+        if parent is not None and parent.kind == "property":
+            parent.has_object = True
+            if not parent.collection and parent.subject is not None:
+                self._emit(parent.subject, parent.predicate, subject, False)
+
+        if subject is None:
+            return
+        if uri != RDF_NS + "Description":
+            self._emit(subject, RDF_TYPE, uri, False)
+        for (a_ns, a_local), value in attrs.items():
+            if a_ns == XML_NS:
+                continue
+            if a_ns == RDF_NS:
+                if a_local == "type":
+                    self._emit(subject, RDF_TYPE, self._resolve(base, value), False)
+                continue
+            self._emit(subject, (a_ns or "") + a_local, value, True)
+
+    def _start_property(self, uri, attrs, base, parent: _Frame):
+        frame = _Frame("property", base, subject=parent.subject, predicate=uri)
+        self._stack.append(frame)
+
+        parse_type = attrs.get((RDF_NS, "parseType"))
+        if parse_type == "Literal":
+            frame.has_object = True
+            frame.kind = "skip"
+            return
+        if parse_type == "Resource":
+            # 属性值为匿名节点，子元素是该匿名节点的属性
+            frame.has_object = True
+            frame.kind = "node"
+            frame.subject = None
+            return
+        if parse_type == "Collection":
+            frame.collection = True
+            frame.has_object = True
+            return
+
+        resource = attrs.get((RDF_NS, "resource"))
+        if resource is not None:
+            frame.has_object = True
+            if parent.subject is not None:
+                self._emit(parent.subject, uri, self._resolve(base, resource), False)
+        elif attrs.get((RDF_NS, "nodeID")) is not None:
+            frame.has_object = True
+
+    def characters(self, content):
+        if self._stack and self._stack[-1].kind == "property":
+            self._stack[-1].text.append(content)
+
+    def endElementNS(self, name, qname):
+        frame = self._stack.pop()
+        if frame.kind == "property" and not frame.has_object and frame.subject is not None:
+            self._emit(frame.subject, frame.predicate, "".join(frame.text), True)
+
+
+def iter_rdfxml_triples(stream, base: str = "") -> Iterator[Triple]:
+    """以 SAX 方式解析 RDF/XML 文件对象，批量产出三元组"""
+    buffer: List[Triple] = []
+    handler = RDFXMLStreamHandler(lambda s, p, o, lit: buffer.append((s, p, o, lit)), base=base)
+    parser = xml.sax.make_parser()
+    parser.setFeature(feature_namespaces, True)
+    parser.setContentHandler(handler)
+
+    # 增量喂数据，每个数据块处理完立即交出，避免累积
+    while True:
+        chunk = stream.read(64 * 1024)
+        if not chunk:
+            break
+        parser.feed(chunk)
+        if buffer:
+            yield from buffer
+            buffer.clear()
+    parser.close()
+    yield from buffer
+
+
+# ---------------------------------------------------------------------------
+# N-Triples / Turtle (按行分词)
+# ---------------------------------------------------------------------------
+
+_TTL_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<comment>\#.*)
+      | (?P<unsupported>"""|\'\'\'|\{|\})
+      | (?P<bracket>[\[\]()])
+      | (?P<iri><[^>\s]*>)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        (?:@(?P<lang>[A-Za-z0-9-]+)|\^\^(?P<dtype><[^>\s]*>|[^\s;,<"'\[\]()]*))?
+      | (?P<punct>[;,])
+      | (?P<name>[^\s;,<"'\[\]()]+)
+    )''', re.VERBOSE)
+
+_ESCAPE = re.compile(r'\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)')
+_SIMPLE_ESCAPES = {"t": "\t", "n": "\n", "r": "\r", "b": "\b", "f": "\f"}
+
+
+def _unescape(text: str) -> str:
+    def repl(match):
+        esc = match.group(1)
+        if esc[0] in "uU":
+            return chr(int(esc[1:], 16))
+        return _SIMPLE_ESCAPES.get(esc, esc)
+    return _ESCAPE.sub(repl, text) if "\\" in text else text
+
+
+class _TurtleStatementMachine:
+    """
+    消费 Turtle 词法单元的语句状态机：subject → predicate → object (, object)* (; predicate ...)* .
+
+    ``[ ... ]`` 与 ``( ... )`` 出现在主语、宾语或集合元素位置时压栈，保存外层的主语、谓词与位置，
+    闭合时出栈恢复。匿名节点与集合节点以 None 表示：以其为主语的三元组不产出，与完整图解析只取 URI 主语一致；
+    空集合 ``()`` 即 rdf:nil。
+    """
+
+    def __init__(self, base: str = ""):
+        self.base = base
+        self.prefixes: Dict[str, str] = {}
+        self.state = "subject"
+        self.subject: Optional[str] = None
+        self.predicate: Optional[str] = None
+        self.directive: Optional[List] = None
+        # (类型 "[" / "(", 外层主语, 外层谓词, 所处位置 subject / object / list)
+        self.nesting: List[Tuple[str, Optional[str], Optional[str], str]] = []
+        self.list_empty = False
+
+    def _resolve_iri(self, ref: str) -> str:
+        ref = _unescape(ref)
+        return urljoin(self.base, ref) if self.base else ref
+
+    def _term(self, kind: str, value: str) -> Tuple[Optional[str], bool]:
+        """将词法单元解析为 (值, 是否字面量)；匿名节点返回 (None, False)"""
+        if kind == "iri":
+            return self._resolve_iri(value[1:-1]), False
+        if kind == "string":
+            return _unescape(value[1:-1]), True
+        if value.startswith("_:"):
+            return None, False
+        if value in ("true", "false") or value[0] in "+-.0123456789":
+            return value, True
+        prefix, sep, local = value.partition(":")
+        if not sep:
+            raise StreamingUnsupported(f"Unexpected token {value!r}")
+        if prefix not in self.prefixes:
+            raise StreamingUnsupported(f"Undeclared prefix {prefix!r}")
+        return self.prefixes[prefix] + local.replace("\\", ""), False
+
+    def _open(self, bracket: str, role: str):
+        self.nesting.append((bracket, self.subject, self.predicate, role))
+        if bracket == "[":
+            self.subject, self.predicate = None, None
+            self.state = "predicate"
+        else:
+            self.list_empty = True
+            self.state = "list"
+
+    def _close(self, bracket: str, out: List[Triple]):
+        if not self.nesting or self.nesting[-1][0] != ("[" if bracket == "]" else "("):
+            raise StreamingUnsupported(f"Unbalanced {bracket!r}")
+        if bracket == "]" and self.state not in ("predicate", "separator"):
+            raise StreamingUnsupported("Blank node property list terminated unexpectedly")
+        _, self.subject, self.predicate, role = self.nesting.pop()
+        if role == "object":
+            if bracket == ")" and self.list_empty and self.subject is not None:
+                out.append((self.subject, self.predicate, RDF_NS + "nil", False))
+            self.state = "separator"
+        elif role == "subject":
+            self.state = "predicate"
+        else:
+            self.list_empty = False
+            self.state = "list"
+
+    def feed(self, kind: str, value: str, out: List[Triple]):
+        if self.directive is not None:
+            self._feed_directive(kind, value)
+            return
+
+        if kind == "end":
+            if self.nesting or self.state not in ("separator", "predicate", "subject"):
+                raise StreamingUnsupported("Statement terminated unexpectedly")
+            self.state = "subject"
+            return
+
+        if kind == "bracket" and value in "])":
+            self._close(value, out)
+            return
+
+        if self.state == "list":
+            if kind == "bracket":
+                self._open(value, "list")
+            elif kind == "punct":
+                raise StreamingUnsupported(f"Unexpected {value!r} in collection")
+            else:
+                self._term(kind, value)
+                self.list_empty = False
+        elif self.state == "subject":
+            if kind == "name" and value.lower() in ("@prefix", "@base", "prefix", "base"):
+                self.directive = [value.lower()]
+                return
+            if kind in ("punct",):
+                raise StreamingUnsupported(f"Unexpected {value!r}")
+            if kind == "bracket":
+                self._open(value, "subject")
+                return
+            self.subject, _ = self._term(kind, value)
+            self.state = "predicate"
+        elif self.state == "predicate":
+            if kind in ("punct", "bracket"):
+                raise StreamingUnsupported(f"Unexpected {value!r}")
+            if kind == "name" and value == "a":
+                self.predicate = RDF_TYPE
+            else:
+                self.predicate, _ = self._term(kind, value)
+            self.state = "object"
+        elif self.state == "object":
+            if kind == "punct":
+                raise StreamingUnsupported(f"Unexpected {value!r}")
+            if kind == "bracket":
+                self._open(value, "object")
+                return
+            obj, is_literal = self._term(kind, value)
+            if self.subject is not None:
+                out.append((self.subject, self.predicate, obj, is_literal))
+            self.state = "separator"
+        elif self.state == "separator":
+            if kind == "punct" and value == ",":
+                self.state = "object"
+            elif kind == "punct" and value == ";":
+                self.state = "predicate"
+            else:
+                raise StreamingUnsupported(f"Expected separator, got {value!r}")
+
+    def _feed_directive(self, kind: str, value: str):
+        keyword = self.directive[0]
+        sparql_style = not keyword.startswith("@")
+        if kind == "end":
+            if sparql_style or len(self.directive) < (3 if keyword.endswith("prefix") else 2):
+                raise StreamingUnsupported("Malformed directive")
+            self.directive = None
+            return
+        self.directive.append(value)
+
+        if keyword.endswith("prefix") and len(self.directive) == 3:
+            prefix = self.directive[1]
+            if not prefix.endswith(":") or kind != "iri":
+                raise StreamingUnsupported("Malformed prefix directive")
+            self.prefixes[prefix[:-1]] = self._resolve_iri(value[1:-1])
+        elif keyword.endswith("base") and len(self.directive) == 2:
+            if kind != "iri":
+                raise StreamingUnsupported("Malformed base directive")
+            self.base = self._resolve_iri(value[1:-1])
+        else:
+            return
+
+        if sparql_style:
+            self.directive = None
+
+
+def _tokenize_line(line: str) -> Iterator[Tuple[str, str]]:
+    pos = 0
+    length = len(line)
+    while pos < length:
+        match = _TTL_TOKEN.match(line, pos)
+        if not match or match.end() == pos:
+            if line[pos:].strip():
+                raise StreamingUnsupported(f"Cannot tokenize: {line[pos:pos + 40]!r}")
+            return
+        pos = match.end()
+        kind = match.lastgroup
+        if kind in ("lang", "dtype"):
+            kind = "string"
+        if kind == "comment":
+            return
+        if kind == "unsupported":
+            raise StreamingUnsupported(f"Unsupported syntax {match.group(kind)!r}")
+
+        if kind == "string":
+            yield "string", match.group("string")
+        elif kind == "name":
+            value = match.group("name")
+            # 语句结束符 "." 可能紧贴在名称后 (名称本身不能以 "." 结尾)
+            if value == ".":
+                yield "end", "."
+            elif value.endswith(".") and not value[0].isdigit():
+                yield "name", value[:-1]
+                yield "end", "."
+            else:
+                yield "name", value
+        else:
+            yield kind, match.group(kind)
+
+
+def iter_turtle_triples(stream, base: str = "") -> Iterator[Triple]:
+    """逐行读取 N-Triples / Turtle 文本流并产出三元组"""
+    machine = _TurtleStatementMachine(base=base)
+    out: List[Triple] = []
+    for line in stream:
+        for kind, value in _tokenize_line(line):
+            machine.feed(kind, value, out)
+        if out:
+            yield from out
+            out.clear()
+    if machine.state != "subject" or machine.directive is not None:
+        raise StreamingUnsupported("Unterminated statement at end of file")
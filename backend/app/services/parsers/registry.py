@@ -0,0 +1,111 @@
+import os
+import logging
+import pkgutil
+import importlib
+import threading
+from typing import Dict, Optional, Set
+
+from .base import BaseParser
+
+logger = logging.getLogger(__name__)
+
+# 内置解析器清单：扩展名 -> "模块:类"。模块只在首次解析对应扩展名的文件时才导入，
+# 例如没有 OWL 文件的任务不会加载 rdflib。
+BUILTIN_PARSERS: Dict[str, str] = {
+    ".md": "app.services.parsers.markdown_parser:MarkdownParser",
+    ".markdown": "app.services.parsers.markdown_parser:MarkdownParser",
+    ".owl": "app.services.parsers.owl_parser:OWLParser",
+    ".rdf": "app.services.parsers.owl_parser:OWLParser",
+    ".ttl": "app.services.parsers.owl_parser:OWLParser",
+    ".n3": "app.services.parsers.owl_parser:OWLParser",
+    ".nt": "app.services.parsers.owl_parser:OWLParser",
+}
+
+# 插件目录中不含解析器的辅助模块，回退扫描时跳过
+_NON_PLUGIN_MODULES = {"base", "registry", "rdf_stream", "markdown_scan"}
+
+
+class ParserRegistry:
+    """
+    进程级解析器注册表
+
+    按扩展名惰性加载解析器：清单中的入口在首次使用时导入并实例化，同一个类只实例化一次。
+    清单未覆盖的扩展名会触发一次性的插件目录扫描，兼容未登记到清单的第三方插件。
+    """
+
+    def __init__(self, entry_points: Optional[Dict[str, str]] = None):
+        self._entry_points = dict(BUILTIN_PARSERS if entry_points is None else entry_points)
+        self._parsers: Dict[str, BaseParser] = {}
+        self._instances: Dict[str, BaseParser] = {}
+        self._discovered = False
+        self._lock = threading.Lock()
+
+    def get(self, ext: str) -> Optional[BaseParser]:
+        ext = ext.lower()
+        parser = self._parsers.get(ext)
+        if parser is not None:
+            return parser
+
+        with self._lock:
+            if ext in self._parsers:
+                return self._parsers[ext]
+            if ext not in self._entry_points and not self._discovered:
+                self._discover_plugins()
+            entry_point = self._entry_points.get(ext)
+            if entry_point is None:
+                return None
+            try:
+                parser = self._load(entry_point)
+            except Exception as e:
+                logger.error(f"Failed to load parser {entry_point} for extension {ext}: {e}")
+                return None
+            self._parsers[ext] = parser
+            return parser
+
+    def register(self, ext: str, parser: BaseParser):
+        """显式注册解析器实例，覆盖清单中的同名扩展"""
+        with self._lock:
+            self._parsers[ext.lower()] = parser
+
+    def loaded_entry_points(self) -> Set[str]:
+        """已导入并实例化的入口 (用于诊断)"""
+        return set(self._instances)
+
+    def _load(self, entry_point: str) -> BaseParser:
+        instance = self._instances.get(entry_point)
+        if instance is None:
+            module_name, class_name = entry_point.split(":", 1)
+            parser_cls = getattr(importlib.import_module(module_name), class_name)
+            instance = parser_cls()
+            self._instances[entry_point] = instance
+            logger.info(f"Loaded parser {class_name} for extensions {instance.supported_extensions}")
+        return instance
+
+    def _discover_plugins(self):
+        """扫描插件目录中未登记到清单的模块，把其中的解析器加入清单"""
+        self._discovered = True
+        listed_modules = {ep.split(":", 1)[0] for ep in self._entry_points.values()}
+        pkg_path = os.path.dirname(__file__)
+
+        for _, name, _ in pkgutil.iter_modules([pkg_path]):
+            module_name = f"{__package__}.{name}"
+            if name in _NON_PLUGIN_MODULES or module_name in listed_modules:
+                continue
+            try:
+                module = importlib.import_module(module_name)
+                for attr_name in dir(module):
+                    attr = getattr(module, attr_name)
+                    if (isinstance(attr, type) and
+                        issubclass(attr, BaseParser) and
+                        attr is not BaseParser and
+                        attr.__module__ == module_name):
+
+                        entry_point = f"{module_name}:{attr_name}"
+                        for ext in self._load(entry_point).supported_extensions:
+                            self._entry_points.setdefault(ext.lower(), entry_point)
+                            logger.info(f"Registered parser {attr_name} for extension {ext}")
+            except Exception as e:
+                logger.error(f"Failed to load parser plugin {name}: {e}")
+
+
+parser_registry = ParserRegistry()
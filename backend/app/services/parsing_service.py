@@ -2,22 +2,76 @@ import re
 import yaml
 import os
 import json
+import hashlib
 import logging
-import importlib
-import pkgutil
+import random
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
 from typing import List, Dict, Optional, Type
+from sqlalchemy import case, insert
 from sqlalchemy.orm import Session
 from .. import models, schemas
-from ..models import OntologyPackage, OntologyFile, ParsingTemplate, OntologyEntity, OntologyRelation
-from .parsers.base import BaseParser
+from ..models import OntologyPackage, OntologyFile, ParsingTemplate, OntologyEntity, OntologyRelation, ParseReport, CrossSeriesLink, GraphStats, EntityAttribute
+from .parse_profiler import ParseProfiler
+from .name_index import NameIndex, metadata_aliases
+from .cross_series import SERIES_SEPARATOR, CrossSeriesResolver, cross_series_resolver, split_reference
+from ..core.events import dispatcher
+from ..core.results import ServiceResult, ServiceStatus
+from ..core.errors import BusinessCode
+from .parsers.registry import ParserRegistry, parser_registry
+from .graph_cache import GraphCache
+from .graph_stats import compute_graph_stats
+from .search_service import flatten_metadata_text
+from .entity_listing import metadata_attributes
 
 logger = logging.getLogger(__name__)
 
+# SQLite 同一时刻只允许一个写者：进程内的解析 (上传/重解析后台任务与批量重解析) 在此锁下依次执行，
+# 避免两个解析的写事务相互等待直至超时。同一包的并发解析在任何数据库上都由代次分配保证互不干扰，见 _prepare_generation
+_sqlite_parse_lock = threading.Lock()
+
+
+def parse_write_lock(db: Session):
+    """解析写入期间持有的进程级锁；服务端数据库允许并发写入，不加锁"""
+    return _sqlite_parse_lock if db.get_bind().dialect.name == "sqlite" else nullcontext()
+
+
+class _ChunkedWriter:
+    """
+    累积待写入的行，每满一块即通过 ``ParsingService._bulk_insert`` 写出并提交。
+    行属于尚未发布的代次，读者按 current_generation 过滤看不到它们；逐块提交使写锁只在单块写入期间持有。
+    """
+
+    def __init__(self, service: "ParsingService", model, chunk_size: int):
+        self._service = service
+        self._model = model
+        self._chunk_size = max(1, chunk_size)
+        self._rows: List[dict] = []
+        self.total = 0
+
+    def add(self, row: dict):
+        self._rows.append(row)
+        if len(self._rows) >= self._chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            self._service._bulk_insert(self._model, self._rows)
+            self._service._commit_chunk()
+            self.total += len(self._rows)
+            self._rows = []
+
+
 class ParsingService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, registry: Optional[ParserRegistry] = None,
+                 cross_resolver: Optional[CrossSeriesResolver] = None):
         self.db = db
-        self._parsers: Dict[str, BaseParser] = {}
-        self._register_parsers()
+        # 解析器注册表在进程内共享，构造服务不再扫描和导入插件
+        self._registry = registry or parser_registry
+        # 跨系列名称索引同样进程内共享，按目标系列的启用版本缓存
+        self._cross_resolver = cross_resolver or cross_series_resolver
 
     @property
     def storage_dir(self) -> str:
@@ -25,37 +79,10 @@ class ParsingService:
         from ..config import settings
         return settings.STORAGE_DIR
 
-    def _register_parsers(self):
+    def parse_package(self, package_id: str, template_id: str, profile: Optional[bool] = None):
         """
-        自动发现并注册 app/services/parsers 目录下的解析器插件
+        解析本体包。profile 为 True 时记录逐文件耗时剖析报告 (None 表示沿用 PARSE_PROFILING_ENABLED)。
         """
-        try:
-            import app.services.parsers as pars_pkg
-            pkg_path = os.path.dirname(pars_pkg.__file__)
-            
-            for _, name, _ in pkgutil.iter_modules([pkg_path]):
-                if name == 'base': continue
-                
-                try:
-                    module_name = f"app.services.parsers.{name}"
-                    module = importlib.import_module(module_name)
-                    
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if (isinstance(attr, type) and 
-                            issubclass(attr, BaseParser) and 
-                            attr is not BaseParser):
-                            
-                            parser_instance = attr()
-                            for ext in parser_instance.supported_extensions:
-                                self._parsers[ext.lower()] = parser_instance
-                                logger.info(f"Registered parser {attr.__name__} for extension {ext}")
-                except Exception as e:
-                    logger.error(f"Failed to load parser plugin {name}: {e}")
-        except Exception as e:
-            logger.error(f"ParsingService initialization failed: {e}")
-
-    def parse_package(self, package_id: str, template_id: str):
         logger.info(f"Starting plugin-based parsing for package {package_id} with template {template_id}")
         
         package = self.db.query(OntologyPackage).filter(OntologyPackage.id == package_id).first()
@@ -65,104 +92,446 @@ class ParsingService:
             logger.error("Package or Template not found")
             return
             
-        self._clear_existing_data(package_id)
-        
         try:
             rules = json.loads(template.rules)
         except json.JSONDecodeError:
             logger.error("Invalid JSON rules in template")
             return
 
+        # 影子写入：新结果落在新的代次上，解析期间读者仍看到旧代次的完整图谱
+        from ..config import settings
+        profiler = ParseProfiler() if (settings.PARSE_PROFILING_ENABLED if profile is None else profile) else None
+
+        with parse_write_lock(self.db):
+            # 等锁期间其他解析可能已切换代次，以库中最新的指针为准
+            self.db.refresh(package)
+            generation = self._prepare_generation(package)
+            try:
+                if profiler:
+                    with profiler.activate():
+                        published = self._parse_into_generation(package, rules, generation, profiler)
+                else:
+                    published = self._parse_into_generation(package, rules, generation)
+            except Exception:
+                self.db.rollback()
+                self._discard_generation(package_id, generation)
+                if self._is_superseded(package_id, generation):
+                    # 更新的解析已回收了本代次的行，随之产生的写入错误不算失败
+                    logger.info(f"Parsing package {package_id} into generation {generation} superseded by a newer parse")
+                    return
+                logger.error(f"Parsing package {package_id} failed, generation {package.current_generation} kept")
+                raise
+
+            if not published:
+                self._discard_generation(package_id, generation)
+                logger.info(f"Parsing package {package_id} into generation {generation} superseded by a newer parse")
+                return
+            self._collect_garbage(package_id, generation)
+        # 启用版本的新图谱可见后，通知其他系列重算指向本系列的跨系列关系
+        dispatcher.dispatch("ontology.parsed", {
+            "code": package.series_code,
+            "package_id": package_id,
+            "version": package.version,
+            "generation": generation,
+            "is_active": bool(package.is_active)
+        })
+
+    def _parse_into_generation(self, package: OntologyPackage, rules: dict, generation: int,
+                               profiler: Optional[ParseProfiler] = None) -> bool:
+        """
+        流式解析管道：插件逐条产出的实体记录按块写库，待解析的链接溢写到临时文件，
+        内存中只保留名称解析索引，全部实体落库后再回放链接完成关系解析。
+        返回是否发布了新代次；期间同一包开始了更新的解析时不发布，返回 False。
+        同名实体与无法解析的链接记录为对应文件的告警。
+        名称索引中登记的是实体的稳定标识，行主键由 (包, 代次, 稳定标识) 确定性派生，无需额外的映射表。
+        形如 [[core:Customer]] 的链接在包内无法解析时，按系列编码前缀解析到该系列的启用版本，
+        结果写入跨系列关系表 (目标暂不存在时也保留，待目标系列变化后增量重算)。
+        """
+        from ..config import settings
+        package_id = package.id
+
         entity_rules = rules.get("entity", {})
-        name_to_id_map = {} 
+        name_index = NameIndex()
+        used_stable_ids = set()
+        warnings_by_file: Dict[str, List[str]] = {}
         base_dir = os.path.join(self.storage_dir, package_id)
-        files = self.db.query(OntologyFile).filter(OntologyFile.package_id == package_id).all()
-        
-        entities_to_add = []
-        relations_to_add = []
-        parsed_results = [] 
+        # 按路径排序，保证重名实体“先出现者为准”的结果可复现
+        files = self.db.query(OntologyFile).filter(OntologyFile.package_id == package_id).order_by(OntologyFile.file_path).all()
 
-        for file_record in files:
-            full_path = os.path.join(base_dir, file_record.file_path)
-            if not os.path.exists(full_path):
-                logger.warning(f"File not found: {full_path}")
-                continue
-            
-            ext = os.path.splitext(file_record.file_path)[1].lower()
-            parser = self._parsers.get(ext)
-            
-            if not parser:
-                continue
-                
-            try:
-                with open(full_path, 'r', encoding='utf-8-sig') as f:
-                    content = f.read()
-                
-                # 插件现在返回实体记录列表 [{'metadata': ..., 'links': ..., 'name': ...}, ...]
-                parsed_entities = parser.parse(file_record, content, rules)
-                
-                for record in parsed_entities:
-                    metadata = record.get("metadata", {})
-                    links = record.get("links", [])
-                    
-                    # 确定实体名称：插件显式指定优先，否则用核心规则提取
-                    entity_name = record.get("name") or self._extract_entity_name(file_record, metadata, entity_rules)
-                    entity_category = record.get("category") or self._extract_category(file_record, metadata, entity_rules)
-                    
-                    entity = OntologyEntity(
-                        package_id=package_id,
-                        name=entity_name,
-                        category=entity_category,
-                        metadata_json=json.dumps(metadata, ensure_ascii=False),
-                        file_path=file_record.file_path
-                    )
-                    entity.id = models.generate_uuid()
-                    
-                    entities_to_add.append(entity)
-                    name_to_id_map[entity_name] = entity.id
-                    
-                    parsed_results.append({
-                        "entity_id": entity.id,
-                        "links": links
+        entity_writer = _ChunkedWriter(self, OntologyEntity, settings.PARSE_WRITE_CHUNK_SIZE)
+        relation_writer = _ChunkedWriter(self, OntologyRelation, settings.PARSE_WRITE_CHUNK_SIZE)
+        cross_writer = _ChunkedWriter(self, CrossSeriesLink, settings.PARSE_WRITE_CHUNK_SIZE)
+        attribute_writer = _ChunkedWriter(self, EntityAttribute, settings.PARSE_WRITE_CHUNK_SIZE)
+        series_codes = None
+
+        with tempfile.SpooledTemporaryFile(max_size=settings.PARSE_LINK_SPOOL_BYTES, mode="w+", encoding="utf-8") as pending_links:
+            for file_record in files:
+                full_path = os.path.join(base_dir, file_record.file_path)
+                if not os.path.exists(full_path):
+                    logger.warning(f"File not found: {full_path}")
+                    continue
+
+                ext = os.path.splitext(file_record.file_path)[1].lower()
+                parser = self._registry.get(ext)
+
+                if not parser:
+                    continue
+
+                file_warnings = []
+                if profiler:
+                    profiler.begin_file(file_record.file_path, parser.__class__.__name__)
+                try:
+                    # 插件返回实体记录的列表或生成器 [{'metadata': ..., 'links': ..., 'name': ...}, ...]
+                    # 由插件自行决定整体读入还是流式读取文件
+                    if profiler:
+                        records = profiler.iterate(lambda: parser.parse_file(file_record, full_path, rules))
+                    else:
+                        records = parser.parse_file(file_record, full_path, rules)
+                    for record in records:
+                        metadata = record.get("metadata", {})
+                        links = record.get("links", [])
+                        file_warnings.extend(record.get("warnings", []))
+
+                        entity_name, entity_category = self._identify_entity(record, file_record, entity_rules)
+
+                        # 预先派生主键，实体以纯字典行的形式分块写入
+                        stable_id = self._allocate_stable_id(used_stable_ids, package.series_code, entity_category,
+                                                             entity_name, file_record.file_path)
+                        metadata_json = json.dumps(metadata, ensure_ascii=False)
+                        entity_id = self._row_id(package_id, generation, stable_id)
+                        entity_writer.add({
+                            "id": entity_id,
+                            "package_id": package_id,
+                            "name": entity_name,
+                            "category": entity_category,
+                            "metadata_json": metadata_json,
+                            "file_path": file_record.file_path,
+                            "generation": generation,
+                            "stable_id": stable_id,
+                            "metadata_hash": hashlib.sha1(metadata_json.encode("utf-8")).hexdigest(),
+                            # 检索列写入后由触发器同步到全文索引
+                            "metadata_text": flatten_metadata_text(metadata),
+                            "body": (record.get("body") or "")[:settings.SEARCH_BODY_MAX_CHARS] or None
+                        })
+                        for key, value in metadata_attributes(metadata, settings.ATTRIBUTE_VALUE_MAX_CHARS):
+                            attribute_writer.add({
+                                "package_id": package_id, "generation": generation,
+                                "entity_id": entity_id, "key": key, "value": value
+                            })
+                        first_source = name_index.add(entity_name, stable_id, file_record.file_path, metadata_aliases(metadata))
+                        if first_source is not None:
+                            file_warnings.append(f"实体名称 '{entity_name}' 与 {first_source} 中的实体重复，关系解析以先出现者为准")
+
+                        if links:
+                            pending_links.write(json.dumps([stable_id, file_record.file_path, links], ensure_ascii=False))
+                            pending_links.write("\n")
+                except Exception as e:
+                    logger.error(f"Error parsing file {file_record.file_path} with {parser.__class__.__name__}: {e}")
+                    file_warnings.append(f"解析失败: {e}")
+                    if profiler:
+                        profiler.record_error(str(e))
+
+                warnings_by_file[file_record.file_path] = file_warnings
+
+            entity_writer.flush()
+            attribute_writer.flush()
+
+            # 回放溢写的链接，统一构建关系；同一 (来源, 类型, 目标) 只写一条 (例如别名与原名指向同一实体)
+            unresolved: Dict[str, Dict[str, None]] = {}
+            written_relations = set()
+            pending_links.seek(0)
+            for line in pending_links:
+                source_key, source_file, links = json.loads(line)
+                source_id = self._row_id(package_id, generation, source_key)
+                for link in links:
+                    target_name, relation_type = self._normalize_link(link)
+                    target_key = name_index.resolve(target_name)
+                    if target_key is None and SERIES_SEPARATOR in target_name:
+                        if series_codes is None:
+                            series_codes = self._cross_resolver.series_codes(self.db)
+                        reference = split_reference(target_name, series_codes)
+                        if reference and reference[0] == package.series_code:
+                            target_key = name_index.resolve(reference[1])
+                        elif reference:
+                            code, name = reference
+                            target_package_id, target_entity_id = self._cross_resolver.resolve(self.db, code, name)
+                            cross_writer.add({
+                                "id": models.generate_uuid(),
+                                "package_id": package_id,
+                                "generation": generation,
+                                "source_id": source_id,
+                                "relation_type": relation_type,
+                                "target_series_code": code,
+                                "target_name": name,
+                                "target_package_id": target_package_id,
+                                "target_entity_id": target_entity_id
+                            })
+                            continue
+                    if target_key is None:
+                        if target_name:
+                            unresolved.setdefault(source_file, {})[target_name] = None
+                        continue
+                    if source_key == target_key:
+                        continue
+
+                    relation_stable_id = models.stable_uuid(source_key, relation_type, target_key)
+                    if relation_stable_id in written_relations:
+                        continue
+                    written_relations.add(relation_stable_id)
+                    relation_writer.add({
+                        "id": self._row_id(package_id, generation, relation_stable_id),
+                        "package_id": package_id,
+                        "source_id": source_id,
+                        "target_id": self._row_id(package_id, generation, target_key),
+                        "relation_type": relation_type,
+                        "generation": generation,
+                        "stable_id": relation_stable_id
                     })
-            except Exception as e:
-                logger.error(f"Error parsing file {file_record.file_path} with {parser.__class__.__name__}: {e}")
 
-        # 批量写入实体
-        self.db.add_all(entities_to_add)
-        self.db.flush()
-        
-        # 统一处理关系构建
-        for result in parsed_results:
-            source_id = result["entity_id"]
-            for target_name in result["links"]:
-                target_name = target_name.strip()
-                if target_name in name_to_id_map:
-                    target_id = name_to_id_map[target_name]
-                    if source_id == target_id: continue
-                        
-                    rel = OntologyRelation(
-                        package_id=package_id,
-                        source_id=source_id,
-                        target_id=target_id,
-                        relation_type="related_to"
-                    )
-                    relations_to_add.append(rel)
-
-        self.db.add_all(relations_to_add)
-        
+        relation_writer.flush()
+        cross_writer.flush()
+
+        # 统计只读取新代次，在最终的写事务之前算好
+        stats = self._compute_graph_stats(package, generation)
+
+        for source_file, targets in unresolved.items():
+            warnings_by_file.setdefault(source_file, []).append(self._unresolved_warning(list(targets)))
+        for file_record in files:
+            if file_record.file_path in warnings_by_file:
+                file_warnings = warnings_by_file[file_record.file_path]
+                file_record.parse_warnings = json.dumps(file_warnings, ensure_ascii=False) if file_warnings else None
+
+        if profiler:
+            self._save_parse_report(package_id, generation, profiler, relation_writer.total)
+        self._save_graph_stats(package.id, generation, stats)
+
+        # 新代次的行已逐块提交；文件告警、统计与指针切换在一个短事务内提交，读者要么看到旧图谱要么看到新图谱。
+        # 只有仍持有最新分配代次的解析才切换指针，之后开始的解析胜出
+        published = self.db.query(OntologyPackage).filter(
+            OntologyPackage.id == package.id, OntologyPackage.allocated_generation == generation
+        ).update({OntologyPackage.current_generation: generation}, synchronize_session=False)
+        if not published:
+            self.db.rollback()
+            return False
+        self.db.commit()
+        logger.info(f"Successfully parsed {entity_writer.total} entities, {relation_writer.total} relations "
+                    f"and {cross_writer.total} cross-series links into generation {generation}.")
+        return True
+
+    def dry_run(self, package_id: str, req: schemas.TemplateDryRunRequest) -> ServiceResult[schemas.TemplateDryRunResponse]:
+        """
+        模板试运行：在内存中用候选规则解析包内的抽样/指定文件，返回抽取结果与耗时，不读写实体表。
+        规则优先取请求中的 rules，其次 template_id，最后回退到包当前关联的模板。
+        """
+        started = time.perf_counter()
+        package = self.db.query(OntologyPackage).filter(OntologyPackage.id == package_id).first()
+        if not package:
+            return ServiceResult.failure_result(
+                ServiceStatus.NOT_FOUND, f"Package '{package_id}' not found", business_code=BusinessCode.ONTOLOGY_NOT_FOUND
+            )
+
+        rules_text = req.rules
+        if rules_text is None:
+            template_id = req.template_id or package.template_id
+            template = self.db.query(ParsingTemplate).filter(ParsingTemplate.id == template_id).first() if template_id else None
+            if not template:
+                return ServiceResult.failure_result(
+                    ServiceStatus.NOT_FOUND, "Parsing template not found", business_code=BusinessCode.TEMPLATE_NOT_FOUND
+                )
+            rules_text = template.rules
         try:
-            self.db.commit()
-            logger.info(f"Successfully parsed {len(entities_to_add)} entities and {len(relations_to_add)} relations.")
+            rules = json.loads(rules_text)
+        except json.JSONDecodeError as e:
+            return ServiceResult.failure_result(ServiceStatus.BAD_REQUEST, f"Invalid rules JSON: {e}")
+        if not isinstance(rules, dict):
+            return ServiceResult.failure_result(ServiceStatus.BAD_REQUEST, "Rules JSON must be an object")
+
+        files = self.db.query(OntologyFile).filter(OntologyFile.package_id == package_id).order_by(OntologyFile.file_path).all()
+        if req.file_paths:
+            by_path = {f.file_path: f for f in files}
+            missing = [p for p in req.file_paths if p not in by_path]
+            if missing:
+                return ServiceResult.failure_result(ServiceStatus.BAD_REQUEST, f"Files not found in package: {', '.join(missing)}")
+            selected = [by_path[p] for p in dict.fromkeys(req.file_paths)]
+        else:
+            parseable = [f for f in files if self._registry.get(os.path.splitext(f.file_path)[1].lower())]
+            rng = random.Random(req.seed)
+            selected = rng.sample(parseable, min(req.sample_size, len(parseable)))
+
+        entity_rules = rules.get("entity", {})
+        base_dir = os.path.join(self.storage_dir, package_id)
+        profiler = ParseProfiler()
+        results = []
+        with profiler.activate():
+            for file_record in selected:
+                results.append(self._dry_run_file(file_record, base_dir, rules, entity_rules, profiler, req.max_entities_per_file))
+
+        return ServiceResult.success_result(schemas.TemplateDryRunResponse(
+            total_files=len(files),
+            sampled_files=len(selected),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+            files=results
+        ))
+
+    def _dry_run_file(self, file_record: OntologyFile, base_dir: str, rules: dict, entity_rules: dict,
+                      profiler: ParseProfiler, max_entities: int) -> dict:
+        ext = os.path.splitext(file_record.file_path)[1].lower()
+        parser = self._registry.get(ext)
+        full_path = os.path.join(base_dir, file_record.file_path)
+        if not parser or not os.path.exists(full_path):
+            return {
+                "file_path": file_record.file_path,
+                "error": "No parser registered for this extension" if not parser else "File missing from storage"
+            }
+
+        profile = profiler.begin_file(file_record.file_path, parser.__class__.__name__)
+        entities, warnings, error = [], [], None
+        try:
+            for record in profiler.iterate(lambda: parser.parse_file(file_record, full_path, rules)):
+                warnings.extend(record.get("warnings", []))
+                if len(entities) >= max_entities:
+                    continue
+                name, category = self._identify_entity(record, file_record, entity_rules)
+                entities.append({
+                    "name": name,
+                    "category": category,
+                    "metadata": record.get("metadata", {}),
+                    "links": [
+                        {"target": target, "type": relation_type}
+                        for target, relation_type in map(self._normalize_link, record.get("links", []))
+                    ]
+                })
         except Exception as e:
-            self.db.rollback()
-            logger.error(f"Failed to commit parsed data: {e}")
-            raise
+            error = str(e)
+            profiler.record_error(error)
 
-    def _clear_existing_data(self, package_id: str):
-        self.db.query(OntologyRelation).filter(OntologyRelation.package_id == package_id).delete()
-        self.db.query(OntologyEntity).filter(OntologyEntity.package_id == package_id).delete()
+        return {**profile.to_dict(), "entities": entities, "warnings": warnings, "error": error}
+
+    def _save_parse_report(self, package_id: str, generation: int, profiler: ParseProfiler, relation_count: int):
+        """每个包只保留最近一次剖析报告，随新代次一并提交"""
+        report = profiler.to_report()
+        self.db.query(ParseReport).filter(ParseReport.package_id == package_id).delete(synchronize_session=False)
+        self.db.add(ParseReport(
+            package_id=package_id,
+            generation=generation,
+            total_ms=report["total_ms"],
+            file_count=report["file_count"],
+            entity_count=report["entity_count"],
+            relation_count=relation_count,
+            report_json=json.dumps(report, ensure_ascii=False)
+        ))
+
+    def _compute_graph_stats(self, package: OntologyPackage, generation: int) -> dict:
+        """基于新代次计算图谱统计"""
+        from ..config import settings
+        graph = GraphCache.load(self.db, package.id, package.series_code, generation)
+        return compute_graph_stats(graph, settings.GRAPH_STATS_TOP_N)
+
+    def _save_graph_stats(self, package_id: str, generation: int, stats: dict):
+        """与代次切换同一事务提交；每个包只保留最近一次"""
+        self.db.query(GraphStats).filter(GraphStats.package_id == package_id).delete(synchronize_session=False)
+        self.db.add(GraphStats(
+            package_id=package_id,
+            generation=generation,
+            node_count=stats["node_count"],
+            edge_count=stats["edge_count"],
+            component_count=stats["component_count"],
+            orphan_count=stats["orphan_count"],
+            stats_json=json.dumps(stats, ensure_ascii=False)
+        ))
+
+    def _bulk_insert(self, model, rows: List[dict]):
+        """执行一次 Core insert executemany，绕过 ORM unit-of-work"""
+        if rows:
+            self.db.execute(insert(model.__table__), rows)
+
+    def _commit_chunk(self):
+        """
+        提交一块已写入的新代次行。这些行经 Core 写入、不在会话中，
+        提交时不使已加载的包与文件对象过期，避免其后逐个重新查询。
+        """
+        expire_on_commit = self.db.expire_on_commit
+        self.db.expire_on_commit = False
+        try:
+            self.db.commit()
+        finally:
+            self.db.expire_on_commit = expire_on_commit
+
+    def _prepare_generation(self, package: OntologyPackage) -> int:
+        """
+        分配新的解析代次。
+        在包行上原子递增已分配代次 (单条 UPDATE 持有行锁)，同一包的并发解析在任何数据库上都得到不同的代次，
+        各自的行主键互不冲突，也不会清理对方正在写入的行。分配值只增不减，新代次通常没有残留；
+        旧库升级前中途退出的解析可能留下同号的行，一并清理。
+        """
+        allocated, current = OntologyPackage.allocated_generation, OntologyPackage.current_generation
+        self.db.query(OntologyPackage).filter(OntologyPackage.id == package.id).update(
+            {allocated: case((allocated > current, allocated), else_=current) + 1}, synchronize_session=False
+        )
+        generation = self.db.query(allocated).filter(OntologyPackage.id == package.id).scalar()
+        self._delete_generations(package.id, lambda column: column == generation)
         self.db.commit()
+        return generation
+
+    def _is_superseded(self, package_id: str, generation: int) -> bool:
+        """同一包在本代次之后又分配了代次，即有更新的解析开始"""
+        allocated = self.db.query(OntologyPackage.allocated_generation).filter(OntologyPackage.id == package_id).scalar()
+        return (allocated or 0) > generation
+
+    def _discard_generation(self, package_id: str, generation: int):
+        """解析失败时丢弃未切换的半成品代次，旧代次保持可见"""
+        self._delete_generations(package_id, lambda column: column == generation)
+        self.db.commit()
+
+    def _collect_garbage(self, package_id: str, keep_generation: int):
+        """指针切换后回收旧代次 (含被取代或中途退出的解析留下的行)；更高的代次属于仍在进行的解析，保留"""
+        self._delete_generations(package_id, lambda column: column < keep_generation)
+        self.db.commit()
+
+    def _delete_generations(self, package_id: str, matches):
+        """matches 接收代次列并返回过滤条件；先删引用实体的关系再删实体，避免外键悬挂"""
+        for model in (CrossSeriesLink, OntologyRelation, EntityAttribute, OntologyEntity):
+            self.db.query(model).filter(model.package_id == package_id, matches(model.generation)).delete(synchronize_session=False)
+
+    @staticmethod
+    def _allocate_stable_id(used: set, series_code: str, category: Optional[str], name: str, file_path: str) -> str:
+        """
+        稳定标识取 系列编码+类别+名称+来源文件 的 UUIDv5，同一实体在各版本、各次解析中保持不变。
+        标识只由实体自身决定，其他文件中新增或删除同名实体不会改变它；同一文件内的重复实体按出现顺序追加序号。
+        """
+        base = (series_code or "", category or "", name, file_path)
+        stable_id = models.stable_uuid(*base)
+        ordinal = 1
+        while stable_id in used:
+            ordinal += 1
+            stable_id = models.stable_uuid(*base, str(ordinal))
+        used.add(stable_id)
+        return stable_id
+
+    @staticmethod
+    def _row_id(package_id: str, generation: int, stable_id: str) -> str:
+        # 实体与关系行共用：新旧代次在影子写入期间共存于同一张表，行主键需包含代次
+        return models.stable_uuid(package_id, str(generation), stable_id)
+
+    def _identify_entity(self, record: dict, file_record: OntologyFile, entity_rules: dict):
+        """确定实体名称与类别：插件显式指定优先，否则用核心规则提取"""
+        metadata = record.get("metadata", {})
+        name = record.get("name") or self._extract_entity_name(file_record, metadata, entity_rules)
+        category = record.get("category") or self._extract_category(file_record, metadata, entity_rules)
+        return name, category
+
+    @staticmethod
+    def _unresolved_warning(targets: List[str], limit: int = 20) -> str:
+        shown = ", ".join(targets[:limit])
+        more = f" 等 {len(targets)} 个" if len(targets) > limit else ""
+        return f"未能解析的链接目标: {shown}{more}"
+
+    @staticmethod
+    def _normalize_link(link) -> tuple:
+        """插件可返回纯名称或 {"target": ..., "type": ...} 形式的类型化关系，统一为 (目标名称, 关系类型)"""
+        if isinstance(link, dict):
+            return (link.get("target") or "").strip(), link.get("type") or "related_to"
+        return link.strip(), "related_to"
 
     def _extract_entity_name(self, file_record: OntologyFile, metadata: dict, rules: dict) -> str:
         strategy = rules.get("name_source", "filename_no_ext")
@@ -0,0 +1,204 @@
+import itertools
+import logging
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 优先级：数值越小越先执行，启用中的版本优先
+PRIORITY_ACTIVE = 0
+PRIORITY_INACTIVE = 1
+
+
+def _run_parse(package_id: str, template_id: str):
+    """默认执行器：每个任务使用独立 Session 解析，异常向上抛出以记录失败"""
+    from ..database import SessionLocal
+    from .parsing_service import ParsingService
+    db = SessionLocal()
+    try:
+        ParsingService(db).parse_package(package_id, template_id)
+    finally:
+        db.close()
+
+
+class ReparseJob:
+    __slots__ = ("package_id", "template_id", "priority", "status", "error")
+
+    def __init__(self, package_id: str, template_id: str, priority: int):
+        self.package_id = package_id
+        self.template_id = template_id
+        self.priority = priority
+        self.status = "queued"  # queued / running / succeeded / failed
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "package_id": self.package_id,
+            "template_id": self.template_id,
+            "priority": self.priority,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class ReparseBatch:
+    """一次批量重解析请求，聚合其下所有任务的进度"""
+
+    def __init__(self, jobs: List[ReparseJob], deduplicated: int):
+        self.id = str(uuid.uuid4())
+        self.created_at = datetime.utcnow()
+        self.jobs = jobs
+        self.deduplicated = deduplicated
+        self._done = threading.Event()
+
+    def progress(self) -> dict:
+        counts = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        for job in self.jobs:
+            counts[job.status] += 1
+        finished = counts["succeeded"] + counts["failed"]
+        return {
+            "batch_id": self.id,
+            "created_at": self.created_at,
+            "total": len(self.jobs),
+            "deduplicated": self.deduplicated,
+            "finished": finished,
+            "done": finished == len(self.jobs),
+            **counts,
+            "jobs": [job.to_dict() for job in self.jobs],
+        }
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def _check_done(self):
+        if all(job.status in ("succeeded", "failed") for job in self.jobs):
+            self._done.set()
+
+
+class ReparseScheduler:
+    """
+    批量重解析调度器
+
+    任务按优先级进入有界线程池执行：
+    - 同一本体包已在排队的任务会被复用 (模板以最新请求为准)，不会重复解析；
+      正在执行的任务可能读到旧模板，因此新请求仍会排队。
+    - 同一本体包同一时刻只运行一个任务，避免并发写入解析代次。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 runner: Callable[[str, str], None] = _run_parse, history_size: int = 100):
+        self._max_workers = max_workers
+        self._runner = runner
+        self._history_size = history_size
+        self._queue: "queue.PriorityQueue[Tuple[int, int, Optional[ReparseJob]]]" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._queued: Dict[str, ReparseJob] = {}
+        self._running: Set[str] = set()
+        self._deferred: Dict[str, List[ReparseJob]] = {}
+        self._job_batches: Dict[int, List[ReparseBatch]] = {}
+        self._batches: "OrderedDict[str, ReparseBatch]" = OrderedDict()
+        self._workers: List[threading.Thread] = []
+
+    @property
+    def max_workers(self) -> int:
+        if self._max_workers is None:
+            from ..config import settings
+            return max(1, settings.REPARSE_MAX_WORKERS)
+        return self._max_workers
+
+    def submit(self, targets: Iterable[Tuple[str, str, bool]]) -> ReparseBatch:
+        """提交 (package_id, template_id, is_active) 列表，返回可查询进度的批次"""
+        jobs: List[ReparseJob] = []
+        deduplicated = 0
+        with self._lock:
+            for package_id, template_id, is_active in targets:
+                priority = PRIORITY_ACTIVE if is_active else PRIORITY_INACTIVE
+                job = self._queued.get(package_id)
+                if job is not None:
+                    job.template_id = template_id
+                    if priority < job.priority:
+                        # 提升优先级：重新入队，旧条目出队时会被忽略
+                        job.priority = priority
+                        self._queue.put((priority, next(self._seq), job))
+                    deduplicated += 1
+                else:
+                    job = ReparseJob(package_id, template_id, priority)
+                    self._queued[package_id] = job
+                    self._queue.put((priority, next(self._seq), job))
+                if job not in jobs:
+                    jobs.append(job)
+
+            batch = ReparseBatch(jobs, deduplicated)
+            for job in jobs:
+                self._job_batches.setdefault(id(job), []).append(batch)
+            self._batches[batch.id] = batch
+            while len(self._batches) > self._history_size:
+                self._batches.popitem(last=False)
+            batch._check_done()
+            self._ensure_workers()
+        logger.info(f"Reparse batch {batch.id} submitted: {len(jobs)} jobs, {deduplicated} deduplicated")
+        return batch
+
+    def get_batch(self, batch_id: str) -> Optional[ReparseBatch]:
+        with self._lock:
+            return self._batches.get(batch_id)
+
+    def _ensure_workers(self):
+        self._workers = [w for w in self._workers if w.is_alive()]
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, name=f"reparse-worker-{len(self._workers)}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            with self._lock:
+                if job is None or job.status != "queued" or self._queued.get(job.package_id) is not job:
+                    continue  # 已被提升优先级重新入队的旧条目
+                if job.package_id in self._running:
+                    # 同一包的上一个任务尚未结束，推迟到其完成后再入队
+                    self._deferred.setdefault(job.package_id, []).append(job)
+                    del self._queued[job.package_id]
+                    continue
+                del self._queued[job.package_id]
+                self._running.add(job.package_id)
+                job.status = "running"
+
+            try:
+                self._runner(job.package_id, job.template_id)
+                status, error = "succeeded", None
+            except Exception as e:
+                logger.error(f"Reparse of package {job.package_id} failed: {e}")
+                status, error = "failed", str(e)
+
+            with self._lock:
+                job.status, job.error = status, error
+                self._running.discard(job.package_id)
+                for deferred in self._deferred.pop(job.package_id, []):
+                    queued = self._queued.get(deferred.package_id)
+                    if queued is None:
+                        self._queued[deferred.package_id] = deferred
+                        self._queue.put((deferred.priority, next(self._seq), deferred))
+                    else:
+                        # 推迟期间同一包又有新请求：合并到已排队任务
+                        self._merge_batches(deferred, queued)
+                for batch in self._job_batches.pop(id(job), []):
+                    batch._check_done()
+
+    def _merge_batches(self, source: ReparseJob, target: ReparseJob):
+        target_batches = self._job_batches.setdefault(id(target), [])
+        for batch in self._job_batches.pop(id(source), []):
+            if target in batch.jobs:
+                batch.jobs = [j for j in batch.jobs if j is not source]
+            else:
+                batch.jobs = [target if j is source else j for j in batch.jobs]
+                target_batches.append(batch)
+
+
+reparse_scheduler = ReparseScheduler()
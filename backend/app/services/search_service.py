@@ -0,0 +1,66 @@
+import logging
+from typing import Any, List, Optional
+
+from ..repositories.search_repo import SearchRepository
+from ..core.results import ServiceResult, ServiceStatus
+from .. import schemas
+
+logger = logging.getLogger(__name__)
+
+# 单次检索最多使用的词数
+MAX_QUERY_TERMS = 16
+
+
+def flatten_metadata_text(metadata: Any) -> Optional[str]:
+    """把元数据中的取值 (不含键名) 递归拼接为检索文本"""
+    values: List[str] = []
+
+    def walk(value):
+        if isinstance(value, dict):
+            for item in value.values():
+                walk(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                walk(item)
+        elif value is not None and not isinstance(value, bool):
+            text = str(value).strip()
+            if text:
+                values.append(text)
+
+    walk(metadata)
+    return "\n".join(values) or None
+
+
+class SearchService:
+    def __init__(self, search_repo: SearchRepository):
+        self.search_repo = search_repo
+
+    def search_entities(self, q: str, series_code: Optional[str] = None,
+                        package_id: Optional[str] = None, category: Optional[str] = None,
+                        active_only: bool = True, skip: int = 0,
+                        limit: int = 20) -> ServiceResult[schemas.PaginatedSearchResponse]:
+        """
+        检索实体名称、类别、元数据取值与 Markdown 正文。
+        查询按空白拆分为多个词 (同时命中)，每个词按子串匹配；
+        默认只检索各系列的启用版本，指定 package_id 时检索该版本。
+        """
+        terms = q.split()[:MAX_QUERY_TERMS]
+        if not terms:
+            return ServiceResult.failure_result(ServiceStatus.BAD_REQUEST, "Search query must contain at least one term")
+        rows, total = self.search_repo.search_entities(
+            terms, series_code, package_id, category, active_only, skip, limit
+        )
+        return ServiceResult.success_result(schemas.PaginatedSearchResponse(
+            items=[
+                schemas.SearchHit(
+                    **schemas.OntologyEntityResponse.model_validate(entity).model_dump(),
+                    series_code=series_code_,
+                    version=version,
+                    score=score,
+                    snippet=snippet
+                )
+                for entity, series_code_, version, score, snippet in rows
+            ],
+            total=total,
+            backend=self.search_repo.backend.name
+        ))
@@ -1,3 +1,4 @@
+from typing import Optional
 from sqlalchemy.orm import Session
 from .database import SessionLocal
 from .services.parsing_service import ParsingService
@@ -5,7 +6,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def parse_ontology_task(package_id: str, template_id: str, db: Session = None):
+def parse_ontology_task(package_id: str, template_id: str, db: Session = None, profile: Optional[bool] = None):
     """
     Background task to parse an ontology.
     """
@@ -16,7 +17,7 @@ def parse_ontology_task(package_id: str, template_id: str, db: Session = None):
         
     try:
         service = ParsingService(db)
-        service.parse_package(package_id, template_id)
+        service.parse_package(package_id, template_id, profile=profile)
     except Exception as e:
         logger.error(f"Error in parse_ontology_task: {e}")
     finally:
@@ -0,0 +1,77 @@
+"""
+解析结果写入路径基准测试
+
+对比 ORM ``add_all`` + ``flush`` (重构前的写入方式) 与解析管道的分块写入器
+(Core insert executemany，每 ``PARSE_WRITE_CHUNK_SIZE`` 行一块) 写入 N 个实体和 N 条关系的耗时。
+
+Usage (在 backend 目录下):
+    python -m benchmarks.bench_bulk_insert [entity_count]
+"""
+import os
+os.environ.setdefault("APP_ENV", "test")
+
+import sys
+import time
+import json
+import tempfile
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.models import OntologyEntity, OntologyRelation
+from app.config import settings
+from app.services.parsing_service import ParsingService, _ChunkedWriter
+
+
+def make_rows(package_id: str, count: int):
+    entities = [{
+        "id": models.generate_uuid(),
+        "package_id": package_id,
+        "name": f"Entity {i}",
+        "category": f"Category {i % 20}",
+        "metadata_json": json.dumps({"owner": "bench", "index": i}),
+        "file_path": f"concepts/entity_{i}.md",
+    } for i in range(count)]
+    relations = [{
+        "id": models.generate_uuid(),
+        "package_id": package_id,
+        "source_id": entities[i]["id"],
+        "target_id": entities[(i + 1) % count]["id"],
+        "relation_type": "related_to",
+    } for i in range(count)]
+    return entities, relations
+
+
+def orm_path(db, entities, relations):
+    db.add_all([OntologyEntity(**row) for row in entities])
+    db.flush()
+    db.add_all([OntologyRelation(**row) for row in relations])
+    db.commit()
+
+
+def bulk_path(db, entities, relations):
+    service = ParsingService(db)
+    for model, rows in ((OntologyEntity, entities), (OntologyRelation, relations)):
+        writer = _ChunkedWriter(service, model, settings.PARSE_WRITE_CHUNK_SIZE)
+        for row in rows:
+            writer.add(row)
+        writer.flush()
+    db.commit()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, writer in (("orm add_all", orm_path), ("core bulk", bulk_path)):
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, label.replace(' ', '_'))}.db")
+            models.Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            entities, relations = make_rows("bench-package", count)
+
+            start = time.perf_counter()
+            writer(db, entities, relations)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<12}: {count} entities + {count} relations in {elapsed:.2f}s")
+            db.close()
+            engine.dispose()
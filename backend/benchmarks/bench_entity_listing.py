@@ -0,0 +1,107 @@
+"""
+实体列表分页基准
+
+对比旧的 OFFSET 分页 (无排序) 与按 (名称, ID) 的键集分页在不同页深度下的单页耗时；
+对比逐行 json_extract 解析 metadata_json 与属性表索引两种元数据过滤方式；
+并测量带过滤条件时首次计数与命中计数缓存的耗时。
+
+Usage (在 backend 目录下):
+    python -m benchmarks.bench_entity_listing [node_count] [page_size]
+"""
+import os
+os.environ.setdefault("APP_ENV", "test")
+
+import sys
+import time
+import tempfile
+
+from sqlalchemy import func, insert
+
+from app import models
+from app.repositories.ontology_repo import OntologyRepository
+from app.services.entity_listing import EntityCountCache
+from benchmarks.graph_seed import seed_graph
+
+PACKAGE_ID = "bench-package"
+CHUNK = 50_000
+OWNERS = 10
+
+
+def seed_attributes(db, node_count: int):
+    """为 seed_graph 生成的实体补写属性行：index (唯一取值) 与 owner (OWNERS 种取值)"""
+    for start in range(0, node_count, CHUNK):
+        rows = []
+        for i in range(start, min(start + CHUNK, node_count)):
+            entity_id = models.stable_uuid(PACKAGE_ID, str(i))
+            rows.append({"package_id": PACKAGE_ID, "generation": 1, "entity_id": entity_id, "key": "index", "value": str(i)})
+            rows.append({"package_id": PACKAGE_ID, "generation": 1, "entity_id": entity_id, "key": "owner", "value": f"team{i % OWNERS}"})
+        db.execute(insert(models.EntityAttribute.__table__), rows)
+    db.commit()
+
+
+def timed(fn, repeat: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def json_scan_count(db, key: str, value: str) -> int:
+    # 无属性表时的做法：逐行解析 metadata_json
+    entity = models.OntologyEntity
+    return db.query(func.count(entity.id)).filter(
+        entity.package_id == PACKAGE_ID, entity.generation == 1,
+        func.json_extract(entity.metadata_json, f'$."{key}"') == value
+    ).scalar()
+
+
+def offset_page(db, skip: int, limit: int):
+    # 改造前 get_ontology_entities 的查询
+    return (
+        db.query(models.OntologyEntity)
+        .filter(models.OntologyEntity.package_id == PACKAGE_ID, models.OntologyEntity.generation == 1)
+        .offset(skip).limit(limit).all()
+    )
+
+
+if __name__ == "__main__":
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session_factory = seed_graph(os.path.join(tmp, "listing.db"), node_count)
+        db = session_factory()
+        repo = OntologyRepository(db)
+
+        # 预先求出各深度页的起点 (名称, ID)，键集分页只需按该键定位
+        keys = [(name, entity_id) for name, entity_id in (
+            db.query(models.OntologyEntity.name, models.OntologyEntity.id)
+            .filter(models.OntologyEntity.package_id == PACKAGE_ID, models.OntologyEntity.generation == 1)
+            .order_by(models.OntologyEntity.name, models.OntologyEntity.id)
+        )]
+        print(f"{'page depth':>12} {'offset':>10} {'keyset':>10}")
+        for depth in (0, node_count // 10, node_count // 2, node_count - page_size):
+            after = keys[depth - 1] if depth else None
+            offset_ms = timed(lambda: offset_page(db, depth, page_size))
+            keyset_ms = timed(lambda: repo.list_entities(PACKAGE_ID, 1, after=after, limit=page_size))
+            print(f"{depth:>12} {offset_ms:>8.2f}ms {keyset_ms:>8.2f}ms")
+
+        category_ms = timed(lambda: repo.list_entities(PACKAGE_ID, 1, category="Category 7",
+                                                       after=None, limit=page_size))
+        print(f"category filter, first page: {category_ms:.2f}ms")
+        seed_attributes(db, node_count)
+        rare = str(node_count // 3)
+        print(f"metadata index={rare}: json scan {timed(lambda: json_scan_count(db, 'index', node_count // 3), 1):.2f}ms, "
+              f"attribute index {timed(lambda: repo.count_entities(PACKAGE_ID, 1, metadata=[('index', rare)])):.2f}ms, "
+              f"first page {timed(lambda: repo.list_entities(PACKAGE_ID, 1, metadata=[('index', rare)])):.2f}ms")
+        page_ms = timed(lambda: repo.list_entities(PACKAGE_ID, 1, metadata=[("owner", "team3")], limit=page_size))
+        count_ms = timed(lambda: repo.count_entities(PACKAGE_ID, 1, metadata=[("owner", "team3")]), 1)
+        print(f"metadata owner=team3 ({node_count // OWNERS} matches): first page {page_ms:.2f}ms, count {count_ms:.2f}ms")
+
+        cache = EntityCountCache(max_size=16)
+        key = (PACKAGE_ID, 1, None, "Entity 1", ())
+        first_ms = timed(lambda: cache.get_or_compute(
+            key, lambda: repo.count_entities(PACKAGE_ID, 1, name_prefix="Entity 1")), 1)
+        cached_ms = timed(lambda: cache.get_or_compute(key, lambda: 0), 1000)
+        print(f"prefix count: first {first_ms:.2f}ms, cached {cached_ms * 1000:.2f}µs")
+        db.close()
+        engine.dispose()
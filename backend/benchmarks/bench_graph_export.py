@@ -0,0 +1,77 @@
+"""
+整包导出基准
+
+对比每次请求都现场序列化的 ``/graph`` JSON 与按代次缓存在磁盘上的导出文件：
+首次生成耗时、文件体积，以及下游读取 (解压并逐行读取，NDJSON 另做 JSON 解析) 的耗时。缓存命中后服务端只需发送文件。
+
+Usage (在 backend 目录下):
+    python -m benchmarks.bench_graph_export [node_count]
+"""
+import os
+os.environ.setdefault("APP_ENV", "test")
+
+import sys
+import time
+import gzip
+import json
+import tempfile
+
+from app import schemas
+from app.config import settings
+from app.repositories.ontology_repo import OntologyRepository
+from app.services.graph_export import EXPORT_NAMES, GraphExportUnavailable, GraphExporter
+from benchmarks.graph_seed import seed_graph
+
+PACKAGE_ID = "bench-package"
+
+
+def full_json(session_factory) -> bytes:
+    db = session_factory()
+    nodes, links = OntologyRepository(db).get_graph(PACKAGE_ID)
+    body = schemas.OntologyGraphResponse(nodes=nodes, links=links).model_dump_json().encode("utf-8")
+    db.close()
+    return body
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session_factory = seed_graph(os.path.join(tmp, "graph.db"), count)
+        print(f"graph: {count} nodes, {count * 3} links")
+
+        start = time.perf_counter()
+        body = full_json(session_factory)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        json.loads(body)
+        parsed = time.perf_counter() - start
+        print(f"{'/graph json':<18} build {built:6.2f}s (every request)  size {len(body) / 1024 / 1024:7.1f}MB  "
+              f"client parse {parsed:5.2f}s")
+
+        exporter = GraphExporter(root=os.path.join(tmp, "exports"))
+        for name in EXPORT_NAMES:
+            db = session_factory()
+            start = time.perf_counter()
+            try:
+                path = exporter.get_or_create(OntologyRepository(db), PACKAGE_ID, 1, name, settings.GRAPH_EXPORT_BATCH_SIZE)
+            except GraphExportUnavailable as e:
+                print(f"{name:<18} skipped: {e}")
+                db.close()
+                continue
+            generated = time.perf_counter() - start
+            start = time.perf_counter()
+            exporter.get_or_create(OntologyRepository(db), PACKAGE_ID, 1, name, settings.GRAPH_EXPORT_BATCH_SIZE)
+            cached = time.perf_counter() - start
+            db.close()
+
+            start = time.perf_counter()
+            if name.endswith(".gz"):
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    rows = sum(1 for line in f if (json.loads(line) if name.endswith(".ndjson.gz") else line))
+            else:
+                from app.services.graph_export import pq
+                rows = pq.read_table(path).num_rows
+            parsed = time.perf_counter() - start
+            print(f"{name:<18} build {generated:6.2f}s (once, cached hit {cached * 1000:.2f}ms)  "
+                  f"size {os.path.getsize(path) / 1024 / 1024:7.1f}MB  client read {parsed:5.2f}s ({rows} rows)")
+        engine.dispose()
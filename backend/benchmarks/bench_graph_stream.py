@@ -0,0 +1,65 @@
+"""
+图谱读取基准
+
+对比整包 ``/graph`` (ORM 对象 + Pydantic 一次性序列化) 与 NDJSON 流式输出 (列元组 yield_per 分批编码)
+的总耗时、首块耗时与 Python 堆内存峰值 (tracemalloc)。
+
+Usage (在 backend 目录下):
+    python -m benchmarks.bench_graph_stream [node_count]
+"""
+import os
+os.environ.setdefault("APP_ENV", "test")
+
+import sys
+import time
+import tempfile
+import tracemalloc
+
+from app import schemas
+from app.config import settings
+from app.repositories.ontology_repo import OntologyRepository
+from app.services.ontology_service import graph_ndjson_chunks
+from benchmarks.graph_seed import seed_graph
+
+
+def full_response(repo: OntologyRepository, package_id: str):
+    nodes, links = repo.get_graph(package_id)
+    body = schemas.OntologyGraphResponse(nodes=nodes, links=links).model_dump_json()
+    yield body
+
+
+def ndjson_response(repo: OntologyRepository, package_id: str):
+    yield from graph_ndjson_chunks(repo, package_id, settings.GRAPH_STREAM_BATCH_SIZE)
+
+
+def consume(produce, session_factory):
+    db = session_factory()
+    start = time.perf_counter()
+    first, size = None, 0
+    for chunk in produce(OntologyRepository(db), "bench-package"):
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    db.close()
+    return time.perf_counter() - start, first, size
+
+
+def measure(label, produce, session_factory):
+    elapsed, first, size = consume(produce, session_factory)
+    # tracemalloc 会显著拖慢执行，内存峰值单独再跑一遍
+    tracemalloc.start()
+    consume(produce, session_factory)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<8} total {elapsed:6.2f}s  first chunk {first * 1000:8.1f}ms  "
+          f"peak heap {peak / 1024 / 1024:7.1f}MB  body {size / 1024 / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session_factory = seed_graph(os.path.join(tmp, "graph.db"), count)
+        print(f"graph: {count} nodes, {count * 3} links")
+        measure("full", full_response, session_factory)
+        measure("ndjson", ndjson_response, session_factory)
+        engine.dispose()
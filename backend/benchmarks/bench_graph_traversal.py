@@ -0,0 +1,56 @@
+"""
+图遍历基准
+
+在随机图上测量邻域 (k 跳子图) 查询的耗时：
+- SQL 逐层遍历路径 (依赖 source_id / target_id 索引)；
+- 内存邻接缓存 (CSR) 的加载耗时、估算内存，以及纯遍历与度数查询耗时。
+
+Usage (在 backend 目录下):
+    python -m benchmarks.bench_graph_traversal [node_count] [queries]
+"""
+import os
+os.environ.setdefault("APP_ENV", "test")
+
+import sys
+import time
+import random
+import tempfile
+
+from app.repositories.ontology_repo import OntologyRepository
+from app.services.graph_cache import GraphCache
+from benchmarks.graph_seed import seed_graph
+
+PACKAGE_ID = "bench-package"
+
+
+def timed(label: str, fn, seeds):
+    start = time.perf_counter()
+    sizes = [fn(seed) for seed in seeds]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / len(seeds) * 1e6:9.1f}us/query  (avg {sum(sizes) / len(sizes):.0f} nodes)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session_factory = seed_graph(os.path.join(tmp, "graph.db"), count)
+        db = session_factory()
+        repo = OntologyRepository(db)
+        ids = repo.find_entity_ids(PACKAGE_ID, names=[f"Entity {i}" for i in random.Random(7).sample(range(count), queries)])
+        print(f"graph: {count} nodes, {count * 3} links, {len(ids)} seeds")
+
+        for depth in (1, 2, 3):
+            timed(f"sql bfs depth={depth}", lambda seed: len(repo.get_neighborhood(PACKAGE_ID, [seed], depth, 2000)[0]), ids)
+
+        cache = GraphCache(max_bytes=1 << 34)
+        start = time.perf_counter()
+        graph = cache.get(db, PACKAGE_ID)
+        print(f"csr load: {(time.perf_counter() - start) * 1000:.0f}ms, ~{graph.nbytes / 1024 / 1024:.1f}MB")
+        nodes = [graph.index[seed] for seed in ids]
+        timed("csr cache lookup", lambda node: len(cache.get(db, PACKAGE_ID)), nodes)
+        timed("csr degree", lambda node: sum(graph.degree(node)), nodes)
+        for depth in (1, 2, 3):
+            timed(f"csr bfs depth={depth}", lambda node: len(graph.neighborhood([node], depth, 2000)[0]), nodes)
+        db.close()
+        engine.dispose()
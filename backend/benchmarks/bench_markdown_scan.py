@@ -0,0 +1,135 @@
+"""
+Markdown 扫描微基准
+
+生成贴近真实本体文档的 Markdown 语料 (多字段 frontmatter、标题段落、属性表格、WikiLinks)，
+分项对比重构前的实现 (``split("---")`` + ``yaml.safe_load``、每个表格策略重扫全文、全文正则找链接)
+与单遍扫描引擎 (``scan_markdown`` + libyaml ``CSafeLoader``) 的耗时。
+
+Usage (在 backend 目录下):
+    python -m benchmarks.bench_markdown_scan [doc_count]
+"""
+import os
+os.environ.setdefault("APP_ENV", "test")
+
+import re
+import sys
+import time
+import random
+
+import yaml
+
+from app.models import OntologyFile
+from app.services.parsers.markdown_parser import MarkdownParser
+from app.services.parsers.markdown_scan import _YAML_LOADER, scan_markdown
+
+RULES = {
+    "attribute": {
+        "strategies": [
+            {"type": "table_row", "target_key": "fields", "header_mapping": {"Name": "name", "Type": "type"}},
+            {"type": "table_row", "target_key": "owners", "header_mapping": {"Owner": "owner"}},
+        ]
+    }
+}
+
+
+def make_document(i: int, rnd: random.Random) -> str:
+    links = " ".join(f"[[Concept {rnd.randrange(10_000)}]]" for _ in range(rnd.randint(2, 8)))
+    rows = "\n".join(f"| field_{j} | {rnd.choice(['string', 'int', 'date'])} | note {j} |" for j in range(rnd.randint(3, 15)))
+    paragraphs = "\n\n".join(
+        "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * rnd.randint(1, 4) for _ in range(rnd.randint(2, 6))
+    )
+    return (
+        "---\n"
+        f"title: Concept {i}\n"
+        f"type: {rnd.choice(['Class', 'System', 'Process'])}\n"
+        f"owner: team-{i % 17}\n"
+        f"tags: [core, domain-{i % 9}, v{i % 3}]\n"
+        "aliases:\n"
+        f"  - C{i}\n"
+        f"  - concept_{i}\n"
+        f"created: 2025-0{1 + i % 9}-1{i % 10}\n"
+        "---\n"
+        f"# Concept {i}\n\n{paragraphs}\n\nRelated: {links}\n\n"
+        "## Fields\n\n| Name | Type | Note |\n|------|------|------|\n"
+        f"{rows}\n\n## Ownership\n\n| Team | Owner |\n| --- | --- |\n| core | [[Team {i % 17}]] |\n"
+    )
+
+
+# --- 重构前的实现 ---------------------------------------------------------------
+
+_LEGACY_LINK = re.compile(r'\[\[(.*?)(?:\|.*?)?\]\]')
+
+
+def legacy_frontmatter(content: str):
+    if content.startswith("---\n"):
+        parts = content.split("---", 2)
+        if len(parts) >= 3:
+            try:
+                metadata = yaml.safe_load(parts[1])
+                if isinstance(metadata, dict):
+                    return metadata, parts[2]
+            except Exception:
+                pass
+    return {}, content
+
+
+def legacy_table(content: str, header_mapping: dict):
+    lines = content.split('\n')
+    start = -1
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line.startswith('|'):
+            continue
+        if i + 1 < len(lines):
+            next_line = lines[i + 1].strip()
+            if next_line.startswith('|') and '---' in next_line:
+                headers = [h.strip() for h in line.strip('|').split('|')]
+                if any(h in header_mapping for h in headers):
+                    start = i
+                    break
+    if start == -1:
+        return []
+    headers = [h.strip() for h in lines[start].strip().strip('|').split('|')]
+    rows = []
+    for i in range(start + 2, len(lines)):
+        line = lines[i].strip()
+        if not line.startswith('|'):
+            break
+        cells = [c.strip() for c in line.strip('|').split('|')]
+        row = {header_mapping[h]: cells[c] if c < len(cells) else "" for c, h in enumerate(headers) if h in header_mapping}
+        if row:
+            rows.append(row)
+    return rows
+
+
+def legacy_parse(content: str):
+    metadata, body = legacy_frontmatter(content)
+    for strategy in RULES["attribute"]["strategies"]:
+        legacy_table(body, strategy["header_mapping"])
+    return metadata, _LEGACY_LINK.findall(body)
+
+
+# --- 计时 -----------------------------------------------------------------------
+
+def timed(label: str, fn, corpus):
+    start = time.perf_counter()
+    for doc in corpus:
+        fn(doc)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:6.2f}s  ({elapsed / len(corpus) * 1e6:7.1f}us/doc)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rnd = random.Random(42)
+    corpus = [make_document(i, rnd) for i in range(count)]
+    parser = MarkdownParser()
+    file_record = OntologyFile(file_path="bench.md")
+    yaml_blocks = [doc.split("---", 2)[1] for doc in corpus]
+
+    print(f"corpus: {count} docs, {sum(map(len, corpus)) / 1024 / 1024:.1f}MB, yaml loader: {_YAML_LOADER.__name__}")
+    timed("yaml safe_load (pure Python)", yaml.safe_load, yaml_blocks)
+    timed(f"yaml load ({_YAML_LOADER.__name__})", lambda text: yaml.load(text, Loader=_YAML_LOADER), yaml_blocks)
+    timed("legacy frontmatter+tables+links", legacy_parse, corpus)
+    timed("scan_markdown", scan_markdown, corpus)
+    timed("MarkdownParser.parse (tables)", lambda doc: parser.parse(file_record, doc, RULES), corpus)
@@ -0,0 +1,78 @@
+"""
+正则受限执行层基准测试
+
+对比常规规则在 ``re`` 与 ``safe_search`` 下的单次开销，并统计病态正则语料被中断所需时间。
+
+Usage (在 backend 目录下):
+    python -m benchmarks.bench_regex_timeout
+"""
+import os
+os.environ.setdefault("APP_ENV", "test")
+
+import re
+import time
+
+from app.core import safe_regex
+from app.core.safe_regex import safe_search, RegexTimeoutError
+
+BENIGN_RULES = [
+    r"^#\s+(.*)$",
+    r"owner:\s*(\w+)",
+    r"status:\s*(\w+)",
+    r"\bversion\s+(\d+\.\d+)",
+]
+
+PATHOLOGICAL_CORPUS = [
+    (r"^(a+)+$", "a" * 40 + "!"),
+    (r"^(a|aa)+$", "a" * 60 + "!"),
+    (r"^(a|a?)+$", "a" * 40 + "!"),
+    (r"^(\w+\s?)*$", "word " * 12 + "!"),
+    (r"(.*a){25}", "a" * 30),
+    (r"(x+x+)+y", "x" * 40),
+]
+
+DOCUMENT = "# Billing Account\n\nowner: billing\nstatus: active\n" + ("lorem ipsum dolor sit amet\n" * 200)
+ITERATIONS = 2000
+BUDGET = 0.2
+
+
+def bench_benign(engine_name: str):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for pattern in BENIGN_RULES:
+            re.compile(pattern, re.MULTILINE).search(DOCUMENT)
+    baseline = time.perf_counter() - start
+
+    safe_search(BENIGN_RULES[0], DOCUMENT, re.MULTILINE)  # 预热 (启动子进程)
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for pattern in BENIGN_RULES:
+            safe_search(pattern, DOCUMENT, re.MULTILINE)
+    guarded = time.perf_counter() - start
+
+    calls = ITERATIONS * len(BENIGN_RULES)
+    print(f"[{engine_name}] benign rules: re {baseline / calls * 1e6:.1f}us/match, "
+          f"safe_search {guarded / calls * 1e6:.1f}us/match")
+
+
+def bench_pathological(engine_name: str):
+    for pattern, text in PATHOLOGICAL_CORPUS:
+        start = time.perf_counter()
+        try:
+            safe_search(pattern, text, timeout=BUDGET)
+            outcome = "completed"
+        except RegexTimeoutError:
+            outcome = "aborted"
+        elapsed = time.perf_counter() - start
+        print(f"[{engine_name}] {pattern!r:<32} {outcome:<9} in {elapsed * 1000:.0f}ms (budget {BUDGET * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    engines = [("worker", None)]
+    if safe_regex._regex_lib is not None:
+        engines.insert(0, ("regex", safe_regex._regex_lib))
+
+    for name, lib in engines:
+        safe_regex._regex_lib = lib
+        bench_benign(name)
+        bench_pathological(name)
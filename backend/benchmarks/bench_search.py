@@ -0,0 +1,96 @@
+"""
+全文检索基准
+
+在独立的 SQLite 文件库中写入 N 个实体 (名称、类别、元数据取值与一段正文，经触发器同步到 FTS5 索引)，
+测量建索引耗时与各类查询 (高频词、低频词、三字符子串、多词、按系列过滤) 的延迟，并与 LIKE 回退实现对比。
+
+Usage (在 backend 目录下):
+    python -m benchmarks.bench_search [entity_count] [queries]
+"""
+import os
+os.environ.setdefault("APP_ENV", "test")
+
+import sys
+import time
+import random
+import tempfile
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.models import OntologyEntity, OntologyPackage, OntologySeries
+from app.repositories.search_repo import Fts5SearchBackend, LikeSearchBackend, SearchRepository
+
+CHUNK = 20_000
+SERIES = 10
+
+
+def build_vocabulary(rnd: random.Random, size: int):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rnd.choice(letters) for _ in range(rnd.randint(4, 9))) for _ in range(size)]
+
+
+def seed(path: str, count: int, rnd: random.Random, vocabulary):
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    for s in range(SERIES):
+        db.add(OntologySeries(code=f"series{s}", name=f"Series {s}"))
+        db.add(OntologyPackage(id=f"pkg{s}", series_code=f"series{s}", version=1, is_active=True, current_generation=1))
+    db.commit()
+
+    # Zipf 式分布：少数词高频出现，多数词很少出现
+    weights = [1 / (i + 1) for i in range(len(vocabulary))]
+    start = time.perf_counter()
+    for offset in range(0, count, CHUNK):
+        rows = []
+        for i in range(offset, min(offset + CHUNK, count)):
+            words = rnd.choices(vocabulary, weights, k=40)
+            rows.append({
+                "id": f"e{i}", "package_id": f"pkg{i % SERIES}", "generation": 1,
+                "name": " ".join(words[:2]).title(), "category": f"Category {i % 50}",
+                "metadata_text": " ".join(words[2:8]), "body": " ".join(words[8:]),
+            })
+        db.execute(insert(OntologyEntity.__table__), rows)
+        db.commit()
+    elapsed = time.perf_counter() - start
+    db.close()
+    return engine, session_factory, elapsed
+
+
+def timed(label: str, repo: SearchRepository, queries, **kwargs):
+    start = time.perf_counter()
+    totals = [repo.search_entities(q.split(), **kwargs)[1] for q in queries]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed / len(queries) * 1000:9.2f}ms/query  (avg {sum(totals) / len(totals):.0f} hits)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rnd = random.Random(42)
+    vocabulary = build_vocabulary(rnd, 50_000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search.db")
+        engine, session_factory, elapsed = seed(path, count, rnd, vocabulary)
+        print(f"indexed {count} entities in {elapsed:.1f}s ({count / elapsed:.0f} rows/s), "
+              f"db size {os.path.getsize(path) / 1024 / 1024:.0f}MB")
+
+        db = session_factory()
+        fts = SearchRepository(db, Fts5SearchBackend())
+        like = SearchRepository(db, LikeSearchBackend())
+        common = vocabulary[:queries]
+        rare = vocabulary[-queries:]
+        substrings = [word[1:4] for word in rnd.sample(vocabulary[:2000], queries)]
+        pairs = [f"{a} {b}" for a, b in zip(vocabulary[:queries], vocabulary[queries:2 * queries])]
+
+        timed("fts5 common term", fts, common)
+        timed("fts5 rare term", fts, rare)
+        timed("fts5 substring (3 chars)", fts, substrings)
+        timed("fts5 two terms", fts, pairs)
+        timed("fts5 rare term, series filter", fts, rare, series_code="series3")
+        timed("like rare term", like, rare[:3])
+        db.close()
+        engine.dispose()
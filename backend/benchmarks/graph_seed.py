@@ -0,0 +1,49 @@
+"""
+图谱类基准共用的数据生成：在独立的 SQLite 文件库中写入一个已解析的本体包
+(N 个实体、约 N*degree 条随机关系，当前代次为 1)。
+"""
+import os
+import json
+import random
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.models import OntologyEntity, OntologyPackage, OntologyRelation, OntologySeries
+
+CHUNK = 10_000
+
+
+def seed_graph(path: str, node_count: int, degree: int = 3, seed: int = 42, package_id: str = "bench-package"):
+    """返回 (engine, Session 工厂)；实体名称为 "Entity {i}"，关系类型在若干种之间轮换"""
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    rnd = random.Random(seed)
+
+    db = session_factory()
+    db.add(OntologySeries(code="bench", name="Bench"))
+    db.add(OntologyPackage(id=package_id, series_code="bench", version=1, is_active=True, current_generation=1))
+    db.commit()
+
+    ids = [models.stable_uuid(package_id, str(i)) for i in range(node_count)]
+    for start in range(0, node_count, CHUNK):
+        db.execute(insert(OntologyEntity.__table__), [{
+            "id": ids[i], "package_id": package_id, "generation": 1,
+            "name": f"Entity {i}", "category": f"Category {i % 20}",
+            "metadata_json": json.dumps({"index": i}), "file_path": f"concepts/entity_{i}.md",
+        } for i in range(start, min(start + CHUNK, node_count))])
+    relation_types = ("related_to", "subClassOf", "depends_on")
+    edges = [{
+        "id": models.generate_uuid(), "package_id": package_id, "generation": 1,
+        "source_id": ids[i], "target_id": ids[rnd.randrange(node_count)],
+        "relation_type": relation_types[(i + k) % len(relation_types)],
+    } for i in range(node_count) for k in range(degree)]
+    for start in range(0, len(edges), CHUNK):
+        db.execute(insert(OntologyRelation.__table__), edges[start:start + CHUNK])
+    db.commit()
+    db.close()
+    return engine, session_factory
@@ -1,4 +1,5 @@
 import pytest
+import os
 import time
 
 
@@ -255,3 +256,651 @@ class TestOntologyReparseAPI:
         data = reparse_resp.json()
         assert data["message"] == "Parsing task triggered"
         assert data["template_id"] == tpl_id
+
+    def test_reparse_with_profiling_records_parse_report(self, client, sample_ontology_zip):
+        """开启剖析的重新解析会生成可查询的逐文件耗时报告"""
+        tpl_resp = client.post("/api/templates/", json={
+            "name": f"Profiled-{int(time.time() * 1000)}",
+            "parser_type": "markdown",
+            "rules": '{"attribute": {"regex_patterns": [{"key": "title", "pattern": "^#\\\\s+(.*)$"}]}}'
+        })
+        tpl_id = tpl_resp.json()["id"]
+
+        code = f"profiled-{int(time.time() * 1000)}"
+        with open(sample_ontology_zip, 'rb') as f:
+            resp = client.post(
+                "/api/ontologies?is_initial=true",
+                data={"code": code, "name": "Profiled Onto", "template_id": tpl_id},
+                files={"file": ("test.zip", f, "application/zip")}
+            )
+        pkg_id = resp.json()["id"]
+
+        # 未开启剖析时没有报告
+        assert client.get(f"/api/ontologies/packages/{pkg_id}/parse-report").status_code == 404
+
+        reparse_resp = client.post(f"/api/ontologies/packages/{pkg_id}/reparse", json={"profile": True})
+        assert reparse_resp.status_code == 200
+
+        report_resp = client.get(f"/api/ontologies/packages/{pkg_id}/parse-report?top=1")
+        assert report_resp.status_code == 200
+        report = report_resp.json()
+        assert report["file_count"] == 2
+        assert len(report["slowest_files"]) == 1
+        assert "title" in report["rule_totals_ms"]
+
+        full = client.get(f"/api/ontologies/packages/{pkg_id}/parse-report").json()
+        by_path = {f["file_path"]: f for f in full["slowest_files"]}
+        readme = by_path["README.md"]
+        assert readme["parser"] == "MarkdownParser"
+        assert readme["entity_count"] == 1
+        assert set(readme["rule_ms"]) == {"title"}
+        assert readme["total_ms"] >= readme["read_ms"]
+        totals = [f["total_ms"] for f in full["slowest_files"]]
+        assert totals == sorted(totals, reverse=True)
+
+
+@pytest.mark.integration
+class TestTemplateDryRunAPI:
+    """模板试运行：只在内存中解析抽样文件"""
+
+    def _upload(self, client, sample_ontology_zip):
+        code = f"dry-run-{int(time.time() * 1000)}"
+        with open(sample_ontology_zip, 'rb') as f:
+            resp = client.post(
+                "/api/ontologies?is_initial=true",
+                data={"code": code, "name": f"Dry Run {code}"},
+                files={"file": ("test.zip", f, "application/zip")}
+            )
+        return resp.json()["id"]
+
+    def test_dry_run_applies_candidate_rules_without_writing(self, client, sample_ontology_zip):
+        pkg_id = self._upload(client, sample_ontology_zip)
+        before = client.get(f"/api/ontologies/{pkg_id}/entities").json()
+
+        rules = '{"entity": {"name_source": "frontmatter:title"}, "attribute": {"regex_patterns": [{"key": "heading", "pattern": "^#\\\\s+(.*)$"}]}}'
+        resp = client.post(f"/api/ontologies/packages/{pkg_id}/dry-run", json={"rules": rules, "file_paths": ["README.md"]})
+        assert resp.status_code == 200, resp.json()
+        data = resp.json()
+        assert data["total_files"] == 2
+        assert data["sampled_files"] == 1
+        result = data["files"][0]
+        assert result["parser"] == "MarkdownParser"
+        assert result["entity_count"] == 1
+        assert result["entities"][0]["name"] == "README"
+        assert result["entities"][0]["metadata"]["heading"].startswith("Sample Ontology")
+        assert "heading" in result["rule_ms"]
+
+        assert client.get(f"/api/ontologies/{pkg_id}/entities").json() == before
+
+    def test_dry_run_samples_parseable_files(self, client, sample_ontology_zip):
+        pkg_id = self._upload(client, sample_ontology_zip)
+        resp = client.post(f"/api/ontologies/packages/{pkg_id}/dry-run", json={"rules": "{}", "sample_size": 5, "seed": 1})
+        assert resp.status_code == 200
+        assert {f["file_path"] for f in resp.json()["files"]} == {"README.md", "schema.owl"}
+
+    def test_dry_run_rejects_invalid_input(self, client, sample_ontology_zip):
+        pkg_id = self._upload(client, sample_ontology_zip)
+        assert client.post(f"/api/ontologies/packages/{pkg_id}/dry-run", json={"rules": "{broken"}).status_code == 400
+        assert client.post(f"/api/ontologies/packages/{pkg_id}/dry-run", json={"rules": "{}", "file_paths": ["nope.md"]}).status_code == 400
+        # 指定文件数与抽样数共用上限
+        too_many = [f"f{i}.md" for i in range(201)]
+        assert client.post(f"/api/ontologies/packages/{pkg_id}/dry-run", json={"rules": "{}", "file_paths": too_many}).status_code == 422
+        # 未提供规则且包没有关联模板
+        assert client.post(f"/api/ontologies/packages/{pkg_id}/dry-run", json={}).status_code == 404
+        assert client.post("/api/ontologies/packages/missing/dry-run", json={"rules": "{}"}).status_code == 404
+
+
+@pytest.mark.integration
+class TestBulkReparseAPI:
+    """按模板批量重解析"""
+
+    def test_bulk_reparse_by_template(self, client, sample_ontology_zip, monkeypatch):
+        from app.services import ontology_service
+        from app.services.reparse_scheduler import ReparseScheduler
+        scheduler = ReparseScheduler(max_workers=1)
+        monkeypatch.setattr(ontology_service, "reparse_scheduler", scheduler)
+
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"Bulk-{int(time.time() * 1000)}", "parser_type": "markdown", "rules": "{}"
+        }).json()["id"]
+        code = f"bulk-{int(time.time() * 1000)}"
+        with open(sample_ontology_zip, 'rb') as f:
+            v1 = client.post("/api/ontologies?is_initial=true", data={"code": code, "name": f"Bulk {code}", "template_id": tpl_id},
+                             files={"file": ("v1.zip", f, "application/zip")}).json()
+        with open(sample_ontology_zip, 'rb') as f:
+            v2 = client.post(f"/api/ontologies/{code}/versions", data={"template_id": tpl_id},
+                             files={"file": ("v2.zip", f, "application/zip")}).json()
+
+        assert client.post("/api/ontologies/packages/bulk-reparse", json={}).status_code == 400
+
+        resp = client.post("/api/ontologies/packages/bulk-reparse", json={"template_id": tpl_id})
+        assert resp.status_code == 202, resp.json()
+        data = resp.json()
+        assert {j["package_id"] for j in data["jobs"]} == {v1["id"], v2["id"]}
+
+        assert scheduler.get_batch(data["batch_id"]).wait(10)
+        progress = client.get(f"/api/ontologies/packages/bulk-reparse/{data['batch_id']}").json()
+        assert progress["done"] and progress["succeeded"] == 2
+        # 启用中的版本优先
+        active_id = next(v["id"] for v in (v1, v2) if client.get(f"/api/ontologies/{v['id']}").json()["is_active"])
+        assert progress["jobs"][0]["package_id"] == active_id
+
+        assert client.get("/api/ontologies/packages/bulk-reparse/unknown").status_code == 404
+
+
+def _make_zip(tmp_path, name, files):
+    import zipfile
+    path = tmp_path / f"{name}.zip"
+    with zipfile.ZipFile(path, 'w') as zipf:
+        for file_path, content in files.items():
+            zipf.writestr(file_path, content)
+    return path
+
+
+def _upload_zip(client, url, zip_path, data):
+    with open(zip_path, 'rb') as f:
+        resp = client.post(url, data=data, files={"file": (zip_path.name, f, "application/zip")})
+    assert resp.status_code == 201, resp.json()
+    return resp.json()["id"]
+
+
+@pytest.mark.integration
+class TestCrossSeriesRelationsAPI:
+    """跨系列关系：解析到目标系列的启用版本，目标系列切换版本后增量重算"""
+
+    def _cross(self, client, package_id):
+        resp = client.get(f"/api/ontologies/{package_id}/cross-relations")
+        assert resp.status_code == 200, resp.json()
+        return {item["target_name"]: item for item in resp.json()["items"]}
+
+    def test_cross_series_links_follow_active_version(self, client, tmp_path):
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"Cross-{int(time.time() * 1000)}", "parser_type": "markdown", "rules": "{}"
+        }).json()["id"]
+        core_v1 = _upload_zip(client, "/api/ontologies?is_initial=true",
+                               _make_zip(tmp_path, "core1", {"Customer.md": "---\naliases: [Client]\n---\n# Customer"}),
+                               {"code": "core", "name": "Core", "template_id": tpl_id})
+        sales = _upload_zip(client, "/api/ontologies?is_initial=true",
+                             _make_zip(tmp_path, "sales", {
+                                 "Order.md": "By [[core:client]], ships [[core:Product]], billed via [[sales:Invoice]], see [[ISO:9001]].",
+                                 "Invoice.md": "# Invoice",
+                             }),
+                             {"code": "sales", "name": "Sales", "template_id": tpl_id})
+
+        links = self._cross(client, sales)
+        assert set(links) == {"client", "Product"}
+        assert links["client"]["resolved"] and links["client"]["target_package_id"] == core_v1
+        assert links["client"]["source_name"] == "Order"
+        assert not links["Product"]["resolved"]
+        # 本系列前缀在包内解析，未知前缀按普通名称处理
+        relations = client.get(f"/api/ontologies/{sales}/relations").json()["items"]
+        assert [(r["source"]["name"], r["target"]["name"]) for r in relations] == [("Order", "Invoice")]
+        files = {f["file_path"]: f for f in client.get(f"/api/ontologies/{sales}").json()["files"]}
+        assert "ISO:9001" in files["Order.md"]["parse_warnings"]
+
+        # 上传新版本即自动启用，解析完成后指向 core 的关系增量重算
+        core_v2 = _upload_zip(client, "/api/ontologies/core/versions",
+                               _make_zip(tmp_path, "core2", {"Customer.md": "# Customer", "Product.md": "# Product"}),
+                               {"template_id": tpl_id})
+        links = self._cross(client, sales)
+        assert links["Product"]["resolved"] and links["Product"]["target_package_id"] == core_v2
+        # v2 去掉了别名 Client，原先解析成功的关系随之失效
+        assert not links["client"]["resolved"] and links["client"]["target_package_id"] == core_v2
+
+        assert client.post(f"/api/ontologies/{core_v1}/activate").status_code == 200
+        links = self._cross(client, sales)
+        assert links["client"]["resolved"] and links["client"]["target_package_id"] == core_v1
+        assert not links["Product"]["resolved"]
+
+        assert client.get("/api/ontologies/unknown/cross-relations").status_code == 404
+
+
+@pytest.mark.integration
+class TestEntityDiffAPI:
+    """实体/关系级版本差异"""
+
+    def test_entity_and_relation_diff(self, client, tmp_path):
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"Diff-{int(time.time() * 1000)}", "parser_type": "markdown",
+            "rules": '{"entity": {"name_source": "filename_no_ext", "category_source": "directory"}}'
+        }).json()["id"]
+        v1 = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "v1", {
+            "Class/Customer.md": "---\nowner: sales\n---\nSee [[Order]].",
+            "Class/Order.md": "---\nowner: ops\n---\n# Order",
+            "Class/Legacy.md": "# Legacy",
+        }), {"code": "diff", "name": "Diff", "template_id": tpl_id})
+        v2 = _upload_zip(client, "/api/ontologies/diff/versions", _make_zip(tmp_path, "v2", {
+            "Class/Customer.md": "---\nowner: crm\ntier: gold\n---\nSee [[Invoice]].",
+            "Class/Order.md": "---\nowner: ops\n---\n# Order",
+            "Class/Invoice.md": "# Invoice",
+        }), {"template_id": tpl_id})
+
+        resp = client.get("/api/ontologies/compare/entities", params={"base_id": v1, "target_id": v2})
+        assert resp.status_code == 200, resp.json()
+        data = resp.json()
+        assert (data["base_version"], data["target_version"]) == (1, 2)
+        assert data["counts"] == {"added": 1, "deleted": 1, "modified": 1}
+        by_name = {item["name"]: item for item in data["items"]}
+        assert by_name["Invoice"]["status"] == "added" and by_name["Invoice"]["base_entity_id"] is None
+        assert by_name["Legacy"]["status"] == "deleted"
+        assert by_name["Customer"]["changed_keys"] == ["owner", "tier"]
+        assert by_name["Customer"]["target_metadata"]["owner"] == "crm"
+
+        page = client.get("/api/ontologies/compare/entities",
+                          params={"base_id": v1, "target_id": v2, "status": "modified", "limit": 1}).json()
+        assert page["total"] == 1 and [i["name"] for i in page["items"]] == ["Customer"]
+
+        relations = client.get("/api/ontologies/compare/relations", params={"base_id": v1, "target_id": v2}).json()
+        assert [(r["status"], r["source_name"], r["target_name"]) for r in relations["items"]] == [
+            ("added", "Customer", "Invoice"), ("deleted", "Customer", "Order")
+        ]
+
+        # 重新解析后代次变化，缓存的结果不再复用
+        from app.services.entity_diff import entity_diff_cache
+        keys = list(entity_diff_cache._items)
+        assert client.post(f"/api/ontologies/packages/{v2}/reparse", json={}).status_code == 200
+        client.get("/api/ontologies/compare/entities", params={"base_id": v1, "target_id": v2})
+        assert len(set(entity_diff_cache._items) - set(keys)) == 1
+
+        assert client.get("/api/ontologies/compare/entities",
+                          params={"base_id": v1, "target_id": "missing"}).status_code == 404
+
+
+    def test_duplicate_entities_match_one_to_one(self, client, tmp_path):
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"DiffDup-{int(time.time() * 1000)}", "parser_type": "markdown",
+            "rules": '{"entity": {"name_source": "filename_no_ext", "category_source": "directory"}}'
+        }).json()["id"]
+        files = {"a/Class/Dup.md": "---\nowner: a\n---\n", "b/Class/Dup.md": "---\nowner: b\n---\n"}
+        v1 = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "dup1", files),
+                         {"code": "dup", "name": "Dup", "template_id": tpl_id})
+        v2 = _upload_zip(client, "/api/ontologies/dup/versions", _make_zip(tmp_path, "dup2", {
+            **files, "b/Class/Dup.md": "---\nowner: c\n---\n"
+        }), {"template_id": tpl_id})
+        other = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "dup3", files),
+                            {"code": "dup-other", "name": "Dup Other", "template_id": tpl_id})
+
+        # 同名同类别的两个实体各自与对应版本中的实体关联，而不是两两相连
+        data = client.get("/api/ontologies/compare/entities", params={"base_id": v1, "target_id": v2}).json()
+        assert data["counts"] == {"added": 0, "deleted": 0, "modified": 1}
+        assert data["items"][0]["target_metadata"]["owner"] == "c"
+        # 跨系列比较时稳定标识不同，按来源文件顺序一一对应
+        data = client.get("/api/ontologies/compare/entities", params={"base_id": other, "target_id": v2}).json()
+        assert data["counts"] == {"added": 0, "deleted": 0, "modified": 1}
+
+
+@pytest.mark.integration
+class TestGraphPagingAPI:
+    """图谱游标分页与 NDJSON 流式输出"""
+
+    def test_cursor_pages_and_ndjson_match_full_graph(self, client, tmp_path):
+        import json
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"Graph-{int(time.time() * 1000)}", "parser_type": "markdown", "rules": "{}"
+        }).json()["id"]
+        files = {f"N{i}.md": f"# N{i}\n[[N{(i + 1) % 5}]]" for i in range(5)}
+        pkg = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "graph", files),
+                          {"code": "graph", "name": "Graph", "template_id": tpl_id})
+        full = client.get(f"/api/ontologies/{pkg}/graph").json()
+        assert len(full["nodes"]) == 5 and len(full["links"]) == 5 and full["next_cursor"] is None
+
+        nodes, links, cursor, pages = [], [], None, 0
+        while True:
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            page = client.get(f"/api/ontologies/{pkg}/graph", params=params).json()
+            assert len(page["nodes"]) + len(page["links"]) <= 3
+            nodes += page["nodes"]
+            links += page["links"]
+            pages += 1
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert pages == 4
+        assert sorted(n["id"] for n in nodes) == sorted(n["id"] for n in full["nodes"])
+        assert sorted(l["id"] for l in links) == sorted(l["id"] for l in full["links"])
+
+        resp = client.get(f"/api/ontologies/{pkg}/graph", params={"format": "ndjson"})
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert lines[0]["type"] == "meta" and lines[0]["generation"] == 1
+        assert {l["id"] for l in lines if l["type"] == "node"} == {n["id"] for n in full["nodes"]}
+        assert {l["id"] for l in lines if l["type"] == "link"} == {l["id"] for l in full["links"]}
+
+        # 分页期间重新解析，旧游标失效
+        stale = client.get(f"/api/ontologies/{pkg}/graph", params={"limit": 2}).json()["next_cursor"]
+        assert client.post(f"/api/ontologies/packages/{pkg}/reparse", json={}).status_code == 200
+        resp = client.get(f"/api/ontologies/{pkg}/graph", params={"cursor": stale})
+        assert resp.status_code == 400 and resp.json()["code"] == "GRAPH_CURSOR_EXPIRED"
+        assert client.get(f"/api/ontologies/{pkg}/graph", params={"cursor": "garbage"}).status_code == 400
+        assert client.get("/api/ontologies/missing/graph", params={"format": "ndjson"}).status_code == 404
+
+    def test_ndjson_stream_stops_when_reparsed_midway(self, client, tmp_path, test_db_session):
+        import json
+        from app import models
+        from app.services.ontology_service import OntologyService
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"Stream-{int(time.time() * 1000)}", "parser_type": "markdown", "rules": "{}"
+        }).json()["id"]
+        files = {f"N{i}.md": f"# N{i}\n[[N{(i + 1) % 5}]]" for i in range(5)}
+        pkg = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "stream", files),
+                          {"code": "stream", "name": "Stream", "template_id": tpl_id})
+
+        chunks = OntologyService._iter_graph_ndjson(pkg, 2)
+        assert json.loads(next(chunks))["type"] == "meta"
+        assert len(next(chunks).splitlines()) == 2
+        # 客户端读取期间包完成重新解析：指针切换后剩余的批次不再输出
+        package = test_db_session.get(models.OntologyPackage, pkg)
+        package.current_generation += 1
+        test_db_session.commit()
+        rest = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        assert rest == [{"type": "error", "code": "GRAPH_CURSOR_EXPIRED",
+                         "message": "Graph was reparsed (generation 1 -> 2); restart the stream"}]
+
+
+@pytest.mark.integration
+class TestNeighborhoodAPI:
+    """k 跳邻域子图"""
+
+    @pytest.mark.parametrize("cache_bytes", [None, 0], ids=["adjacency-cache", "sql"])
+    def test_neighborhood_depth_direction_and_filters(self, client, tmp_path, monkeypatch, cache_bytes):
+        if cache_bytes is not None:
+            # 关闭邻接缓存，走数据库逐层遍历
+            from app.config import settings
+            monkeypatch.setattr(settings, "GRAPH_CACHE_MAX_BYTES", cache_bytes)
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"Hood-{cache_bytes}-{int(time.time() * 1000)}", "parser_type": "markdown",
+            "rules": '{"entity": {"name_source": "filename_no_ext", "category_source": "directory"}}'
+        }).json()["id"]
+        pkg = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "hood", {
+            "A/Hub.md": "[[Leaf1]] [[Leaf2]]",
+            "A/Leaf1.md": "[[Far]]",
+            "B/Leaf2.md": "# Leaf2",
+            "A/Far.md": "# Far",
+            "A/In.md": "[[Hub]]",
+        }), {"code": "hood", "name": "Hood", "template_id": tpl_id})
+        url = f"/api/ontologies/{pkg}/neighborhood"
+
+        def names(params):
+            resp = client.get(url, params=params)
+            assert resp.status_code == 200, resp.json()
+            data = resp.json()
+            return {n["name"]: n["depth"] for n in data["nodes"]}, data
+
+        nodes, _ = names({"names": "Hub"})
+        assert nodes == {"Hub": 0, "In": 1, "Leaf1": 1, "Leaf2": 1}
+        nodes, data = names({"names": "Hub", "depth": 2, "direction": "out"})
+        assert nodes == {"Hub": 0, "Leaf1": 1, "Leaf2": 1, "Far": 2}
+        id_to_name = {n["id"]: n["name"] for n in data["nodes"]}
+        assert sorted((id_to_name[l["source_id"]], id_to_name[l["target_id"]]) for l in data["links"]) == [
+            ("Hub", "Leaf1"), ("Hub", "Leaf2"), ("Leaf1", "Far")
+        ]
+        assert names({"names": "Hub", "categories": "A"})[0] == {"Hub": 0, "In": 1, "Leaf1": 1}
+        assert names({"names": "Hub", "relation_types": "subClassOf"})[0] == {"Hub": 0}
+        assert names({"names": "Far", "direction": "in", "depth": 3})[0] == {"Far": 0, "Leaf1": 1, "Hub": 2, "In": 3}
+
+        nodes, data = names({"names": "Hub", "max_nodes": 2})
+        assert data["truncated"] and len(nodes) == 2 and nodes["Hub"] == 0
+
+        assert client.get(url).status_code == 400
+        assert client.get(url, params={"names": "Nope"}).status_code == 404
+
+    def test_neighborhood_served_from_adjacency_cache_until_reparse(self, client, tmp_path):
+        """启用版本的邻域查询命中内存邻接缓存，重新解析后按新代次重新加载"""
+        from app.services.graph_cache import graph_cache
+
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"HoodCache-{int(time.time() * 1000)}", "parser_type": "markdown", "rules": "{}"
+        }).json()["id"]
+        pkg = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "hoodcache", {
+            "Hub.md": "[[Leaf]]",
+            "Leaf.md": "# Leaf",
+        }), {"code": "hoodcache", "name": "Hood Cache", "template_id": tpl_id})
+        url = f"/api/ontologies/{pkg}/neighborhood"
+
+        first = client.get(url, params={"names": "Hub"}).json()
+        hits = graph_cache.hits
+        assert client.get(url, params={"names": "Hub"}).json() == first
+        assert graph_cache.hits == hits + 1
+
+        assert client.post(f"/api/ontologies/packages/{pkg}/reparse", params={"template_id": tpl_id}).status_code == 200
+        second = client.get(url, params={"names": "Hub"}).json()
+        assert {n["name"] for n in second["nodes"]} == {"Hub", "Leaf"}
+        # 实体行 ID 含代次，重新解析后不应再返回旧代次的节点
+        assert not {n["id"] for n in second["nodes"]} & {n["id"] for n in first["nodes"]}
+
+
+@pytest.mark.integration
+class TestPathAPI:
+    """最短路径与可达性查询"""
+
+    def test_path_and_reachability(self, client, tmp_path):
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"Path-{int(time.time() * 1000)}", "parser_type": "markdown", "rules": "{}"
+        }).json()["id"]
+        files = {
+            "Dog.md": "[[Mammal]]",
+            "Mammal.md": "[[Animal]]",
+            "Animal.md": "[[Thing]]",
+            "Thing.md": "# Thing",
+            "Cat.md": "[[Mammal]]",
+            "Rock.md": "# Rock",
+        }
+        pkg = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "path", files),
+                          {"code": "pathq", "name": "Path", "template_id": tpl_id})
+
+        resp = client.get(f"/api/ontologies/{pkg}/path", params={"source_names": "Dog", "target_names": "Thing"})
+        assert resp.status_code == 200, resp.json()
+        data = resp.json()
+        assert data["found"] and data["length"] == 3
+        names = [n["name"] for n in data["nodes"]]
+        assert names == ["Dog", "Mammal", "Animal", "Thing"]
+        id_to_name = {n["id"]: n["name"] for n in data["nodes"]}
+        assert [(id_to_name[l["source_id"]], id_to_name[l["target_id"]]) for l in data["links"]] == [
+            ("Dog", "Mammal"), ("Mammal", "Animal"), ("Animal", "Thing")
+        ]
+
+        reverse = client.get(f"/api/ontologies/{pkg}/path", params={"source_names": "Thing", "target_names": "Dog"}).json()
+        assert not reverse["found"] and reverse["nodes"] == []
+        both = client.get(f"/api/ontologies/{pkg}/path",
+                          params={"source_names": "Thing", "target_names": "Dog", "direction": "both"}).json()
+        assert [n["name"] for n in both["nodes"]] == ["Thing", "Animal", "Mammal", "Dog"]
+        assert len(both["links"]) == 3
+        assert not client.get(f"/api/ontologies/{pkg}/path",
+                              params={"source_names": "Dog", "target_names": "Rock"}).json()["found"]
+        assert client.get(f"/api/ontologies/{pkg}/path", params={"source_names": "Dog"}).status_code == 400
+
+        ancestors = client.get(f"/api/ontologies/{pkg}/reachable", params={"names": "Dog"}).json()
+        assert {n["name"]: n["depth"] for n in ancestors["nodes"]} == {"Mammal": 1, "Animal": 2, "Thing": 3}
+        dependents = client.get(f"/api/ontologies/{pkg}/reachable", params={"names": "Animal", "direction": "in"}).json()
+        assert {n["name"] for n in dependents["nodes"]} == {"Mammal", "Dog", "Cat"}
+        capped = client.get(f"/api/ontologies/{pkg}/reachable",
+                            params={"names": "Animal", "direction": "in", "max_nodes": 1}).json()
+        assert capped["truncated"] and [n["name"] for n in capped["nodes"]] == ["Mammal"]
+
+        # 邻接结构已缓存：可达集只回表读取实体，不再读取节点之间的边
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            assert client.get(f"/api/ontologies/{pkg}/reachable", params={"names": "Dog"}).json() == ancestors
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+        assert statements and not any("ontology_relations" in statement for statement in statements)
+
+
+@pytest.mark.integration
+class TestGraphStatsAPI:
+    """解析完成时预计算的图谱统计"""
+
+    def test_stats_computed_on_parse(self, client, tmp_path):
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"Stats-{int(time.time() * 1000)}", "parser_type": "markdown",
+            "rules": '{"entity": {"name_source": "filename_no_ext", "category_source": "directory"}}'
+        }).json()["id"]
+        pkg = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "stats", {
+            "Core/Hub.md": "[[Leaf1]] [[Leaf2]]",
+            "Core/Leaf1.md": "# Leaf1",
+            "Edge/Leaf2.md": "# Leaf2",
+            "Edge/Lonely.md": "# Lonely",
+        }), {"code": "statsq", "name": "Stats", "template_id": tpl_id})
+
+        resp = client.get(f"/api/ontologies/{pkg}/stats")
+        assert resp.status_code == 200, resp.json()
+        data = resp.json()
+        assert data["node_count"] == 4 and data["edge_count"] == 2
+        assert {c["category"]: c["count"] for c in data["categories"]} == {"Core": 2, "Edge": 2}
+        assert data["hubs"][0]["name"] == "Hub" and data["hubs"][0]["out_degree"] == 2
+        assert data["component_count"] == 2 and data["largest_components"] == [3, 1]
+        assert data["orphan_count"] == 1 and data["orphans"][0]["name"] == "Lonely"
+        assert sum(b["count"] for b in data["degree_histogram"]["total"]) == 4
+
+        assert client.post(f"/api/ontologies/packages/{pkg}/reparse", params={"template_id": tpl_id}).status_code == 200
+        assert client.get(f"/api/ontologies/{pkg}/stats").json()["generation"] == data["generation"] + 1
+        assert client.get("/api/ontologies/missing/stats").status_code == 404
+
+
+@pytest.mark.integration
+class TestEntityListingAPI:
+    """实体列表：类别/名称前缀/元数据过滤、稳定排序与键集分页"""
+
+    def test_filters_and_keyset_pagination(self, client, tmp_path):
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"Listing-{int(time.time() * 1000)}", "parser_type": "markdown",
+            "rules": '{"entity": {"name_source": "filename_no_ext", "category_source": "directory"}}'
+        }).json()["id"]
+        pkg = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "listing", {
+            "Party/Customer.md": "---\nowner: Sales\ntier: 1\n---\n# Customer",
+            "Party/Carrier.md": "---\nowner: Ops\n---\n# Carrier",
+            "Party/Supplier.md": "# Supplier",
+            "Asset/Cargo.md": "---\nowner: Ops\narchived: true\n---\n# Cargo",
+            "Asset/Warehouse.md": "# Warehouse",
+        }), {"code": "listq", "name": "Listing", "template_id": tpl_id})
+        url = f"/api/ontologies/{pkg}/entities"
+
+        def names(**params):
+            resp = client.get(url, params=params)
+            assert resp.status_code == 200, resp.json()
+            return [e["name"] for e in resp.json()["items"]]
+
+        data = client.get(url).json()
+        assert [e["name"] for e in data["items"]] == ["Cargo", "Carrier", "Customer", "Supplier", "Warehouse"]
+        assert data["total"] == 5 and data["next_cursor"] is None
+
+        assert names(category="Party") == ["Carrier", "Customer", "Supplier"]
+        assert names(name_prefix="Ca") == ["Cargo", "Carrier"]
+        assert names(name_prefix="ca") == []
+        assert names(metadata="owner=Ops") == ["Cargo", "Carrier"]
+        assert names(metadata=["owner=Ops", "archived=true"]) == ["Cargo"]
+        assert names(metadata="tier=1") == ["Customer"]
+        assert names(metadata="owner") == ["Cargo", "Carrier", "Customer"]
+        assert client.get(url, params={"category": "Party", "name_prefix": "C"}).json()["total"] == 2
+        assert client.get(url, params={"include_total": False}).json()["total"] is None
+
+        # 逐页翻完：每页按 (名称, ID) 接续，既不重复也不遗漏
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = client.get(url, params=params).json()
+            assert page["total"] == 5
+            seen.extend(e["name"] for e in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert seen == ["Cargo", "Carrier", "Customer", "Supplier", "Warehouse"]
+
+        first = client.get(url, params={"limit": 2}).json()
+        assert client.post(f"/api/ontologies/packages/{pkg}/reparse", params={"template_id": tpl_id}).status_code == 200
+        resp = client.get(url, params={"cursor": first["next_cursor"]})
+        assert resp.status_code == 400 and resp.json()["code"] == "GRAPH_CURSOR_EXPIRED"
+        assert client.get(url, params={"cursor": "garbage"}).status_code == 400
+        assert client.get(url, params={"metadata": "=x"}).status_code == 400
+        assert client.get("/api/ontologies/missing/entities").status_code == 404
+
+        # 属性表随重新解析回收旧代次，计数不会累加
+        keys = client.get(f"/api/ontologies/{pkg}/attributes").json()
+        assert {k["key"]: k["entity_count"] for k in keys} == {"owner": 3, "tier": 1, "archived": 1}
+        values = client.get(f"/api/ontologies/{pkg}/attributes/values", params={"key": "owner"}).json()
+        assert values == [{"value": "Ops", "entity_count": 2}, {"value": "Sales", "entity_count": 1}]
+        assert client.get("/api/ontologies/missing/attributes").status_code == 404
+
+
+@pytest.mark.integration
+class TestGraphExportAPI:
+    """整包导出：按代次缓存的 gzip NDJSON / N-Triples 与 Parquet 文件，支持 ETag 与 Range"""
+
+    def _package(self, client, tmp_path):
+        tpl_id = client.post("/api/templates/", json={
+            "name": f"Export-{int(time.time() * 1000)}", "parser_type": "markdown",
+            "rules": '{"entity": {"name_source": "filename_no_ext", "category_source": "directory"}}'
+        }).json()["id"]
+        pkg = _upload_zip(client, "/api/ontologies?is_initial=true", _make_zip(tmp_path, "export", {
+            "Party/Customer.md": "[[Order]]",
+            "Sales/Order.md": "[[Customer]] [[Line \"A\"]]",
+            "Sales/Line \"A\".md": "# Line",
+        }), {"code": "exportq", "name": "Export", "template_id": tpl_id})
+        return pkg, tpl_id
+
+    def test_ndjson_export_cached_with_etag_and_range(self, client, tmp_path):
+        import gzip
+        import json
+        pkg, tpl_id = self._package(client, tmp_path)
+        url = f"/api/ontologies/{pkg}/export/graph.ndjson.gz"
+
+        resp = client.get(url)
+        assert resp.status_code == 200, resp.text
+        assert resp.headers["content-type"] == "application/gzip"
+        etag = resp.headers["etag"]
+        body = resp.content
+        lines = [json.loads(line) for line in gzip.decompress(body).decode("utf-8").splitlines()]
+        streamed = [json.loads(line) for line in client.get(
+            f"/api/ontologies/{pkg}/graph", params={"format": "ndjson"}).text.splitlines()]
+        assert lines == streamed and len(lines) == 1 + 3 + 3
+
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        partial = client.get(url, headers={"Range": "bytes=0-9"})
+        assert partial.status_code == 206 and partial.content == body[:10]
+        assert client.get(url).content == body
+
+        # 重新解析后代次变化：ETag 随之变化，旧代次的导出文件被回收
+        from app.services.graph_export import graph_exporter
+        old_path = graph_exporter.path(pkg, lines[0]["generation"], "graph.ndjson.gz")
+        assert client.post(f"/api/ontologies/packages/{pkg}/reparse", params={"template_id": tpl_id}).status_code == 200
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 200 and resp.headers["etag"] != etag
+        assert not os.path.exists(old_path)
+
+        assert client.get(f"/api/ontologies/{pkg}/export/graph.csv").status_code == 422
+        assert client.get("/api/ontologies/missing/export/graph.nt.gz").status_code == 404
+
+    def test_ntriples_export_parses(self, client, tmp_path):
+        import gzip
+        from rdflib import Graph, URIRef, RDFS
+        pkg, _ = self._package(client, tmp_path)
+        resp = client.get(f"/api/ontologies/{pkg}/export/graph.nt.gz")
+        assert resp.status_code == 200, resp.text
+
+        graph = Graph().parse(data=gzip.decompress(resp.content).decode("utf-8"), format="nt")
+        labels = {str(o) for o in graph.objects(None, RDFS.label)}
+        assert labels == {"Customer", "Order", 'Line "A"'}
+        links = list(graph.triples((None, URIRef("urn:ontohub:relation:related_to"), None)))
+        assert len(links) == 3 and all(str(s).startswith("urn:uuid:") for s, _, _ in links)
+
+    def test_parquet_export(self, client, tmp_path):
+        from app.services import graph_export
+        pkg, _ = self._package(client, tmp_path)
+        resp = client.get(f"/api/ontologies/{pkg}/export/entities.parquet")
+        if graph_export.pq is None:
+            assert resp.status_code == 400 and "pyarrow" in resp.json()["detail"]
+            return
+        import io
+        assert resp.status_code == 200
+        table = graph_export.pq.read_table(io.BytesIO(resp.content))
+        assert sorted(table.column("name").to_pylist()) == ['Customer', 'Line "A"', 'Order']
+        relations = graph_export.pq.read_table(io.BytesIO(
+            client.get(f"/api/ontologies/{pkg}/export/relations.parquet").content))
+        assert relations.num_rows == 3
@@ -0,0 +1,73 @@
+import time
+import zipfile
+
+import pytest
+
+
+def _upload(client, tmp_path, url, name, files, data):
+    path = tmp_path / f"{name}.zip"
+    with zipfile.ZipFile(path, 'w') as zipf:
+        for file_path, content in files.items():
+            zipf.writestr(file_path, content)
+    with open(path, 'rb') as f:
+        resp = client.post(url, data=data, files={"file": (path.name, f, "application/zip")})
+    assert resp.status_code == 201, resp.json()
+    return resp.json()["id"]
+
+
+@pytest.mark.integration
+class TestSearchAPI:
+    """实体全文检索：名称、类别、元数据取值与正文，随解析增量更新"""
+
+    def _template(self, client):
+        return client.post("/api/templates/", json={
+            "name": f"Search-{int(time.time() * 1000)}", "parser_type": "markdown",
+            "rules": '{"entity": {"name_source": "filename_no_ext", "category_source": "directory"}}'
+        }).json()["id"]
+
+    def _search(self, client, **params):
+        resp = client.get("/api/search", params=params)
+        assert resp.status_code == 200, resp.json()
+        return resp.json()
+
+    def test_search_fields_ranking_substring_and_filters(self, client, tmp_path):
+        tpl_id = self._template(client)
+        v1 = _upload(client, tmp_path, "/api/ontologies?is_initial=true", "v1", {
+            "Party/Customer.md": "---\nowner: Billing Team\n---\nA customer buys products from the shop.",
+            "Party/Supplier.md": "Ships products to the warehouse; see [[Customer]].",
+            "Asset/Warehouse.md": "Stores inventory.",
+        }, {"code": "searchq", "name": "Search", "template_id": tpl_id})
+
+        data = self._search(client, q="customer")
+        assert data["backend"] == "fts5"
+        names = [hit["name"] for hit in data["items"]]
+        # 名称命中排在仅正文命中 (Supplier 的链接文本) 之前
+        assert names == ["Customer", "Supplier"] and data["total"] == 2
+        assert "<mark>" in data["items"][0]["snippet"] and data["items"][0]["series_code"] == "searchq"
+
+        assert [h["name"] for h in self._search(client, q="billing")["items"]] == ["Customer"]
+        assert {h["name"] for h in self._search(client, q="products")["items"]} == {"Customer", "Supplier"}
+        assert [h["name"] for h in self._search(client, q="wareh")["items"]][0] == "Warehouse"
+        # trigram 索引按子串匹配，词中间的片段也能命中
+        assert [h["name"] for h in self._search(client, q="rehouse")["items"]][0] == "Warehouse"
+        assert [h["name"] for h in self._search(client, q="products", category="Party")["items"]]
+        assert self._search(client, q="inventory", category="Party")["total"] == 0
+        assert self._search(client, q='"unbalanced AND (')["total"] == 0
+
+        # 新版本启用后默认只检索启用版本；指定旧版本仍可检索
+        v2 = _upload(client, tmp_path, "/api/ontologies/searchq/versions", "v2", {
+            "Party/Client.md": "Formerly known as customer.",
+        }, {"template_id": tpl_id})
+        assert [h["package_id"] for h in self._search(client, q="customer")["items"]] == [v2]
+        assert [h["name"] for h in self._search(client, q="customer", package_id=v1)["items"]] == ["Customer", "Supplier"]
+        assert self._search(client, q="customer", active_only=False)["total"] == 3
+        assert self._search(client, q="customer", series_code="other")["total"] == 0
+
+        # 重新解析后旧代次的索引随实体一并回收
+        assert client.post(f"/api/ontologies/packages/{v2}/reparse", params={"template_id": tpl_id}).status_code == 200
+        hits = self._search(client, q="customer")["items"]
+        assert len(hits) == 1 and hits[0]["package_id"] == v2
+
+    def test_blank_query_rejected(self, client):
+        assert client.get("/api/search", params={"q": "   "}).status_code == 400
+        assert client.get("/api/search").status_code == 422
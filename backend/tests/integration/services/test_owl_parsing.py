@@ -86,3 +86,4 @@ async def test_owl_parsing_logic(test_db_session, tmp_path):
     relation = relations[0]
     assert relation.source_id == dog_entity.id
     assert relation.target_id == animal_entity.id
+    assert relation.relation_type == "subClassOf"
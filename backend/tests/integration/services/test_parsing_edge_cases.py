@@ -66,6 +66,56 @@ class TestParsingEdgeCases:
         # 虽然正则错了，但基础信息（名称、分类）应保留
         assert entities[0].name == "test"
 
+    def test_regex_timeout_recorded_as_file_warning(self, test_db_session, temp_storage_dir, monkeypatch):
+        """验证灾难性回溯的正则被中断，并记录为文件级告警"""
+        from app.config import settings
+        from app.core import safe_regex
+        monkeypatch.setattr(settings, "REGEX_TIMEOUT_SECONDS", 0.2)
+        # 固定使用子进程执行路径 (regex 库会优化掉该样本的回溯)
+        monkeypatch.setattr(safe_regex, "_regex_lib", None)
+
+        template = ParsingTemplate(
+            id=f"tpl-redos-{generate_uuid()[:8]}",
+            name="ReDoS Template",
+            rules=json.dumps({
+                "entity": {"name_source": "filename_no_ext", "category_source": "directory"},
+                "attribute": {
+                    "regex_patterns": [
+                        {"key": "evil", "pattern": r"^(a+)+$"},
+                        {"key": "owner", "pattern": r"owner:\s*(\w+)"}
+                    ]
+                }
+            })
+        )
+        test_db_session.add(template)
+        package = OntologyPackage(
+            id=f"pkg-redos-{generate_uuid()[:8]}",
+            series_code="test-redos",
+            version=1,
+            template_id=template.id,
+            status="READY"
+        )
+        test_db_session.add(package)
+
+        pkg_path = temp_storage_dir / package.id
+        os.makedirs(pkg_path, exist_ok=True)
+        (pkg_path / "slow.md").write_text("a" * 40 + "!\nowner: billing\n", encoding='utf-8')
+        file_record = OntologyFile(package_id=package.id, file_path="slow.md", file_size=50)
+        test_db_session.add(file_record)
+        test_db_session.commit()
+
+        service = ParsingService(test_db_session)
+        service.parse_package(package.id, template.id)
+
+        entity = test_db_session.query(OntologyEntity).filter_by(package_id=package.id).one()
+        # 超时规则被跳过，其余规则照常生效
+        assert json.loads(entity.metadata_json) == {"owner": "billing"}
+
+        test_db_session.refresh(file_record)
+        warnings = json.loads(file_record.parse_warnings)
+        assert len(warnings) == 1
+        assert "evil" in warnings[0]
+
     def test_empty_and_binary_content(self, test_db_session, temp_storage_dir):
         """验证处理空文件或意外生成的二进制内容"""
         template = ParsingTemplate(
@@ -143,3 +193,57 @@ class TestParsingEdgeCases:
         assert len(rels) == 2
         for r in rels:
             assert r.source_id != r.target_id
+
+    def test_links_resolve_through_aliases_and_case_folding(self, test_db_session, temp_storage_dir):
+        """别名、大小写差异与 [[目标|显示名]] 均可解析；重名与未解析的链接记录为文件告警"""
+        template = ParsingTemplate(
+            id=f"tpl-alias-{generate_uuid()[:8]}",
+            name="Alias Template",
+            rules=json.dumps({"entity": {"name_source": "filename_no_ext"}, "attribute": {}})
+        )
+        test_db_session.add(template)
+        package = OntologyPackage(
+            id=f"pkg-alias-{generate_uuid()[:8]}",
+            series_code="test-alias",
+            version=1,
+            template_id=template.id,
+            status="READY"
+        )
+        test_db_session.add(package)
+        test_db_session.commit()
+
+        pkg_path = temp_storage_dir / package.id
+        (pkg_path / "a").mkdir(parents=True)
+        (pkg_path / "b").mkdir()
+        files = {
+            "a/Customer.md": "---\naliases: [Client]\n---\n# Customer",
+            "a/Order.md": "Placed by [[client]] and [[CUSTOMER|the buyer]], see [[Invoice]] and [[Ghost]].",
+            "b/Customer.md": "# Duplicate customer",
+            "b/Invoice.md": "# Invoice",
+        }
+        for path, content in files.items():
+            (pkg_path / path).write_text(content, encoding='utf-8')
+            test_db_session.add(OntologyFile(package_id=package.id, file_path=path, file_size=len(content)))
+        test_db_session.commit()
+
+        ParsingService(test_db_session).parse_package(package.id, template.id)
+
+        from app.models import OntologyEntity, OntologyRelation
+        path_of = {e.id: e.file_path for e in test_db_session.query(OntologyEntity).filter_by(package_id=package.id)}
+        rels = test_db_session.query(OntologyRelation).filter_by(package_id=package.id).all()
+        edges = sorted((path_of[r.source_id], path_of[r.target_id]) for r in rels)
+        # client 与 CUSTOMER 都指向先出现的 a/Customer.md，相同的边只保留一条
+        assert edges == [
+            ("a/Order.md", "a/Customer.md"),
+            ("a/Order.md", "b/Invoice.md"),
+        ]
+        # 关系行主键由 (包, 代次, 关系稳定标识) 确定性派生
+        from app.models import stable_uuid
+        assert all(r.id == stable_uuid(package.id, str(r.generation), r.stable_id) for r in rels)
+
+        warnings = {f.file_path: json.loads(f.parse_warnings) if f.parse_warnings else []
+                    for f in test_db_session.query(OntologyFile).filter_by(package_id=package.id)}
+        assert any("Ghost" in w for w in warnings["a/Order.md"])
+        assert any("重复" in w and "a/Customer.md" in w for w in warnings["b/Customer.md"])
+        assert warnings["b/Invoice.md"] == []
+
@@ -122,3 +122,373 @@ This is a test entity.
         assert relations[0].source_id == person.id
         assert relations[0].target_id == address.id
         assert relations[0].relation_type == "related_to"
+
+    def test_bulk_write_spans_multiple_chunks(self, test_db_session, setup_parsing_env, temp_storage_dir, monkeypatch):
+        """写入批次小于实体数时，所有实体与关系仍应完整落库"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "PARSE_WRITE_CHUNK_SIZE", 2)
+        package, template = setup_parsing_env
+
+        cat_dir = temp_storage_dir / package.id / "Classes"
+        for i in range(5):
+            content = f"# Node {i}\n[[Address]]\n"
+            (cat_dir / f"Node{i}.md").write_text(content, encoding='utf-8')
+            test_db_session.add(OntologyFile(package_id=package.id, file_path=f"Classes/Node{i}.md", file_size=len(content)))
+        test_db_session.commit()
+
+        ParsingService(test_db_session).parse_package(package.id, template.id)
+
+        entities = test_db_session.query(OntologyEntity).filter_by(package_id=package.id).all()
+        assert len(entities) == 7
+        assert len({e.id for e in entities}) == 7
+        relations = test_db_session.query(OntologyRelation).filter_by(package_id=package.id).all()
+        # Person -> Address 以及 5 个 NodeX -> Address
+        assert len(relations) == 6
+
+    def test_reparse_keeps_previous_graph_visible_until_swap(self, test_db_session, setup_parsing_env):
+        """重新解析期间读者仍看到上一代次的完整图谱，切换后旧代次被回收"""
+        from app.repositories.ontology_repo import OntologyRepository
+        from app.services.parsers.registry import ParserRegistry
+        package, template = setup_parsing_env
+        # 使用独立注册表，避免替换进程共享的解析器实例
+        service = ParsingService(test_db_session, registry=ParserRegistry())
+        service.parse_package(package.id, template.id)
+        repo = OntologyRepository(test_db_session)
+        assert test_db_session.get(OntologyPackage, package.id).current_generation == 1
+
+        observed = []
+        parser = service._registry.get(".md")
+        original_parse_file = parser.parse_file
+
+        def observing_parse_file(*args, **kwargs):
+            nodes, links = repo.get_graph(package.id)
+            observed.append((len(nodes), len(links)))
+            return original_parse_file(*args, **kwargs)
+
+        parser.parse_file = observing_parse_file
+        service.parse_package(package.id, template.id)
+
+        assert observed and all(o == (2, 1) for o in observed)
+        assert test_db_session.get(OntologyPackage, package.id).current_generation == 2
+        # 旧代次已被回收，表中只剩当前代次
+        rows = test_db_session.query(OntologyEntity).filter_by(package_id=package.id).all()
+        assert {e.generation for e in rows} == {2}
+        nodes, links = repo.get_graph(package.id)
+        assert len(nodes) == 2 and len(links) == 1
+
+    def test_failed_reparse_keeps_previous_generation(self, test_db_session, setup_parsing_env, monkeypatch):
+        """写入阶段失败时丢弃半成品代次，包保留上一次成功解析的图谱"""
+        from app.repositories.ontology_repo import OntologyRepository
+        package, template = setup_parsing_env
+        service = ParsingService(test_db_session)
+        service.parse_package(package.id, template.id)
+
+        original_bulk_insert = service._bulk_insert
+
+        def failing_bulk_insert(model, rows):
+            if model is OntologyRelation:
+                raise RuntimeError("disk full")
+            return original_bulk_insert(model, rows)
+
+        monkeypatch.setattr(service, "_bulk_insert", failing_bulk_insert)
+        with pytest.raises(RuntimeError):
+            service.parse_package(package.id, template.id)
+
+        assert test_db_session.get(OntologyPackage, package.id).current_generation == 1
+        rows = test_db_session.query(OntologyEntity).filter_by(package_id=package.id).all()
+        assert {e.generation for e in rows} == {1}
+        nodes, links = OntologyRepository(test_db_session).get_graph(package.id)
+        assert {n.name for n in nodes} == {"Person", "Address"}
+        assert len(links) == 1
+
+    def test_generator_parser_streams_chunked_writes(self, test_db_session, setup_parsing_env, temp_storage_dir, monkeypatch):
+        """生成器插件产出的记录按块写库，链接溢写到磁盘后仍能正确解析为关系"""
+        from app.config import settings
+        from app.services.parsers.base import BaseParser
+        monkeypatch.setattr(settings, "PARSE_WRITE_CHUNK_SIZE", 3)
+        monkeypatch.setattr(settings, "PARSE_LINK_SPOOL_BYTES", 1)
+        package, template = setup_parsing_env
+
+        written_while_yielding = []
+
+        class LineParser(BaseParser):
+            supported_extensions = [".lines"]
+
+            def parse(self, file_record, content, rules):
+                raise AssertionError("parse_file should be used")
+
+            def parse_file(self, file_record, file_path, rules):
+                with open(file_path, encoding="utf-8") as f:
+                    for i, line in enumerate(f):
+                        written_while_yielding.append(
+                            test_db_session.query(OntologyEntity).filter_by(package_id=package.id, generation=1).count()
+                        )
+                        yield {"name": line.strip(), "metadata": {"index": i}, "links": ["Person", {"target": "Address", "type": "lives_at"}]}
+
+        content = "".join(f"Row{i}\n" for i in range(7))
+        (temp_storage_dir / package.id / "rows.lines").write_text(content, encoding="utf-8")
+        test_db_session.add(OntologyFile(package_id=package.id, file_path="rows.lines", file_size=len(content)))
+        test_db_session.commit()
+
+        from app.services.parsers.registry import ParserRegistry
+        registry = ParserRegistry()
+        registry.register(".lines", LineParser())
+        service = ParsingService(test_db_session, registry=registry)
+        service.parse_package(package.id, template.id)
+
+        # 产出过程中至少已有一个完整的块 (3 行) 写入数据库
+        assert max(written_while_yielding) >= 3
+        entities = test_db_session.query(OntologyEntity).filter_by(package_id=package.id).all()
+        assert len(entities) == 9
+        relations = test_db_session.query(OntologyRelation).filter_by(package_id=package.id).all()
+        # Person -> Address 以及 7 行各自指向 Person 与 Address
+        assert len(relations) == 15
+        assert sum(1 for r in relations if r.relation_type == "lives_at") == 7
+
+    def test_chunk_commits_release_write_lock(self, tmp_path, temp_storage_dir, monkeypatch):
+        """逐块提交新代次的行：解析进行中其他连接仍能写入，且看不到未发布的代次"""
+        import sqlite3
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.config import settings
+        from app.database import Base
+        from app.services.parsers.base import BaseParser
+        from app.services.parsers.registry import ParserRegistry
+        monkeypatch.setattr(settings, "PARSE_WRITE_CHUNK_SIZE", 2)
+        db_path = tmp_path / "parse.db"
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine, autoflush=False)()
+
+        template = ParsingTemplate(id="tpl-lock", name="Lock", rules=json.dumps({"entity": {}}))
+        package = OntologyPackage(id="pkg-lock", series_code="lock", version=1, template_id=template.id, status="READY")
+        db.add_all([template, package, OntologyFile(package_id=package.id, file_path="rows.lines", file_size=1)])
+        db.commit()
+        os.makedirs(temp_storage_dir / package.id, exist_ok=True)
+        (temp_storage_dir / package.id / "rows.lines").write_text("x", encoding="utf-8")
+
+        observed = []
+
+        class RowParser(BaseParser):
+            supported_extensions = [".lines"]
+
+            def parse(self, file_record, content, rules):
+                raise AssertionError("parse_file should be used")
+
+            def parse_file(self, file_record, file_path, rules):
+                for i in range(5):
+                    if i == 3:
+                        # 第一块 (2 行) 已提交：另一个连接不应等待写锁
+                        other = sqlite3.connect(db_path, timeout=0.2)
+                        try:
+                            other.execute("INSERT INTO webhooks (id, target_url) VALUES ('w1', 'http://example.com')")
+                            other.commit()
+                            observed.append(other.execute(
+                                "SELECT current_generation FROM ontology_packages WHERE id = 'pkg-lock'"
+                            ).fetchone()[0])
+                        finally:
+                            other.close()
+                    yield {"name": f"Row{i}", "metadata": {}, "links": []}
+
+        registry = ParserRegistry()
+        registry.register(".lines", RowParser())
+        try:
+            ParsingService(db, registry=registry).parse_package(package.id, template.id)
+            assert observed == [0]
+            assert db.get(OntologyPackage, package.id).current_generation == 1
+            assert db.query(OntologyEntity).filter_by(package_id=package.id, generation=1).count() == 5
+        finally:
+            db.close()
+            engine.dispose()
+
+    def test_sqlite_parses_are_serialized(self, tmp_path, temp_storage_dir):
+        """SQLite 下并发提交的解析 (批量重解析与后台任务) 依次执行，均能成功"""
+        import threading
+        import time
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.database import Base
+        from app.services.parsers.base import BaseParser
+        from app.services.parsers.registry import ParserRegistry
+        engine = create_engine(f"sqlite:///{tmp_path / 'parse.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        db = factory()
+        db.add(ParsingTemplate(id="tpl", name="T", rules=json.dumps({"entity": {}})))
+        for i in range(2):
+            db.add(OntologyPackage(id=f"pkg-{i}", series_code=f"s{i}", version=1, template_id="tpl", status="READY"))
+            db.add(OntologyFile(package_id=f"pkg-{i}", file_path="rows.lines", file_size=1))
+            os.makedirs(temp_storage_dir / f"pkg-{i}", exist_ok=True)
+            (temp_storage_dir / f"pkg-{i}" / "rows.lines").write_text("x", encoding="utf-8")
+        db.commit()
+        db.close()
+
+        active, peak = [0], [0]
+        guard = threading.Lock()
+
+        class SlowParser(BaseParser):
+            supported_extensions = [".lines"]
+
+            def parse(self, file_record, content, rules):
+                raise AssertionError("parse_file should be used")
+
+            def parse_file(self, file_record, file_path, rules):
+                with guard:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                try:
+                    for i in range(3):
+                        time.sleep(0.05)
+                        yield {"name": f"Row{i}", "metadata": {}, "links": []}
+                finally:
+                    with guard:
+                        active[0] -= 1
+
+        registry = ParserRegistry()
+        registry.register(".lines", SlowParser())
+
+        def run(package_id):
+            session = factory()
+            try:
+                ParsingService(session, registry=registry).parse_package(package_id, "tpl")
+            finally:
+                session.close()
+
+        threads = [threading.Thread(target=run, args=(f"pkg-{i}",)) for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        db = factory()
+        try:
+            assert peak[0] == 1
+            assert [p.current_generation for p in db.query(OntologyPackage).order_by(OntologyPackage.id)] == [1, 1]
+            assert db.query(OntologyEntity).count() == 6
+        finally:
+            db.close()
+            engine.dispose()
+
+    def test_concurrent_parses_of_same_package_without_sqlite_lock(self, tmp_path, temp_storage_dir, monkeypatch):
+        """
+        不依赖 SQLite 进程锁 (其他数据库上的情形)：同一包的两个解析交错执行，
+        各自分配不同代次，后开始的解析发布，先开始的解析放弃且不留残行
+        """
+        import threading
+        from contextlib import nullcontext
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.config import settings
+        from app.database import Base
+        from app.services import parsing_service
+        from app.services.parsers.base import BaseParser
+        from app.services.parsers.registry import ParserRegistry
+        monkeypatch.setattr(parsing_service, "parse_write_lock", lambda db: nullcontext())
+        monkeypatch.setattr(settings, "PARSE_WRITE_CHUNK_SIZE", 2)
+        engine = create_engine(f"sqlite:///{tmp_path / 'parse.db'}",
+                               connect_args={"check_same_thread": False, "timeout": 10})
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        db = factory()
+        db.add(ParsingTemplate(id="tpl", name="T", rules=json.dumps({"entity": {}})))
+        db.add(OntologyPackage(id="pkg", series_code="s", version=1, template_id="tpl", status="READY", current_generation=3))
+        db.add(OntologyFile(package_id="pkg", file_path="rows.lines", file_size=1))
+        db.commit()
+        db.close()
+        os.makedirs(temp_storage_dir / "pkg", exist_ok=True)
+        (temp_storage_dir / "pkg" / "rows.lines").write_text("x", encoding="utf-8")
+
+        first_written, resume_first = threading.Event(), threading.Event()
+
+        class RowParser(BaseParser):
+            supported_extensions = [".lines"]
+
+            def parse(self, file_record, content, rules):
+                raise AssertionError("parse_file should be used")
+
+            def parse_file(self, file_record, file_path, rules):
+                for i in range(5):
+                    yield {"name": f"Row{i}", "metadata": {}, "links": ["Row0"]}
+
+        registry = ParserRegistry()
+        registry.register(".lines", RowParser())
+
+        class PausingService(ParsingService):
+            def _compute_graph_stats(self, package, generation):
+                # 行已逐块提交、尚未切换指针时暂停，让第二个解析完整执行
+                first_written.set()
+                resume_first.wait(10)
+                return super()._compute_graph_stats(package, generation)
+
+        errors = []
+
+        def run_first():
+            session = factory()
+            try:
+                PausingService(session, registry=registry).parse_package("pkg", "tpl")
+            except Exception as e:
+                errors.append(e)
+            finally:
+                session.close()
+
+        first = threading.Thread(target=run_first)
+        first.start()
+        assert first_written.wait(10)
+        second = factory()
+        try:
+            ParsingService(second, registry=registry).parse_package("pkg", "tpl")
+        finally:
+            second.close()
+            resume_first.set()
+            first.join(10)
+
+        db = factory()
+        try:
+            assert errors == []
+            package = db.get(OntologyPackage, "pkg")
+            assert (package.current_generation, package.allocated_generation) == (5, 5)
+            entities = db.query(OntologyEntity).filter_by(package_id="pkg").all()
+            assert {e.generation for e in entities} == {5}
+            assert sorted(e.name for e in entities) == [f"Row{i}" for i in range(5)]
+            assert {r.generation for r in db.query(OntologyRelation).filter_by(package_id="pkg")} == {5}
+        finally:
+            db.close()
+            engine.dispose()
+
+    def test_stable_ids_survive_reparse_and_new_versions(self, test_db_session, setup_parsing_env, temp_storage_dir):
+        """稳定标识在重解析与同系列新版本间保持不变，重复实体获得不同的标识"""
+        package, template = setup_parsing_env
+        service = ParsingService(test_db_session)
+
+        def snapshot(package_id):
+            entities = test_db_session.query(OntologyEntity).filter_by(package_id=package_id).all()
+            relations = test_db_session.query(OntologyRelation).filter_by(package_id=package_id).all()
+            return {(e.file_path, e.name): e.stable_id for e in entities}, {r.stable_id for r in relations}
+
+        service.parse_package(package.id, template.id)
+        first_entities, first_relations = snapshot(package.id)
+        assert len(set(first_entities.values())) == 2 and len(first_relations) == 1
+
+        service.parse_package(package.id, template.id)
+        assert snapshot(package.id) == (first_entities, first_relations)
+
+        v2 = OntologyPackage(id=f"pkg-{generate_uuid()[:8]}", series_code=package.series_code, version=2,
+                             template_id=template.id, status="READY")
+        test_db_session.add(v2)
+        v2_dir = temp_storage_dir / v2.id
+        shutil.copytree(temp_storage_dir / package.id, v2_dir)
+        # 同类别同名的重复实体，路径排在原文件之前与之后各一个，原实体的标识都不受影响
+        for folder in ("Backup", "archive"):
+            (v2_dir / folder / "Classes").mkdir(parents=True)
+            (v2_dir / folder / "Classes" / "Person.md").write_text("# Another person", encoding="utf-8")
+            test_db_session.add(OntologyFile(package_id=v2.id, file_path=f"{folder}/Classes/Person.md", file_size=16))
+        for f in test_db_session.query(OntologyFile).filter_by(package_id=package.id).all():
+            test_db_session.add(OntologyFile(package_id=v2.id, file_path=f.file_path, file_size=f.file_size))
+        test_db_session.commit()
+
+        service.parse_package(v2.id, template.id)
+        v2_entities, v2_relations = snapshot(v2.id)
+        assert {k: v for k, v in v2_entities.items() if k in first_entities} == first_entities
+        assert v2_relations == first_relations
+        # 行主键包含包与代次，不同版本互不冲突
+        assert len(v2_entities) == 4 and len(set(v2_entities.values())) == 4
@@ -0,0 +1,143 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.repositories.ontology_repo import OntologyRepository
+
+# 首个发布版本 (引入代次、稳定标识、属性表等之前) 创建的表结构
+BASELINE_DDL = (
+    "CREATE TABLE parsing_templates (id VARCHAR NOT NULL PRIMARY KEY, name VARCHAR NOT NULL, description TEXT, "
+    "rules TEXT NOT NULL, created_at DATETIME)",
+    "CREATE TABLE ontology_series (id VARCHAR NOT NULL PRIMARY KEY, code VARCHAR NOT NULL UNIQUE, name VARCHAR NOT NULL, "
+    "description TEXT, created_at DATETIME, updated_at DATETIME, default_template_id VARCHAR "
+    "REFERENCES parsing_templates (id))",
+    "CREATE TABLE ontology_packages (id VARCHAR NOT NULL PRIMARY KEY, series_code VARCHAR NOT NULL "
+    "REFERENCES ontology_series (code), version INTEGER, is_active BOOLEAN, upload_time DATETIME, status VARCHAR, "
+    "error_msg TEXT, template_id VARCHAR REFERENCES parsing_templates (id))",
+    "CREATE TABLE ontology_files (id VARCHAR NOT NULL PRIMARY KEY, package_id VARCHAR NOT NULL "
+    "REFERENCES ontology_packages (id), file_path VARCHAR NOT NULL, file_size INTEGER, content_preview TEXT)",
+    "CREATE TABLE ontology_entities (id VARCHAR NOT NULL PRIMARY KEY, package_id VARCHAR NOT NULL "
+    "REFERENCES ontology_packages (id), name VARCHAR NOT NULL, category VARCHAR, metadata_json TEXT, file_path VARCHAR)",
+    "CREATE INDEX ix_ontology_entities_package_id ON ontology_entities (package_id)",
+    "CREATE INDEX ix_ontology_entities_name ON ontology_entities (name)",
+    "CREATE TABLE ontology_relations (id VARCHAR NOT NULL PRIMARY KEY, package_id VARCHAR NOT NULL "
+    "REFERENCES ontology_packages (id), source_id VARCHAR NOT NULL REFERENCES ontology_entities (id), "
+    "target_id VARCHAR NOT NULL REFERENCES ontology_entities (id), relation_type VARCHAR NOT NULL)",
+)
+
+
+@pytest.fixture
+def baseline_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as connection:
+        for statement in BASELINE_DDL:
+            connection.exec_driver_sql(statement)
+        # 早期版本的检索表：按隐式 rowid 关联、unicode61 分词
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE entity_search USING fts5(name, category, content='ontology_entities', "
+            "content_rowid='rowid', tokenize='unicode61')"
+        )
+        connection.exec_driver_sql("INSERT INTO ontology_series (id, code, name) VALUES ('s1', 'core', 'Core')")
+        connection.exec_driver_sql(
+            "INSERT INTO ontology_packages (id, series_code, version, is_active, status) VALUES ('p1', 'core', 1, 1, 'READY')"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO ontology_entities (id, package_id, name, category) VALUES ('e1', 'p1', 'Customer', 'Concept'), "
+            "('e2', 'p1', 'Order', 'Concept')"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO ontology_relations (id, package_id, source_id, target_id, relation_type) "
+            "VALUES ('r1', 'p1', 'e2', 'e1', 'references')"
+        )
+    yield engine
+    engine.dispose()
+
+
+def upgrade(engine):
+    # 与 init_db 相同的顺序
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        added = models.upgrade_schema(connection)
+        models.ensure_entity_search(connection)
+    return added
+
+
+@pytest.mark.integration
+class TestSchemaUpgrade:
+
+    def test_adds_missing_columns_and_indexes(self, baseline_engine):
+        added = upgrade(baseline_engine)
+
+        assert {"ontology_packages.current_generation", "ontology_files.parse_warnings",
+                "ontology_entities.generation", "ontology_entities.stable_id", "ontology_entities.metadata_hash",
+                "ontology_entities.metadata_text", "ontology_entities.body",
+                "ontology_relations.generation", "ontology_relations.stable_id"} <= set(added)
+        inspector = inspect(baseline_engine)
+        for table in models.Base.metadata.sorted_tables:
+            assert {c.name for c in table.columns} <= {c["name"] for c in inspector.get_columns(table.name)}
+            assert {i.name for i in table.indexes} <= {i["name"] for i in inspector.get_indexes(table.name)}
+
+    def test_is_idempotent(self, baseline_engine):
+        upgrade(baseline_engine)
+        assert upgrade(baseline_engine) == []
+
+    def test_legacy_rows_stay_visible(self, baseline_engine):
+        upgrade(baseline_engine)
+        db = sessionmaker(bind=baseline_engine)()
+        try:
+            repo = OntologyRepository(db)
+            package = db.get(models.OntologyPackage, "p1")
+            assert package.current_generation == 0
+
+            nodes, links = repo.get_graph("p1")
+            assert {n.name for n in nodes} == {"Customer", "Order"}
+            assert len(links) == 1
+            assert [e.name for e in repo.list_entities("p1", 0)] == ["Customer", "Order"]
+        finally:
+            db.close()
+
+    def test_search_index_is_rebuilt_on_explicit_key(self, baseline_engine):
+        from app.repositories.search_repo import Fts5SearchBackend, SearchRepository
+        upgrade(baseline_engine)
+        db = sessionmaker(bind=baseline_engine)()
+        try:
+            definition = db.execute(
+                text("SELECT sql FROM sqlite_master WHERE name = 'entity_search'")
+            ).scalar()
+            assert "search_rowid" in definition and "trigram" in definition
+            repo = SearchRepository(db, Fts5SearchBackend())
+            assert [row[0].name for row in repo.search_entities(["stomer"])[0]] == ["Customer"]
+
+            # 删除实体并 VACUUM 后 (隐式 rowid 可能重排)，索引仍与实体表一致
+            db.execute(text("DELETE FROM ontology_relations"))
+            db.execute(text("DELETE FROM ontology_entities WHERE id = 'e1'"))
+            db.add(models.OntologyEntity(id="e3", package_id="p1", name="Supplier", category="Concept"))
+            db.commit()
+            with baseline_engine.connect() as connection:
+                connection.exec_driver_sql("VACUUM")
+            assert repo.search_entities(["stomer"])[1] == 0
+            assert [row[0].name for row in repo.search_entities(["Order"])[0]] == ["Order"]
+            assert [row[0].name for row in repo.search_entities(["pplier"])[0]] == ["Supplier"]
+        finally:
+            db.close()
+
+    def test_diff_against_version_parsed_before_upgrade(self, baseline_engine):
+        upgrade(baseline_engine)
+        db = sessionmaker(bind=baseline_engine)()
+        try:
+            # 升级后重新解析的新版本带有稳定标识与 metadata_hash，旧版本的行没有
+            db.add(models.OntologyPackage(id="p2", series_code="core", version=2, current_generation=1))
+            for name, metadata_json in (("Customer", None), ("Order", '{"owner": "sales"}'), ("Invoice", None)):
+                db.add(models.OntologyEntity(
+                    id=f"p2-{name}", package_id="p2", generation=1, name=name, category="Concept",
+                    metadata_json=metadata_json, stable_id=models.stable_uuid("core", "Concept", name),
+                    metadata_hash=f"hash-{name}"
+                ))
+            db.commit()
+
+            diff = OntologyRepository(db).diff_entities("p1", "p2")
+            assert [(row[0], row[2]) for row in diff] == [("added", "Invoice"), ("modified", "Order")]
+        finally:
+            db.close()
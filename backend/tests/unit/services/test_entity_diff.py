@@ -0,0 +1,30 @@
+import pytest
+
+from app.services.entity_diff import EntityDiffCache, estimate_rows_bytes
+
+
+@pytest.mark.unit
+class TestEntityDiffCache:
+
+    def test_evicts_by_estimated_bytes(self):
+        rows = [("added", "Class", f"Entity {i}", None, f"id-{i}") for i in range(100)]
+        size = estimate_rows_bytes(rows)
+        cache = EntityDiffCache(max_bytes=size * 2)
+        calls = []
+
+        def compute(key):
+            calls.append(key)
+            return list(rows)
+
+        for key in ("a", "b", "c"):
+            cache.get_or_compute(key, lambda: compute(key))
+        # 预算只容纳两个结果，最久未用的 a 被淘汰
+        assert cache.total_bytes <= size * 2
+        cache.get_or_compute("c", lambda: compute("c"))
+        cache.get_or_compute("a", lambda: compute("a"))
+        assert calls == ["a", "b", "c", "a"]
+
+    def test_result_larger_than_budget_is_not_kept(self):
+        cache = EntityDiffCache(max_bytes=10)
+        assert cache.get_or_compute("k", lambda: [("added", "C", "N", None, "id")])
+        assert cache.total_bytes == 0
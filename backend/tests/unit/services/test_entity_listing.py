@@ -0,0 +1,71 @@
+import pytest
+
+from app.models import EntityAttribute, OntologyEntity, OntologyPackage, OntologySeries
+from app.repositories.ontology_repo import OntologyRepository
+from app.services.entity_listing import (
+    EntityCountCache, decode_entity_cursor, encode_entity_cursor, metadata_attributes, parse_metadata_filters
+)
+
+
+@pytest.mark.unit
+class TestEntityListing:
+
+    def test_cursor_round_trip(self):
+        cursor = encode_entity_cursor(3, "客户", "id-1")
+        assert decode_entity_cursor(cursor) == (3, "客户", "id-1")
+        for bad in ("garbage", encode_entity_cursor(3, "x", "y")[:-4], "WzEsIDJd"):
+            with pytest.raises(ValueError):
+                decode_entity_cursor(bad)
+
+    def test_parse_metadata_filters(self):
+        assert parse_metadata_filters(["owner=Ops", " tag ", "expr=a=b", "empty="]) == [
+            ("owner", "Ops"), ("tag", None), ("expr", "a=b"), ("empty", "")
+        ]
+        for bad in ("=x", " =1"):
+            with pytest.raises(ValueError):
+                parse_metadata_filters([bad])
+
+    def test_metadata_attributes(self):
+        metadata = {"owner": "Ops", "tags": ["a", "b", "a"], "tier": 1, "ratio": 1.5, "archived": True,
+                    "none": None, "empty": [], "nested": {"x": 1}, "long": "x" * 20}
+        assert list(metadata_attributes(metadata, max_chars=16)) == [
+            ("owner", "Ops"), ("tags", "a"), ("tags", "b"), ("tier", "1"), ("ratio", "1.5"),
+            ("archived", "true"), ("none", "null"), ("empty", None), ("nested", '{"x": 1}'), ("long", None)
+        ]
+
+    def test_count_cache_lru(self):
+        cache, calls = EntityCountCache(max_size=2), []
+
+        def compute(value):
+            calls.append(value)
+            return value
+
+        assert cache.get_or_compute("a", lambda: compute(1)) == 1
+        assert cache.get_or_compute("a", lambda: compute(99)) == 1
+        cache.get_or_compute("b", lambda: compute(2))
+        cache.get_or_compute("c", lambda: compute(3))
+        assert cache.get_or_compute("a", lambda: compute(4)) == 4
+        assert calls == [1, 2, 3, 4]
+
+    @pytest.mark.parametrize("threshold", [1, 10_000])
+    def test_attribute_filters_same_under_both_plans(self, test_db_session, monkeypatch, threshold):
+        db = test_db_session
+        db.add(OntologySeries(code="s", name="S"))
+        db.add(OntologyPackage(id="p", series_code="s", version=1, is_active=True, current_generation=1))
+        for i, (name, owner) in enumerate([("A", "ops"), ("B", "sales"), ("C", "ops"), ("D", "ops")]):
+            db.add(OntologyEntity(id=f"e{i}", package_id="p", generation=1, name=name, category="X"))
+            db.add(EntityAttribute(package_id="p", generation=1, entity_id=f"e{i}", key="owner", value=owner))
+        # 其他代次的同名属性不应命中
+        db.add(OntologyEntity(id="old", package_id="p", generation=0, name="A0", category="X"))
+        db.add(EntityAttribute(package_id="p", generation=0, entity_id="old", key="owner", value="ops"))
+        db.commit()
+        # threshold=1 时任何条件都不算高选择性，走按名称索引扫描的计划
+        monkeypatch.setattr(OntologyRepository, "ATTRIBUTE_DRIVE_THRESHOLD", threshold)
+        repo = OntologyRepository(db)
+
+        rows = repo.list_entities("p", 1, metadata=[("owner", "ops")], limit=2)
+        assert [e.name for e in rows] == ["A", "C"]
+        rows = repo.list_entities("p", 1, metadata=[("owner", "ops")], after=("C", "e2"), limit=2)
+        assert [e.name for e in rows] == ["D"]
+        assert repo.count_entities("p", 1, metadata=[("owner", "ops")]) == 3
+        assert repo.count_entities("p", 1, name_prefix="B", metadata=[("owner", None)]) == 1
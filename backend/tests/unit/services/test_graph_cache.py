@@ -0,0 +1,102 @@
+import pytest
+
+from app.services.graph_cache import GraphCache, PackageGraph
+
+
+def _graph():
+    # hub -> a -> far, hub -> b, in -> hub
+    entities = [("hub", "Hub", "A"), ("a", "Leaf1", "A"), ("b", "Leaf2", "B"), ("far", "Far", "A"), ("in", "In", "A")]
+    relations = [
+        ("hub", "a", "link"), ("hub", "b", "link"), ("a", "far", "link"),
+        ("in", "hub", "subClassOf"), ("hub", "missing", "link"),
+    ]
+    return PackageGraph("pkg", "code", 1, entities, relations)
+
+
+def _names(graph, depths):
+    return {graph.names[node]: hops for node, hops in depths.items()}
+
+
+@pytest.mark.unit
+class TestPackageGraph:
+
+    def test_csr_layout_and_degree(self):
+        graph = _graph()
+        assert len(graph) == 5 and graph.edge_count == 4  # 悬空边被丢弃
+        hub = graph.index["hub"]
+        assert graph.degree(hub) == (1, 2)
+        assert sorted(graph.ids[n] for n in graph.neighbors(hub, "out")) == ["a", "b"]
+        assert [graph.ids[n] for n in graph.neighbors(hub, "in")] == ["in"]
+        assert graph.nbytes > 0
+
+    def test_neighborhood_matches_sql_semantics(self):
+        graph = _graph()
+        hub = graph.index["hub"]
+        depths, truncated = graph.neighborhood([hub], 1, 100)
+        assert _names(graph, depths) == {"Hub": 0, "Leaf1": 1, "Leaf2": 1, "In": 1} and not truncated
+        depths, _ = graph.neighborhood([hub], 2, 100, direction="out")
+        assert _names(graph, depths) == {"Hub": 0, "Leaf1": 1, "Leaf2": 1, "Far": 2}
+        depths, _ = graph.neighborhood([hub], 1, 100, categories=["A"])
+        assert _names(graph, depths) == {"Hub": 0, "Leaf1": 1, "In": 1}
+        depths, _ = graph.neighborhood([hub], 3, 100, relation_types=["subClassOf"])
+        assert _names(graph, depths) == {"Hub": 0, "In": 1}
+
+        # 截断时同层按实体 ID 排序保留
+        depths, truncated = graph.neighborhood([hub], 1, 2)
+        assert truncated and _names(graph, depths) == {"Hub": 0, "Leaf1": 1}
+
+    def test_shortest_path_respects_direction_and_limits(self):
+        graph = _graph()
+        node = graph.index.__getitem__
+
+        path, visited, truncated = graph.shortest_path([node("in")], [node("far")], 6, 100)
+        assert [graph.names[n] for n in path] == ["In", "Hub", "Leaf1", "Far"] and not truncated
+        assert visited >= 4
+        # 沿出边不可逆行；不区分方向时可达
+        assert graph.shortest_path([node("far")], [node("in")], 6, 100)[0] is None
+        assert len(graph.shortest_path([node("far")], [node("in")], 6, 100, direction="both")[0]) == 4
+        assert len(graph.shortest_path([node("far")], [node("in")], 6, 100, direction="in")[0]) == 4
+        # 长度、关系类型与访问上限
+        assert graph.shortest_path([node("in")], [node("far")], 2, 100)[0] is None
+        assert graph.shortest_path([node("in")], [node("far")], 6, 100, relation_types=["link"])[0] is None
+        path, _, truncated = graph.shortest_path([node("in")], [node("far")], 6, 3)
+        assert path is None and truncated
+        assert graph.shortest_path([node("a")], [node("a")], 6, 100)[0] == [node("a")]
+
+    def test_bidirectional_search_finds_shortest_meeting(self):
+        # 两条 s->t 路径：长度 2 (经 m) 与长度 3 (经 x, y)
+        entities = [(i, i, None) for i in ("s", "t", "m", "x", "y")]
+        relations = [("s", "x", "r"), ("x", "y", "r"), ("y", "t", "r"), ("s", "m", "r"), ("m", "t", "r")]
+        graph = PackageGraph("pkg", "code", 1, entities, relations)
+        path, _, _ = graph.shortest_path([graph.index["s"]], [graph.index["t"]], 6, 100)
+        assert [graph.ids[n] for n in path] == ["s", "m", "t"]
+
+    def test_path_found_before_visit_cap_is_returned(self):
+        # S->T 直连，同层还有 a/b/c：访问上限在相遇之后才达到，仍应返回已找到的路径
+        entities = [(i, i, None) for i in ("S", "T", "a", "b", "c")]
+        relations = [("S", "T", "r"), ("S", "a", "r"), ("S", "b", "r"), ("S", "c", "r")]
+        graph = PackageGraph("pkg", "code", 1, entities, relations)
+        s, t = graph.index["S"], graph.index["T"]
+        assert graph.shortest_path([s], [t], 6, 100) == ([s, t], 6, False)
+        path, visited, truncated = graph.shortest_path([s], [t], 6, 4)
+        assert path == [s, t] and visited == 4 and not truncated
+
+
+@pytest.mark.unit
+class TestGraphCache:
+
+    def test_lru_memory_budget_and_invalidation(self):
+        graph = _graph()
+        cache = GraphCache(max_bytes=graph.nbytes)
+        cache._graphs.put("pkg", graph)
+        cache.invalidate_series("other")
+        assert cache.total_bytes == graph.nbytes
+        cache.invalidate_series("code")
+        assert cache.total_bytes == 0
+        # 预算不足以容纳时立即淘汰
+        cache._graphs.put("pkg", graph)
+        cache._graphs.put("pkg2", _graph())
+        assert cache.total_bytes <= graph.nbytes
+
+    def test_disabled_cache_returns_none(self):
+        assert GraphCache(max_bytes=0).get(db=None, package_id="pkg") is None
@@ -0,0 +1,39 @@
+import pytest
+
+from app.services.graph_cache import PackageGraph
+from app.services.graph_stats import compute_graph_stats
+
+
+@pytest.mark.unit
+class TestGraphStats:
+
+    def test_counts_histograms_hubs_components_and_orphans(self):
+        entities = [
+            ("h", "Hub", "A"), ("a", "A1", "A"), ("b", "B1", "B"), ("c", "C1", "B"),
+            ("x", "X", "C"), ("y", "Y", "C"), ("o", "Orphan", None),
+        ]
+        relations = [
+            ("h", "a", "link"), ("h", "b", "link"), ("c", "h", "subClassOf"),
+            ("x", "y", "link"),
+        ]
+        stats = compute_graph_stats(PackageGraph("pkg", "code", 1, entities, relations), top_n=2)
+
+        assert stats["node_count"] == 7 and stats["edge_count"] == 4
+        assert {c["category"]: c["count"] for c in stats["categories"]} == {"A": 2, "B": 2, "C": 2, None: 1}
+        assert stats["relation_types"] == [
+            {"relation_type": "link", "count": 3}, {"relation_type": "subClassOf", "count": 1}
+        ]
+        # 总度数：Hub 3，其余 1，孤立实体 0
+        assert stats["degree_histogram"]["total"] == [
+            {"min": 0, "max": 0, "count": 1},
+            {"min": 1, "max": 1, "count": 5},
+            {"min": 2, "max": 3, "count": 1},
+        ]
+        assert stats["degree_histogram"]["outgoing"][-1] == {"min": 2, "max": 3, "count": 1}
+        assert [(h["name"], h["in_degree"], h["out_degree"]) for h in stats["hubs"]] == [("Hub", 1, 2), ("A1", 1, 0)]
+        assert stats["component_count"] == 3 and stats["largest_components"] == [4, 2]
+        assert stats["orphan_count"] == 1 and stats["orphans"] == [{"id": "o", "name": "Orphan", "category": None}]
+
+    def test_empty_graph(self):
+        stats = compute_graph_stats(PackageGraph("pkg", "code", 1, [], []))
+        assert stats["node_count"] == 0 and stats["component_count"] == 0 and stats["hubs"] == []
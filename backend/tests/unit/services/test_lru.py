@@ -0,0 +1,51 @@
+import pytest
+
+from app.core.lru import LRUCache
+
+
+@pytest.mark.unit
+class TestLRUCache:
+
+    def test_evicts_least_recently_used_by_count(self):
+        cache, calls = LRUCache(capacity=2), []
+
+        def compute(key):
+            calls.append(key)
+            return key.upper()
+
+        for key in ("a", "b", "a", "c"):
+            cache.get_or_compute(key, lambda: compute(key))
+        # a 刚被命中，淘汰的是 b
+        assert cache.get_or_compute("a", lambda: compute("a")) == "A"
+        cache.get_or_compute("b", lambda: compute("b"))
+        assert calls == ["a", "b", "c", "b"]
+        assert cache.total_weight == 2
+
+    def test_weighted_capacity_and_clear(self):
+        cache = LRUCache(capacity=10, weigh=len)
+        cache.get_or_compute("x", lambda: "x" * 6)
+        cache.get_or_compute("y", lambda: "y" * 4)
+        assert cache.total_weight == 10
+        cache.get_or_compute("z", lambda: "z" * 3)
+        assert cache.total_weight == 7
+        # 超出容量的单个值不保留
+        assert cache.get_or_compute("big", lambda: "b" * 11) == "b" * 11
+        assert cache.total_weight == 0
+        cache.get_or_compute("x", lambda: "x")
+        cache.clear()
+        assert cache.total_weight == 0
+
+    def test_pop_discard_and_callable_capacity(self):
+        budget = [3]
+        cache = LRUCache(capacity=lambda: budget[0])
+        for key in ("a", "b", "c"):
+            cache.put(key, key.upper())
+        cache.pop("a")
+        cache.pop("missing")
+        assert cache.get("a") is None and cache.total_weight == 2
+        cache.discard_where(lambda value: value == "B")
+        assert cache.get("b") is None and cache.get("c") == "C"
+        # 容量在每次写入时重新读取
+        budget[0] = 1
+        cache.put("d", "D")
+        assert cache.get("c") is None and cache.total_weight == 1
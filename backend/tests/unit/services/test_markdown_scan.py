@@ -0,0 +1,64 @@
+import pytest
+
+from app.models import OntologyFile
+from app.services.parsers.markdown_parser import MarkdownParser
+from app.services.parsers.markdown_scan import scan_markdown
+
+DOCUMENT = """---
+title: Billing Account
+tags: [finance, core]
+---
+# Billing Account
+
+Owned by [[Finance Team|finance]] and linked to [[Invoice]].
+
+| Name | Type | Note |
+|------|------|------|
+| id | string | primary |
+| amount | decimal |
+
+Some text between tables.
+
+| Field | Owner |
+| --- | --- |
+| status | [[Workflow]] |
+"""
+
+TABLE_RULES = {
+    "attribute": {
+        "strategies": [
+            {"type": "table_row", "target_key": "fields", "header_mapping": {"Name": "name", "Type": "type"}},
+            {"type": "table_row", "target_key": "owners", "header_mapping": {"Owner": "owner"}},
+        ]
+    }
+}
+
+
+@pytest.mark.unit
+class TestMarkdownScan:
+
+    def test_single_pass_collects_frontmatter_tables_and_links(self):
+        scan = scan_markdown(DOCUMENT)
+        assert scan.metadata == {"title": "Billing Account", "tags": ["finance", "core"]}
+        assert scan.body.startswith("\n# Billing Account")
+        assert scan.links == ["Finance Team", "Invoice", "Workflow"]
+        assert [t.headers for t in scan.tables] == [["Name", "Type", "Note"], ["Field", "Owner"]]
+        assert scan.tables[0].rows == [["id", "string", "primary"], ["amount", "decimal"]]
+
+    @pytest.mark.parametrize("content", [
+        "no frontmatter\n[[A]]",
+        "---\n: [broken yaml\n---\nbody",
+        "---\n- a list\n---\nbody",
+        "---\ntitle: unterminated",
+    ])
+    def test_invalid_frontmatter_keeps_whole_content_as_body(self, content):
+        scan = scan_markdown(content)
+        assert scan.metadata == {}
+        assert scan.body == content
+
+    def test_table_strategies_pick_first_matching_table(self):
+        records = MarkdownParser().parse(OntologyFile(file_path="a.md"), DOCUMENT, TABLE_RULES)
+        metadata = records[0]["metadata"]
+        assert metadata["fields"] == [{"name": "id", "type": "string"}, {"name": "amount", "type": "decimal"}]
+        assert metadata["owners"] == [{"owner": "[[Workflow]]"}]
+        assert metadata["title"] == "Billing Account"
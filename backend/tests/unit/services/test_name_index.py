@@ -0,0 +1,39 @@
+import pytest
+
+from app.services.name_index import NameIndex, metadata_aliases, normalize_name
+
+
+@pytest.mark.unit
+class TestNameIndex:
+
+    def test_normalize_name(self):
+        assert normalize_name("  Customer   Account ") == "customer account"
+        assert normalize_name("ＡＢＣ") == "abc"
+        assert normalize_name("Straße") == normalize_name("STRASSE")
+
+    def test_resolution_order(self):
+        index = NameIndex()
+        index.add("Customer", "e1", "a.md", aliases=["Client"])
+        index.add("customer", "e2", "b.md")
+        index.add("Account", "e3", "c.md", aliases=["customer"])
+
+        assert index.resolve("Customer") == "e1"
+        assert index.resolve("customer") == "e2"  # 精确名称优先
+        assert index.resolve("CUSTOMER") == "e1"  # 归一化名称先到先得
+        assert index.resolve("client") == "e1"
+        assert index.resolve("Customer|顾客") == "e1"
+        assert index.resolve("Customer#Fields") == "e1"
+        assert index.resolve("Unknown") is None
+
+    def test_duplicate_name_keeps_first(self):
+        index = NameIndex()
+        assert index.add("Order", "e1", "a.md") is None
+        assert index.add("Order", "e2", "b.md") == "a.md"
+        assert index.resolve("Order") == "e1"
+        assert len(index) == 1
+
+    def test_metadata_aliases(self):
+        assert metadata_aliases({"aliases": ["Client", " "], "alias": "Buyer, Payer"}) == ["Client", "Buyer", "Payer"]
+        assert metadata_aliases({"uri": "http://example.org/onto#Dog", "label": "Hound"}) == [
+            "Hound", "http://example.org/onto#Dog", "Dog"
+        ]
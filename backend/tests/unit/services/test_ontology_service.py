@@ -170,3 +170,51 @@ class TestOntologyServiceFileManagement:
         # Directory should be removed
         assert not pkg_dir.exists()
         assert not (temp_storage_dir / "pkg-id-1").exists() # Just a reminder that we use storage_dir now
+
+
+@pytest.mark.unit
+class TestNeighborhoodQuery:
+    """未缓存版本的数据库邻域遍历"""
+
+    def test_traversal_stops_reading_edges_at_node_cap(self, test_db_session):
+        from app.models import OntologyEntity, OntologyRelation
+        db = test_db_session
+        db.add(OntologySeries(code="hub", name="Hub"))
+        db.add(OntologyPackage(id="pkg-hub", series_code="hub", version=1, current_generation=1))
+        db.add(OntologyEntity(id="hub", package_id="pkg-hub", generation=1, name="Hub"))
+        for i in range(300):
+            db.add(OntologyEntity(id=f"leaf-{i:03d}", package_id="pkg-hub", generation=1, name=f"Leaf{i}"))
+            db.add(OntologyRelation(id=f"r-{i:03d}", package_id="pkg-hub", generation=1,
+                                    source_id="hub", target_id=f"leaf-{i:03d}", relation_type="link"))
+        db.commit()
+
+        repo = OntologyRepository(db)
+        rows_read = [0]
+        execute = db.execute
+
+        class CountingResult:
+            def __init__(self, result):
+                self._result = result
+
+            def __iter__(self):
+                for row in self._result:
+                    rows_read[0] += 1
+                    yield row
+
+            def close(self):
+                self._result.close()
+
+        def counting_execute(statement, *args, **kwargs):
+            result = execute(statement, *args, **kwargs)
+            # 只统计逐层遍历按流读取的边 (补全子图的 ORM 查询不设 yield_per)
+            streamed = "ontology_relations" in str(statement) and statement.get_execution_options().get("yield_per")
+            return CountingResult(result) if streamed else result
+
+        with patch.object(db, "execute", counting_execute):
+            nodes, _, truncated = repo.get_neighborhood("pkg-hub", ["hub"], depth=2, max_nodes=5, direction="out")
+        assert truncated and len(nodes) == 5 and nodes[0][0].id == "hub"
+        # 只读到第 5 个新邻居为止，而不是枢纽的全部 300 条边
+        assert rows_read[0] == 5
+
+        nodes, _, truncated = repo.get_neighborhood("pkg-hub", ["hub"], depth=1, max_nodes=1000, direction="out")
+        assert not truncated and len(nodes) == 301
@@ -28,11 +28,63 @@ def test_owl_parser_unit():
     assert "Animal" in names
     assert "Dog" in names
     
-    # 验证关系 (Dog subClassOf Animal)
+    # 验证关系 (Dog subClassOf Animal)，以类型化关系返回
     dog_entity = next(e for e in entities if e["name"] == "Dog")
-    assert "Animal" in dog_entity["links"]
+    assert {"target": "Animal", "type": "subClassOf"} in dog_entity["links"]
     
     print("OWL Unit Test Passed!")
 
+def test_owl_parser_resolves_labels_from_index():
+    """父类名称使用其 rdfs:label，即使标签声明在引用之后"""
+    content = """
+@prefix : <http://example.org/onto#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+:C2 a owl:Class ; rdfs:subClassOf :C1 ; rdfs:comment "child" .
+:C1 a owl:Class ; rdfs:label "Root Concept" .
+"""
+    entities = OWLParser().parse(OntologyFile(file_path="test.ttl"), content, {})
+    by_uri = {e["metadata"]["uri"]: e for e in entities}
+
+    child = by_uri["http://example.org/onto#C2"]
+    assert child["name"] == "C2"
+    assert child["links"] == [{"target": "Root Concept", "type": "subClassOf"}]
+    assert child["metadata"]["comment"] == "child"
+    assert by_uri["http://example.org/onto#C1"]["name"] == "Root Concept"
+
+RICH_TTL = """
+@prefix : <http://example.org/onto#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+:Person a owl:Class .
+:Human a owl:Class ; owl:equivalentClass :Person .
+:Dog a owl:Class .
+:hasOwner a owl:ObjectProperty ; rdfs:domain :Dog ; rdfs:range :Person .
+:age a owl:DatatypeProperty , owl:FunctionalProperty ; rdfs:domain :Person ; rdfs:range xsd:integer .
+:alice a owl:NamedIndividual , :Person ; rdfs:label "Alice" .
+:rex a :Dog .
+"""
+
+def test_owl_parser_extracts_properties_individuals_and_typed_edges():
+    entities = OWLParser().parse(OntologyFile(file_path="rich.ttl"), RICH_TTL, {})
+    by_name = {e["name"]: e for e in entities}
+
+    assert by_name["hasOwner"]["category"] == "OWL ObjectProperty"
+    assert by_name["age"]["metadata"]["type"] == "DatatypeProperty"
+    assert by_name["Alice"]["category"] == "OWL NamedIndividual"
+    # 未显式声明 owl:NamedIndividual，但类型为已声明的类
+    assert by_name["rex"]["category"] == "OWL NamedIndividual"
+
+    assert by_name["Human"]["links"] == [{"target": "Person", "type": "equivalentClass"}]
+    assert sorted(by_name["hasOwner"]["links"], key=lambda l: l["type"]) == [
+        {"target": "Dog", "type": "domain"},
+        {"target": "Person", "type": "range"},
+    ]
+    assert {"target": "Person", "type": "type"} in by_name["Alice"]["links"]
+    assert by_name["rex"]["links"] == [{"target": "Dog", "type": "type"}]
+
 if __name__ == "__main__":
     test_owl_parser_unit()
@@ -0,0 +1,163 @@
+import pytest
+from app.services.parsers.owl_parser import OWLParser
+from app.services.parsers.rdf_stream import StreamingUnsupported, iter_turtle_triples
+from app.models import OntologyFile
+
+RDFXML_CONTENT = """<?xml version="1.0"?>
+<!DOCTYPE rdf:RDF [
+    <!ENTITY owl "http://www.w3.org/2002/07/owl#" >
+]>
+<rdf:RDF xmlns="http://example.org/onto#"
+     xml:base="http://example.org/onto"
+     xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+     xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+     xmlns:owl="http://www.w3.org/2002/07/owl#">
+    <owl:Ontology rdf:about=""/>
+    <owl:Class rdf:about="#Animal">
+        <rdfs:label xml:lang="en">Animal</rdfs:label>
+        <rdfs:comment>A living organism</rdfs:comment>
+    </owl:Class>
+    <owl:Class rdf:ID="Dog">
+        <rdfs:label>Dog</rdfs:label>
+        <rdfs:subClassOf rdf:resource="#Animal"/>
+        <rdfs:subClassOf>
+            <owl:Restriction>
+                <owl:onProperty rdf:resource="#hasOwner"/>
+                <owl:someValuesFrom rdf:resource="#Person"/>
+            </owl:Restriction>
+        </rdfs:subClassOf>
+    </owl:Class>
+    <rdf:Description rdf:about="#Puppy">
+        <rdf:type rdf:resource="&owl;Class"/>
+        <rdfs:subClassOf>
+            <owl:Class rdf:about="#Dog"/>
+        </rdfs:subClassOf>
+    </rdf:Description>
+    <owl:Class rdf:about="#Pet">
+        <owl:unionOf rdf:parseType="Collection">
+            <owl:Class rdf:about="#Dog"/>
+            <owl:Class rdf:about="#Cat"/>
+        </owl:unionOf>
+    </owl:Class>
+</rdf:RDF>
+"""
+
+TTL_CONTENT = """
+@prefix : <http://example.org/onto#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+:Animal a owl:Class ;
+    rdfs:label "Animal"@en ;
+    rdfs:comment "A living organism" .
+
+:Dog a owl:Class ;
+    rdfs:label "Dog" ;
+    rdfs:subClassOf :Animal, :Pet . # trailing comment
+:Pet a owl:Class.
+"""
+
+NT_CONTENT = """<http://example.org/onto#Animal> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/2002/07/owl#Class> .
+<http://example.org/onto#Dog> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/2002/07/owl#Class> .
+<http://example.org/onto#Dog> <http://www.w3.org/2000/01/rdf-schema#label> "Dog \\"the\\" hound"@en .
+<http://example.org/onto#Dog> <http://www.w3.org/2000/01/rdf-schema#subClassOf> <http://example.org/onto#Animal> .
+"""
+
+TTL_WITH_BNODE = TTL_CONTENT + """
+:Cat a owl:Class ;
+    rdfs:subClassOf [ a owl:Restriction ; owl:onProperty :hasOwner ] , :Animal .
+"""
+
+# OWL Turtle 中限制、集合与嵌套匿名节点的常见写法
+TTL_WITH_RESTRICTIONS = TTL_CONTENT + """
+@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+:hasOwner a owl:ObjectProperty ; rdfs:domain :Pet ; rdfs:range :Person .
+:Person a owl:Class .
+:Cat a owl:Class ;
+    rdfs:subClassOf :Animal ,
+        [ a owl:Restriction ;
+          owl:onProperty :hasOwner ;
+          owl:someValuesFrom [ a owl:Class ; owl:unionOf (:Person [ owl:oneOf (:Alice :Bob) ]) ]
+        ] ;
+    rdfs:label "Cat" .
+:Pet owl:equivalentClass [ a owl:Class ; owl:unionOf ( :Dog :Cat ) ] .
+:Rex a :Dog ; rdfs:comment "tag: [x]" ; owl:sameAs () .
+[] a owl:AllDisjointClasses ; owl:members (:Dog :Cat).
+[ a owl:NegativePropertyAssertion ; owl:sourceIndividual :Rex ] rdfs:comment "n" .
+"""
+
+# N3 公式只能由完整图解析处理
+N3_WITH_FORMULA = TTL_CONTENT + """
+{ ?x a :Dog } => { ?x a :Animal } .
+"""
+
+
+def _summary(entities):
+    return {
+        e["name"]: (sorted((l["type"], l["target"]) for l in e["links"]), e["metadata"]["label"], e["metadata"]["comment"])
+        for e in entities
+    }
+
+
+def _parse(tmp_path, filename, content, streaming):
+    path = tmp_path / filename
+    path.write_text(content, encoding="utf-8")
+    parser = OWLParser()
+    return parser.parse_file(OntologyFile(file_path=filename), str(path), {"owl": {"streaming": streaming}})
+
+
+@pytest.mark.unit
+class TestOWLStreaming:
+
+    @pytest.mark.parametrize("filename,content", [
+        ("onto.owl", RDFXML_CONTENT),
+        ("onto.ttl", TTL_CONTENT),
+        ("onto.nt", NT_CONTENT),
+        ("onto.ttl", TTL_WITH_BNODE),
+        ("onto.ttl", TTL_WITH_RESTRICTIONS),
+        ("onto.n3", TTL_WITH_RESTRICTIONS),
+        ("onto.n3", N3_WITH_FORMULA),
+    ])
+    def test_streaming_matches_graph_parse(self, tmp_path, filename, content):
+        streamed = _parse(tmp_path, filename, content, "always")
+        in_memory = _parse(tmp_path, filename, content, "never")
+        assert _summary(streamed) == _summary(in_memory)
+
+    def test_rdfxml_extraction(self, tmp_path):
+        entities = _summary(_parse(tmp_path, "onto.owl", RDFXML_CONTENT, "always"))
+        assert set(entities) == {"Animal", "Dog", "Puppy", "Pet", "Cat"}
+        assert entities["Dog"][0] == [("subClassOf", "Animal")]
+        assert entities["Puppy"][0] == [("subClassOf", "Dog")]
+        assert entities["Animal"][2] == "A living organism"
+
+    def test_nt_literal_escapes(self, tmp_path):
+        entities = _summary(_parse(tmp_path, "onto.nt", NT_CONTENT, "always"))
+        assert 'Dog "the" hound' in entities
+
+    @pytest.mark.parametrize("filename", ["onto.ttl", "onto.n3"])
+    def test_restrictions_and_collections_stream_without_fallback(self, tmp_path, monkeypatch, filename):
+        def fallback(*args, **kwargs):
+            raise AssertionError("fell back to in-memory graph parse")
+
+        monkeypatch.setattr(OWLParser, "parse", fallback)
+        entities = _summary(_parse(tmp_path, filename, TTL_WITH_RESTRICTIONS, "always"))
+        assert entities["Cat"][0] == [("subClassOf", "Animal")]
+        assert entities["hasOwner"][0] == [("domain", "Pet"), ("range", "Person")]
+        assert entities["Rex"] == ([("type", "Dog")], "", "tag: [x]")
+
+    def test_unbalanced_brackets_and_n3_formulas_are_unsupported_in_stream(self):
+        for content in (TTL_CONTENT + ":Cat rdfs:subClassOf [ a owl:Class .\n", TTL_CONTENT + ":Cat owl:unionOf (:A ] .\n",
+                        N3_WITH_FORMULA):
+            with pytest.raises(StreamingUnsupported):
+                list(iter_turtle_triples(content.splitlines(keepends=True)))
+
+    def test_auto_mode_uses_size_threshold(self, tmp_path, monkeypatch):
+        from app.config import settings
+        parser = OWLParser()
+        path = tmp_path / "onto.ttl"
+        path.write_text(TTL_CONTENT, encoding="utf-8")
+
+        monkeypatch.setattr(settings, "OWL_STREAMING_THRESHOLD_BYTES", 10**9)
+        assert not parser._should_stream(str(path), {})
+        monkeypatch.setattr(settings, "OWL_STREAMING_THRESHOLD_BYTES", 1)
+        assert parser._should_stream(str(path), {})
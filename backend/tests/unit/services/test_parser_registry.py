@@ -0,0 +1,55 @@
+import os
+import sys
+import subprocess
+import pytest
+
+from app.services.parsers.base import BaseParser
+from app.services.parsers.registry import BUILTIN_PARSERS, ParserRegistry
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+@pytest.mark.unit
+class TestParserRegistry:
+
+    def test_loads_only_requested_parser(self):
+        registry = ParserRegistry()
+        parser = registry.get(".MD")
+        assert parser.__class__.__name__ == "MarkdownParser"
+        assert registry.loaded_entry_points() == {BUILTIN_PARSERS[".md"]}
+
+    def test_extensions_of_one_parser_share_an_instance(self):
+        registry = ParserRegistry()
+        assert registry.get(".owl") is registry.get(".ttl")
+        assert registry.get(".md") is registry.get(".markdown")
+
+    def test_unknown_extension_returns_none(self):
+        assert ParserRegistry().get(".xyz") is None
+
+    def test_unlisted_plugin_is_discovered(self):
+        # 清单中缺失的插件模块通过一次性目录扫描补齐
+        registry = ParserRegistry({ext: ep for ext, ep in BUILTIN_PARSERS.items() if "markdown" not in ep})
+        assert registry.get(".markdown").__class__.__name__ == "MarkdownParser"
+
+    def test_registered_parser_overrides_manifest(self):
+        class DummyParser(BaseParser):
+            supported_extensions = [".md"]
+
+            def parse(self, file_record, content, rules):
+                return []
+
+        registry = ParserRegistry()
+        dummy = DummyParser()
+        registry.register(".md", dummy)
+        assert registry.get(".md") is dummy
+
+    def test_parsing_service_does_not_import_rdflib(self):
+        code = (
+            "import sys\n"
+            "from app.services.parsing_service import ParsingService\n"
+            "ParsingService(None)\n"
+            "assert 'rdflib' not in sys.modules, 'rdflib imported eagerly'\n"
+        )
+        env = dict(os.environ, APP_ENV="test")
+        result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
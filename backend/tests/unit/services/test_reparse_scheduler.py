@@ -0,0 +1,83 @@
+import threading
+import pytest
+
+from app.services.reparse_scheduler import ReparseScheduler
+
+
+class BlockingRunner:
+    """记录执行顺序；首个任务阻塞直到测试放行，便于观察排队行为"""
+
+    def __init__(self, fail=()):
+        self.order = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.fail = set(fail)
+
+    def __call__(self, package_id, template_id):
+        self.order.append((package_id, template_id))
+        self.started.set()
+        self.release.wait(5)
+        if package_id in self.fail:
+            raise RuntimeError(f"boom {package_id}")
+
+
+@pytest.mark.unit
+class TestReparseScheduler:
+
+    def test_active_versions_run_first(self):
+        runner = BlockingRunner()
+        scheduler = ReparseScheduler(max_workers=1, runner=runner)
+        first = scheduler.submit([("busy", "t", False)])
+        assert runner.started.wait(5)
+
+        batch = scheduler.submit([("old-1", "t", False), ("old-2", "t", False), ("active", "t", True)])
+        runner.release.set()
+        assert first.wait(5) and batch.wait(5)
+        assert [p for p, _ in runner.order] == ["busy", "active", "old-1", "old-2"]
+        assert batch.progress()["succeeded"] == 3
+
+    def test_queued_job_is_deduplicated_with_latest_template(self):
+        runner = BlockingRunner()
+        scheduler = ReparseScheduler(max_workers=1, runner=runner)
+        scheduler.submit([("busy", "t", False)])
+        assert runner.started.wait(5)
+
+        a = scheduler.submit([("pkg", "t1", False)])
+        b = scheduler.submit([("pkg", "t2", True), ("pkg", "t2", True)])
+        assert b.progress()["deduplicated"] == 2
+        assert a.jobs[0] is b.jobs[0]
+        runner.release.set()
+        assert a.wait(5) and b.wait(5)
+        assert runner.order.count(("pkg", "t2")) == 1
+        assert ("pkg", "t1") not in runner.order
+
+    def test_running_package_is_not_run_concurrently(self):
+        runner = BlockingRunner()
+        scheduler = ReparseScheduler(max_workers=2, runner=runner)
+        first = scheduler.submit([("pkg", "t1", False)])
+        assert runner.started.wait(5)
+
+        # 正在执行的任务可能读到旧模板，新请求重新排队但要等上一个任务结束
+        second = scheduler.submit([("pkg", "t2", False)])
+        assert second.progress()["deduplicated"] == 0
+        assert not second.wait(0.2)
+        assert runner.order == [("pkg", "t1")]
+        runner.release.set()
+        assert first.wait(5) and second.wait(5)
+        assert runner.order == [("pkg", "t1"), ("pkg", "t2")]
+
+    def test_failures_are_reported_in_progress(self):
+        runner = BlockingRunner(fail={"bad"})
+        runner.release.set()
+        scheduler = ReparseScheduler(max_workers=2, runner=runner)
+        batch = scheduler.submit([("bad", "t", True), ("good", "t", True)])
+        assert batch.wait(5)
+        progress = batch.progress()
+        assert progress["done"] and progress["failed"] == 1 and progress["succeeded"] == 1
+        failed = next(j for j in progress["jobs"] if j["status"] == "failed")
+        assert failed["package_id"] == "bad" and "boom" in failed["error"]
+        assert scheduler.get_batch(batch.id) is batch
+
+    def test_empty_batch_is_done(self):
+        batch = ReparseScheduler(max_workers=1, runner=BlockingRunner()).submit([])
+        assert batch.wait(0) and batch.progress()["total"] == 0
@@ -0,0 +1,62 @@
+import re
+import time
+import pytest
+
+from app.core import safe_regex
+from app.core.safe_regex import safe_search, RegexTimeoutError
+
+# 经典灾难性回溯样本 (pattern, 触发回溯的输入)
+PATHOLOGICAL_CORPUS = [
+    (r"^(a+)+$", "a" * 40 + "!"),
+    (r"^(a|aa)+$", "a" * 60 + "!"),
+    (r"^(a|a?)+$", "a" * 40 + "!"),
+    (r"^(\w+\s?)*$", "word " * 12 + "!"),
+    (r"(.*a){25}", "a" * 30),
+    (r"(x+x+)+y", "x" * 40),
+]
+
+BUDGET = 0.2
+
+
+@pytest.fixture(params=["worker", "default"])
+def engine(request, monkeypatch):
+    """分别验证子进程执行路径与默认 (可能为 regex 库) 路径"""
+    if request.param == "worker":
+        monkeypatch.setattr(safe_regex, "_regex_lib", None)
+    return request.param
+
+
+@pytest.mark.unit
+class TestSafeRegex:
+
+    def test_match_returns_groups(self, engine):
+        assert safe_search(r"owner:\s*(\w+)", "x\nowner: billing\n", re.MULTILINE) == ("owner: billing", "billing")
+        assert safe_search(r"^#\s+.*$", "# Title", re.MULTILINE) == ("# Title",)
+        assert safe_search(r"missing", "nothing here") is None
+
+    def test_invalid_pattern_raises_re_error(self, engine):
+        with pytest.raises(re.error):
+            safe_search(r"[", "text")
+
+    @pytest.mark.parametrize("pattern,text", PATHOLOGICAL_CORPUS)
+    def test_pathological_pattern_is_bounded(self, engine, pattern, text):
+        start = time.perf_counter()
+        try:
+            safe_search(pattern, text, timeout=BUDGET)
+            timed_out = False
+        except RegexTimeoutError as e:
+            assert e.pattern == pattern
+            timed_out = True
+        elapsed = time.perf_counter() - start
+
+        # 预算之外仅允许进程回收等固定开销
+        assert elapsed < BUDGET + 2.0
+        if engine == "worker":
+            # 标准库 re 对该语料必然回溯失控，只能依靠超时中断
+            assert timed_out
+
+    def test_worker_recovers_after_timeout(self, monkeypatch):
+        monkeypatch.setattr(safe_regex, "_regex_lib", None)
+        with pytest.raises(RegexTimeoutError):
+            safe_search(r"^(a+)+$", "a" * 40 + "!", timeout=BUDGET)
+        assert safe_search(r"(\d+)", "v42", timeout=BUDGET) == ("42", "42")
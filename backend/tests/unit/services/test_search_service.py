@@ -0,0 +1,54 @@
+import pytest
+
+from app.models import OntologyEntity, OntologyPackage, OntologySeries
+from app.repositories.search_repo import Fts5SearchBackend, LikeSearchBackend, SearchRepository
+from app.services.search_service import SearchService, flatten_metadata_text
+
+
+def _seed(db):
+    db.add(OntologySeries(code="s", name="S"))
+    db.add(OntologyPackage(id="p", series_code="s", version=1, is_active=True, current_generation=1))
+    db.add_all([
+        OntologyEntity(id="e1", package_id="p", generation=1, name="Order_Line", category="Sales",
+                       metadata_text="100% discount", body="Line item of an order"),
+        OntologyEntity(id="e2", package_id="p", generation=1, name="Invoice", category="Billing",
+                       body="Issued for each order"),
+        OntologyEntity(id="e4", package_id="p", generation=1, name="客户订单", category="销售",
+                       body="记录客户下单的明细"),
+        # 非当前代次的实体不应被检索到
+        OntologyEntity(id="e3", package_id="p", generation=0, name="Order", category="Sales"),
+    ])
+    db.commit()
+
+
+@pytest.mark.unit
+class TestSearch:
+
+    def test_flatten_metadata_text(self):
+        assert flatten_metadata_text({"owner": "Team", "tags": ["a", {"b": 2}], "flag": True, "none": None}) == "Team\na\n2"
+        assert flatten_metadata_text({}) is None
+
+    def test_match_expression_quotes_operators(self):
+        assert Fts5SearchBackend.match_expression(['a"b', "OR"]) == '"a""b" "OR"'
+
+    @pytest.mark.parametrize("backend", [Fts5SearchBackend(), LikeSearchBackend()])
+    def test_backends_agree_on_matches(self, test_db_session, backend):
+        _seed(test_db_session)
+        service = SearchService(SearchRepository(test_db_session, backend))
+
+        def names(q, **kwargs):
+            result = service.search_entities(q, **kwargs)
+            return {hit.name for hit in result.data.items}
+
+        assert names("order") == {"Order_Line", "Invoice"}
+        assert names("order", category="Sales") == {"Order_Line"}
+        assert names("invo") == {"Invoice"}
+        assert names("100%") == {"Order_Line"}
+        assert names("order issued") == {"Invoice"}
+        # 子串匹配 (trigram)；中文无需分词，少于三个字符的词改用 LIKE
+        assert names("voic") == {"Invoice"}
+        assert names("户订单") == {"客户订单"}
+        assert names("客户") == {"客户订单"}
+        assert names("明细 客户") == {"客户订单"}
+        assert names("下单 order") == set()
+        assert service.search_entities("order").data.backend == backend.name
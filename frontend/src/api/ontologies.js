@@ -70,6 +70,15 @@ export function getOntologyGraph(id) {
     })
 }
 
+export function getOntologyNeighborhood(id, params) {
+    return request({
+        url: `/api/ontologies/${id}/neighborhood`,
+        method: 'get',
+        params,
+        paramsSerializer: { indexes: null }
+    })
+}
+
 export function compareOntologies(params) {
     return request({
         url: '/api/ontologies/compare',
@@ -109,6 +118,21 @@ export function getOntologyEntities(id, params) {
     })
 }
 
+export function getOntologyAttributes(id) {
+    return request({
+        url: `/api/ontologies/${id}/attributes`,
+        method: 'get'
+    })
+}
+
+export function getOntologyAttributeValues(id, params) {
+    return request({
+        url: `/api/ontologies/${id}/attributes/values`,
+        method: 'get',
+        params
+    })
+}
+
 export function getOntologyRelations(id, params) {
     return request({
         url: `/api/ontologies/${id}/relations`,
@@ -116,3 +140,18 @@ export function getOntologyRelations(id, params) {
         params
     })
 }
+
+export function getOntologyStats(id) {
+    return request({
+        url: `/api/ontologies/${id}/stats`,
+        method: 'get'
+    })
+}
+
+export function searchEntities(params) {
+    return request({
+        url: '/api/search',
+        method: 'get',
+        params
+    })
+}